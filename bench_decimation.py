@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark the decode path with and without decimation.
+
+Renders LTC at a high sample rate with modules.ltc_encoder, then feeds it
+chunk by chunk through the same steps the decode loop runs (deinterleave,
+optional decimation, LibLTC.write/read) and reports the CPU time per
+second of audio. The "copy" rows pass Python lists, i.e. the per-sample
+ctypes conversion LibLTC.write used before it accepted buffers.
+Without libltc the decoder is replaced by a no-op so the capture-side
+cost can still be compared (--no-libltc).
+"""
+
+import argparse
+import array
+import ctypes
+import time
+
+from modules.decimation import Decimator
+from modules.ltc_encoder import LTCEncoder
+
+
+class NullDecoder:
+    """Stand-in for LibLTC when the library is not available."""
+
+    def write(self, samples):
+        if isinstance(samples, list):
+            # Same conversion LibLTC.write does for non-buffer input.
+            (ctypes.c_short * len(samples))(*samples)
+
+    def read(self):
+        return iter(())
+
+    def close(self):
+        pass
+
+
+def render(sample_rate, fps, seconds, num_channels, channel):
+    encoder = LTCEncoder(sample_rate, fps)
+    mono = array.array("h")
+    for count in range(int(seconds * fps)):
+        mono.extend(encoder.encode_count(36000 * int(round(fps)) + count))
+    if num_channels == 1:
+        return mono.tobytes()
+    interleaved = array.array("h", bytes(2 * len(mono) * num_channels))
+    interleaved[channel::num_channels] = mono
+    return interleaved.tobytes()
+
+
+def run(data, sample_rate, fps, num_channels, channel, chunk, factor, use_libltc,
+        copy=False):
+    if use_libltc:
+        from modules.ltc import LibLTC, find_libltc
+        decoder = LibLTC(find_libltc(), sample_rate // factor, fps, factor)
+    else:
+        decoder = NullDecoder()
+    decimator = Decimator(factor) if factor > 1 else None
+    step = chunk * num_channels * 2
+    frames = 0
+    start = time.thread_time()
+    for pos in range(0, len(data) - step + 1, step):
+        samples = array.array("h", data[pos:pos + step])
+        if num_channels > 1:
+            samples = samples[channel::num_channels]
+        if decimator is not None:
+            samples = decimator.process(samples)
+        decoder.write(samples.tolist() if copy else samples)
+        frames += sum(1 for _ in decoder.read())
+    cpu = time.thread_time() - start
+    decoder.close()
+    return cpu, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decimation CPU benchmark")
+    parser.add_argument("--rate", type=int, action="append",
+                        help="device sample rate (repeatable, default 96000 and 192000)")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--chunk", type=int, default=512, help="frames per read")
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--no-libltc", action="store_true",
+                        help="skip the decoder (measure capture-side cost only)")
+    args = parser.parse_args()
+
+    use_libltc = not args.no_libltc
+    print(f"{'RATE':>7} {'DECIM':>5} {'DECODER':>8} {'WRITE':>9} "
+          f"{'CPU ms/s':>9} {'CPU %':>6} {'FRAMES':>7}")
+    for rate in args.rate or [96000, 192000]:
+        data = render(rate, args.fps, args.seconds, args.channels, 0)
+        baseline = None
+        for factor in sorted({1, max(1, rate // 48000)}):
+            for copy in (True, False):
+                cpu, frames = run(data, rate, args.fps, args.channels, 0,
+                                  args.chunk, factor, use_libltc, copy)
+                per_second = cpu / args.seconds * 1000.0
+                baseline = baseline or per_second
+                print(f"{rate:>7} {factor:>5} {rate // factor:>8} "
+                      f"{'copy' if copy else 'zero-copy':>9} {per_second:>9.2f} "
+                      f"{per_second / 10.0:>6.2f} {frames:>7}  "
+                      f"({per_second / baseline * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import time
+_PROCESS_T0 = time.perf_counter()
+
 import sys
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
@@ -7,43 +10,65 @@ import json
 import logging
 import signal
 import threading
-import time
-import asyncio
 import os
-try:
-    import tkinter as tk
-    from tkinter import ttk, messagebox
-except Exception:  # noqa: W0703
-    tk = None
-
-import pyaudio
-from pythonosc import udp_client
 
-try:
-    from PIL import Image, ImageDraw
-    import pystray
-except Exception:  # noqa: W0703
-    pystray = None
-
-from modules.communication.ipc_client import check_existing_instance
-from modules.communication.ipc_server import start_server
-from modules.audio_devices import get_device_name, list_input_devices
+from pythonosc import osc_bundle_builder, osc_message_builder, udp_client
+
+# tkinter / PIL / pystray / asyncio are imported lazily: they are not needed
+# to get timecode flowing and are skipped entirely in --service mode. So are
+# the optional stages (cues, redundancy, timecode query, profiling) and the
+# instance registry, which are imported where they are used.
+from modules.audio_sources import AudioSourceError, PyAudioSource, SimulatedSource
+from modules.capture import CaptureSupervisor
+from modules.communication.commands import CommandHandler
+from modules.decimation import Decimator, decimation_factor, numpy_available
+from modules.device_registry import get_registry
+from modules.inputs import channel_specs, expand_inputs
+from modules.latency import AdaptiveChunkController, resolve_latency_profile
+from modules.log_setup import RateLimitedLog, setup_logging
 from modules.ltc import LibLTC, find_libltc
+from modules.ltc_encoder import timecode_to_frames
+from modules.timing import LoopStats, StartupTimer
 
+# Preferred IPC port; further bridges on the same host fall back to an
+# ephemeral port and are found through the instance registry.
 INSTANCE_PORT = 12321
 INSTANCE_KEY = "LTCOSCReader"
 
+# Largest OSC bundle sent in one datagram (fits an Ethernet frame).
+MAX_BUNDLE = 1400
+
+# Shortest time between device table refreshes while an input is missing.
+REFRESH_INTERVAL = 10.0
+
 # Default configuration used when no config file is found.
 DEFAULT_CONFIG = {
     "osc_ip": "127.0.0.1",
     "osc_port": 9000,
     "osc_address": "/ltc",
     "audio_device_index": None,
+    "audio_device_name": None,
+    "audio_host_api": None,
     "channel": 0,
     "sample_rate": 48000,
     "fps": 30,
     "timecode_offset": 0.0,
     "stop_timeout": 0.5,
+    "osc_destinations": None,
+    "ipc_port": INSTANCE_PORT,
+    "silence_timeout": 0.0,
+    "latency_profile": "balanced",
+    "chunk_size": None,
+    "adaptive_chunk": False,
+    "stats_interval": 0.0,
+    "ltc_output": None,
+    "frame_trace": 0.0,
+    "decimation": 1,
+    "redundancy": None,
+    "timecode_query": None,
+    "capture_process": False,
+    "cues": None,
+    "timecode_shm": None,
 }
 
 _ipc_loop = None
@@ -58,16 +83,21 @@ def _open_settings_window(config_path: str, restart_cb, current_device_index=Non
     ``restart_cb`` will be called after saving to trigger a restart.
     ``current_device_index`` is the actually used device index (may differ from config due to fallback).
     """
-    if tk is None:
+    try:
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+    except Exception:  # noqa: W0703
         logging.error("tkinter is not available")
         return
 
     cfg = load_config(config_path)
 
-    devices = list_input_devices()
-    device_names = [name for _, name in devices]
-    idx_to_name = {idx: name for idx, name in devices}
-    name_to_idx = {name: idx for idx, name in devices}
+    # キャッシュ済みのデバイス表を使う（PortAudio の再初期化はしない）
+    devices = get_registry().input_devices()
+    # 同名デバイスが複数の Host API に現れるため Host API 名も表示する
+    labels = [f"{d['name']} ({d['host_api']})" for d in devices]
+    idx_to_label = {d["index"]: label for d, label in zip(devices, labels)}
+    label_to_dev = dict(zip(labels, devices))
 
     win = tk.Tk()
     win.title("LTC OSC Settings")
@@ -92,10 +122,10 @@ def _open_settings_window(config_path: str, restart_cb, current_device_index=Non
     # Use actual device index if provided, otherwise use config value
     actual_device_index = current_device_index if current_device_index is not None else cfg.get(
         "audio_device_index")
-    current_name = idx_to_name.get(actual_device_index,
-                                   device_names[0] if device_names else "")
-    device_var = tk.StringVar(value=current_name)
-    ttk.Combobox(win, textvariable=device_var, values=device_names,
+    current_label = idx_to_label.get(actual_device_index,
+                                     labels[0] if labels else "")
+    device_var = tk.StringVar(value=current_label)
+    ttk.Combobox(win, textvariable=device_var, values=labels,
                  state="readonly").grid(row=3, column=1, pady=2, padx=5)
 
     # Channel
@@ -168,11 +198,14 @@ def _open_settings_window(config_path: str, restart_cb, current_device_index=Non
             messagebox.showerror("Error", "Stop Timeout は正の数値で入力してください")
             return
 
+        selected = label_to_dev.get(device_var.get())
         new_cfg = {
             "osc_ip": ip_var.get(),
             "osc_port": int(port_var.get()),
             "osc_address": addr_var.get(),
-            "audio_device_index": name_to_idx.get(device_var.get(), 0),
+            "audio_device_index": selected["index"] if selected else 0,
+            "audio_device_name": selected["name"] if selected else None,
+            "audio_host_api": selected["host_api"] if selected else None,
             "channel": int(channel_var.get()),
             "sample_rate": int(sr_var.get()),
             "fps": float(fps_var.get().replace("ndf", "")),
@@ -180,8 +213,14 @@ def _open_settings_window(config_path: str, restart_cb, current_device_index=Non
             "stop_timeout": timeout_value,
         }
         try:
+            saved = {}
+            if os.path.isfile(config_path):
+                with open(config_path, "r", encoding="utf-8") as fh:
+                    saved = json.load(fh)
+            # この画面の項目だけを書き換え、inputs や cues などの設定は残す
+            saved.update(new_cfg)
             with open(config_path, "w", encoding="utf-8") as fh:
-                json.dump(new_cfg, fh, indent=2)
+                json.dump(saved, fh, indent=2, ensure_ascii=False)
             messagebox.showinfo("LTC OSC", "設定を保存しました")
             win.destroy()
             restart_cb()
@@ -196,6 +235,8 @@ def _open_settings_window(config_path: str, restart_cb, current_device_index=Non
 
 def _create_image():
     """Create tray icon image."""
+    from PIL import Image, ImageDraw
+
     image = Image.new("RGB", (64, 64), (0, 0, 0))
     draw = ImageDraw.Draw(image)
     draw.rectangle((8, 8, 56, 56), fill=(0, 128, 255))
@@ -204,7 +245,9 @@ def _create_image():
 
 def _setup_tray(settings, exit_cb, config_path, restart_cb, device_name=None, reader=None):
     """Start system tray icon."""
-    if pystray is None:
+    try:
+        import pystray
+    except Exception:  # noqa: W0703
         return None
 
     icon = pystray.Icon("ltc_reader", _create_image(), "LTC Reader")
@@ -266,13 +309,16 @@ def _setup_tray(settings, exit_cb, config_path, restart_cb, device_name=None, re
     return icon
 
 
-def _run_ipc_server():
+def _run_ipc_server(handler=None, port=INSTANCE_PORT, on_listening=None):
     """Run IPC server in a dedicated event loop."""
     global _ipc_loop, _ipc_server_task
+    import asyncio
+    from modules.communication.ipc_server import start_server
+
     _ipc_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(_ipc_loop)
     _ipc_server_task = _ipc_loop.create_task(
-        start_server(INSTANCE_PORT, INSTANCE_KEY)
+        start_server(port, INSTANCE_KEY, handler, on_listening)
     )
     try:
         _ipc_loop.run_forever()
@@ -281,56 +327,160 @@ def _run_ipc_server():
             _ipc_server_task.cancel()
             try:
                 _ipc_loop.run_until_complete(_ipc_server_task)
-            except Exception:
+            except (asyncio.CancelledError, Exception):
                 pass
         _ipc_loop.close()
 
 
+class OSCOutput:
+    """Destination list and mute flag shared by every OSCClient of a process."""
+
+    def __init__(self, destinations):
+        self.muted = False
+        # Sends run on the decode threads: a failed datagram is dropped and
+        # counted, never retried. An unreachable destination fails on
+        # every frame, so the log is rate-limited.
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+        self._send_errors = RateLimitedLog(1.0, logging.WARNING)
+        self.set_destinations(destinations)
+
+    def set_destinations(self, destinations) -> None:
+        """Replace the destination list (safe to call from another thread)."""
+        # Built completely before the single attribute swap, so the send
+        # path never sees a partially updated list.
+        self._clients = tuple(
+            (ip, port, udp_client.SimpleUDPClient(ip, port))
+            for ip, port in destinations
+        )
+
+    def get_destinations(self) -> list[dict]:
+        return [{"ip": ip, "port": port} for ip, port, _ in self._clients]
+
+    def get_stats(self) -> dict:
+        return {"dropped": self.dropped}
+
+    def _drop(self, ip: str, port: int, kind: str, exc: Exception) -> None:
+        with self._drop_lock:
+            self.dropped += 1
+        self._send_errors.log("OSC %s to %s:%d dropped: %s", kind, ip, port, exc)
+
+    def send_message(self, address: str, message: str, kind: str):
+        if self.muted:
+            return
+        for ip, port, client in self._clients:
+            try:
+                client.send_message(address, message)
+            except Exception as exc:  # noqa: W0703
+                self._drop(ip, port, kind, exc)
+
+    def send_bundle(self, messages, kind: str):
+        """Send ``(address, args)`` pairs as OSC bundle(s) to every destination.
+
+        Messages are packed in order into bundles of at most
+        ``MAX_BUNDLE`` bytes, so a large batch is never one oversized datagram.
+        """
+        if self.muted:
+            return
+        bundles = []
+        builder, size = None, 0
+        for address, args in messages:
+            msg = osc_message_builder.OscMessageBuilder(address)
+            for arg in args:
+                msg.add_arg(arg)
+            msg = msg.build()
+            if builder is not None and size + msg.size > MAX_BUNDLE:
+                bundles.append(builder.build())
+                builder = None
+            if builder is None:
+                builder = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+                size = 16
+            builder.add_content(msg)
+            size += 4 + msg.size
+        if builder is not None:
+            bundles.append(builder.build())
+        for ip, port, client in self._clients:
+            for bundle in bundles:
+                try:
+                    client.send(bundle)
+                except Exception as exc:  # noqa: W0703
+                    self._drop(ip, port, kind, exc)
+
+
 class OSCClient:
-    def __init__(self, ip: str, port: int, address: str):
-        self.client = udp_client.SimpleUDPClient(ip, port)
+    def __init__(self, ip: str, port: int, address: str, destinations=None,
+                 output: OSCOutput | None = None):
+        """``destinations`` is an optional list of ``(ip, port)`` pairs that
+        replaces the single ``ip``/``port`` target. ``output`` shares the
+        destinations and mute flag of another client (see ``for_address``)."""
         self.base_address = address
         self.decode_address = address + "/decode"  # Timecode decode results
         self.status_running_address = address + "/status-running"  # Running status
         self.status_stopped_address = address + "/status-stopped"  # Stopped status
+        self.output = output or OSCOutput(destinations or [(ip, port)])
+
+    def for_address(self, address: str) -> "OSCClient":
+        """Return a client for another base address sharing this output."""
+        return OSCClient(None, None, address, output=self.output)
+
+    @property
+    def muted(self) -> bool:
+        return self.output.muted
+
+    @muted.setter
+    def muted(self, value: bool) -> None:
+        self.output.muted = value
+
+    def set_destinations(self, destinations) -> None:
+        self.output.set_destinations(destinations)
+
+    def get_destinations(self) -> list[dict]:
+        return self.output.get_destinations()
 
     def send(self, message: str):
         """Send timecode message to /ltc/decode address."""
-        for attempt in range(3):
-            try:
-                self.client.send_message(self.decode_address, message)
-                return
-            except Exception as exc:
-                logging.warning(
-                    "OSC decode send failed (%d/3): %s", attempt + 1, exc)
-                time.sleep(0.1)
-        # give up silently
+        self.output.send_message(self.decode_address, message, "decode")
+
+    def send_cues(self, message: str | None, cues):
+        """Send fired cues, in one bundle with the timecode ``message`` if given."""
+        messages = [(self.decode_address, (message,))] if message is not None else []
+        messages.extend((cue.address, cue.args) for cue in cues)
+        self.output.send_bundle(messages, "cue")
 
     def send_status(self, is_running: bool, timecode: str = None):
         """Send timecode status to appropriate status address."""
         address = self.status_running_address if is_running else self.status_stopped_address
         message = timecode if timecode else (
             "running" if is_running else "stopped")
+        self.output.send_message(address, message, "status")
 
-        for attempt in range(3):
-            try:
-                self.client.send_message(address, message)
-                return
-            except Exception as exc:
-                logging.warning(
-                    "OSC status send failed (%d/3): %s", attempt + 1, exc)
-                time.sleep(0.1)
-        # give up silently
+    def send_source(self, name: str, reason: str):
+        """Announce a redundancy switchover to <address>/source."""
+        self.output.send_message(self.base_address + "/source", [name, reason], "source")
+
+
+def _parse_destinations(config: dict) -> list[tuple[str, int]]:
+    """Return the OSC targets from ``osc_destinations`` or ``osc_ip``/``osc_port``."""
+    destinations = config.get("osc_destinations")
+    if destinations:
+        return [(str(d["ip"]), int(d["port"])) for d in destinations]
+    return [(config.get("osc_ip", "127.0.0.1"), int(config.get("osc_port", 9000)))]
 
 
 class TimecodeStatusMonitor:
-    """Monitor timecode start/stop status."""
+    """Monitor timecode start/stop status.
+
+    Every update also publishes an immutable ``(is_running, last_timecode,
+    last_received_time)`` tuple, so ``get_status`` can be called from other
+    threads without a lock and never sees a half-updated state.
+    """
 
     def __init__(self, timeout=2.0):
         self.timeout = timeout
         self.is_running = False
         self.last_timecode = None
         self.last_received_time = None
+        self._snapshot = (False, None, None)
 
     def update_timecode(self, timecode):
         """Update with new timecode and check for status changes."""
@@ -355,6 +505,8 @@ class TimecodeStatusMonitor:
         # This should only apply when we haven't received new timecode for a while
         # which is handled separately in the main loop
 
+        self._snapshot = (self.is_running, self.last_timecode,
+                          self.last_received_time)
         return status_changed
 
     def check_timeout(self):
@@ -370,175 +522,72 @@ class TimecodeStatusMonitor:
             self.is_running = False
             status_changed = True
             logging.info("Timecode STOPPED")
+            self._snapshot = (self.is_running, self.last_timecode,
+                              self.last_received_time)
 
         return status_changed
 
     def get_status(self):
         """Get current status."""
+        is_running, last_timecode, last_received_time = self._snapshot
         return {
-            "is_running": self.is_running,
-            "last_timecode": self.last_timecode,
-            "last_received_time": self.last_received_time
+            "is_running": is_running,
+            "last_timecode": last_timecode,
+            "last_received_time": last_received_time
         }
 
 
-class LTCReader:
-    def __init__(self, config: dict, config_path: str = "config.json"):
-        self.config_path = config_path
-        self.sample_rate = int(config.get("sample_rate", 48000))
-        self.device_index = config.get("audio_device_index")
-        self.channel = int(config.get("channel", 0))
-        self.chunk_size = 512
-        self.pa = pyaudio.PyAudio()
-
-        # audio_device_index の検証とフォールバック
-        if self.device_index is None:
-            # デフォルトデバイスを探す
-            self.device_index = self._find_default_input_device()
-            if self.device_index is None:
-                logging.error("No audio input device available")
-                raise SystemExit(1)
-            logging.warning(
-                "Audio device index not specified, using default device: %d", self.device_index)
-
-        # デバイスの有効性を確認
-        try:
-            info = self.pa.get_device_info_by_index(self.device_index)
-            if info.get("maxInputChannels", 0) <= 0:
-                raise ValueError("Selected device has no input channels")
-        except Exception as e:
-            logging.error("Invalid audio device index %d: %s",
-                          self.device_index, e)
-            # フォールバックデバイスを探す
-            fallback_index = self._find_default_input_device()
-            if fallback_index is not None:
-                logging.warning(
-                    "Falling back to default device: %d", fallback_index)
-                self.device_index = fallback_index
-                info = self.pa.get_device_info_by_index(self.device_index)
-            else:
-                logging.error("No fallback device available")
-                raise SystemExit(1)
-
-        device_name = get_device_name(
-            self.device_index) or info.get("name")
-        # デバイス名の文字化け対策
-        try:
-            self.device_name = device_name.encode(
-                'cp932').decode('utf-8', errors='ignore')
-        except (UnicodeEncodeError, UnicodeDecodeError, AttributeError):
-            self.device_name = f"Device {self.device_index}"
-        self.num_channels = int(info.get("maxInputChannels", 1))
-        logging.info(
-            "Input device: '%s' (index: %d)",
-            self.device_name,
-            self.device_index,
-        )
-
-        # Try to open audio stream with error handling
-        max_attempts = 3
-        for attempt in range(max_attempts):
-            try:
-                self.stream = self.pa.open(
-                    format=pyaudio.paInt16,
-                    channels=self.num_channels,
-                    rate=self.sample_rate,
-                    input=True,
-                    input_device_index=self.device_index,
-                    frames_per_buffer=self.chunk_size,
-                )
-                break  # Success, exit retry loop
-            except OSError as e:
-                logging.warning(
-                    f"Failed to open audio stream (attempt {attempt + 1}/{max_attempts}): {e}")
-
-                if attempt == max_attempts - 1:  # Last attempt
-                    # Try to find any available input device
-                    logging.error(
-                        "All attempts failed, searching for any available input device...")
-                    available_devices = list_input_devices()
-
-                    for alt_index, alt_name in available_devices:
-                        if alt_index != self.device_index:  # Skip the failing device
-                            try:
-                                logging.info(
-                                    f"Trying alternative device: '{alt_name}' (index: {alt_index})")
-                                alt_info = self.pa.get_device_info_by_index(
-                                    alt_index)
-
-                                self.stream = self.pa.open(
-                                    format=pyaudio.paInt16,
-                                    channels=min(self.num_channels, int(
-                                        alt_info.get("maxInputChannels", 1))),
-                                    rate=self.sample_rate,
-                                    input=True,
-                                    input_device_index=alt_index,
-                                    frames_per_buffer=self.chunk_size,
-                                )
-
-                                # Update device info if successful
-                                self.device_index = alt_index
-                                self.device_name = alt_name
-                                self.num_channels = int(
-                                    alt_info.get("maxInputChannels", 1))
-
-                                # Update config file with new device index
-                                config["audio_device_index"] = alt_index
-                                self._save_config(config, self.config_path)
-
-                                logging.info(
-                                    f"Successfully using alternative device: '{alt_name}' (index: {alt_index})")
-                                logging.info(
-                                    f"Config updated with new device index: {alt_index}")
-                                break
-
-                            except OSError as alt_e:
-                                logging.warning(
-                                    f"Alternative device {alt_index} also failed: {alt_e}")
-                                continue
-                    else:
-                        # No working device found
-                        logging.error("No working audio input device found")
-                        raise SystemExit(1)
-                    break
-        self.fps = float(config.get("fps", 30))
-        self.timecode_offset = float(config.get("timecode_offset", 0.0))
-
-        # Parse timecode_offset: integer part = seconds, decimal part = frames
-        # Example: 1.05 = 1 second + 5 frames
-        offset_seconds = int(self.timecode_offset)
-        offset_frames_decimal = self.timecode_offset - offset_seconds
-
-        # Convert decimal part to frame count (e.g., 0.05 -> 5 frames)
-        # Store original offset value for direct frame calculation in _apply_timecode_offset
-
-        self.decoder = LibLTC(find_libltc(), self.sample_rate, self.fps)
-        self.osc = OSCClient(
-            config.get("osc_ip", "127.0.0.1"),
-            int(config.get("osc_port", 9000)),
-            config.get("osc_address", "/ltc"),
-        )
-
-        # Initialize timecode status monitor
-        stop_timeout = float(config.get("stop_timeout", 0.5))
+class ChannelDecoder:
+    """Decoder, stop detection and OSC addresses for one input channel."""
+
+    def __init__(self, channel: int, sample_rate: int, fps: float, osc: OSCClient,
+                 timecode_offset: float = 0.0, stop_timeout: float = 0.5,
+                 frame_trace: float = 0.0, decimation: int = 1):
+        self.channel = channel
+        self.fps = fps
+        self.timecode_offset = timecode_offset
+        # The decoder runs at the decimated rate; frame offsets it reports
+        # are scaled back to device samples.
+        self.decimator = Decimator(decimation) if decimation > 1 else None
+        self.decoder = LibLTC(find_libltc(), sample_rate // decimation, fps, decimation)
+        self.osc = osc
         self.status_monitor = TimecodeStatusMonitor(timeout=stop_timeout)
+        self.last_timeout_check = time.time()
+        # Called with (hours, minutes, seconds, frames, started) of every
+        # decoded frame, offset applied, ``started`` being the monotonic
+        # time the frame began in the input; used to regenerate LTC.
+        self.timecode_listeners = []
+        # Per-frame trace at DEBUG level, at most ``frame_trace`` lines per
+        # second; one per decoder, each fed by its own capture thread.
+        self.trace = RateLimitedLog(frame_trace, logging.DEBUG)
+        # (RedundancyGroup, index) when this channel is a main/backup
+        # source; the group then sends the OSC output instead.
+        self.redundancy = None
+        # Sample clock of the capture stream (set by LTCReader) and the
+        # snapshot answering timecode queries, if enabled.
+        self.clock = None
+        self.samples_in = 0
+        self.last_frame_time = None
+        self.last_position = None
+        self.snapshot = None
+        # TimecodeSlot of the shared memory output, if enabled.
+        self.shared = None
+        # CueEngine following this channel, if cues are enabled.
+        self.cues = None
+        # StageTimers of the owning loop while stage timing is on.
+        self.profile = None
 
         # Log offset information for user reference
         if self.timecode_offset != 0:
             offset_frames = round(self.timecode_offset * self.fps)
-            logging.info(
-                f"Timecode offset: {self.timecode_offset:.3f}s = {offset_frames} frames @ {self.fps}fps")
+            logging.info("Timecode offset (%s): %.3fs = %d frames @ %sfps",
+                         osc.base_address, self.timecode_offset, offset_frames, self.fps)
 
-        self.running = True
-        signal.signal(signal.SIGINT, self._on_sigint)
-
-    def _find_default_input_device(self) -> int | None:
-        """利用可能な入力デバイスの中から最初のものを返す"""
-        devices = list_input_devices()
-        return devices[0][0] if devices else None
-
-    def _on_sigint(self, *_):
-        self.running = False
+    def set_timecode_offset(self, offset: float) -> None:
+        """Change the offset; used from the next decoded frame."""
+        self.timecode_offset = offset
+        logging.info("Timecode offset (%s) set to %.3f",
+                     self.osc.base_address, offset)
 
     def _apply_timecode_offset(self, hours, minutes, seconds, frames):
         """Apply offset to timecode and handle wraparound."""
@@ -575,74 +624,985 @@ class LTCReader:
 
         return new_hours, new_minutes, new_seconds, new_frames
 
-    def loop(self):
-        logging.info("Starting LTC decode loop...")
+    def _frame_start_time(self, stime) -> float:
+        """Monotonic time at which the frame started in the input signal."""
+        position = getattr(stime, "off_start", None)
+        started = None
+        if self.clock is not None and position is not None:
+            if self.decimator is not None:
+                position -= self.decimator.delay
+            started = self.clock.time_of(position)
+        if started is None:
+            # No sample position: the frame ended within the last chunk.
+            started = time.monotonic() - 1.0 / self.fps
+        return started
+
+    def start(self):
+        """Send the initial status message (stopped state)."""
+        if self.redundancy is not None:
+            return
+        logging.info("Sending initial status (%s): stopped", self.osc.base_address)
+        self.osc.send_status(False)
+
+    def process(self, samples) -> int:
+        """Decode one chunk of mono samples and send the frames found.
+
+        ``samples`` may be None when no audio arrived; stop detection still
+        runs. Returns the number of frames decoded.
+        """
+        prof = self.profile
+        if samples is not None:
+            self.samples_in += len(samples)
+            if self.decimator is not None:
+                samples = self.decimator.process(samples)
+                if prof is not None:
+                    prof.mark("decimate")
+            self.decoder.write(samples)
+            if prof is not None:
+                prof.mark("decode_write")
+
+        frames_decoded = 0
+        for stime in self.decoder.read():
+            if prof is not None:
+                prof.mark("decode_read")
+            frames_decoded += 1
+            # Apply timecode offset
+            hours, minutes, seconds, frames = self._apply_timecode_offset(
+                stime.hours, stime.mins, stime.secs, stime.frame
+            )
+            tc = f"{hours:02d}:{minutes:02d}:{seconds:02d}:{frames:02d}"
+            self.last_frame_time = self._frame_start_time(stime)
+            for listener in self.timecode_listeners:
+                listener(hours, minutes, seconds, frames, self.last_frame_time)
+            self.last_position = getattr(stime, "off_start", None)
+            if self.snapshot is not None:
+                self.snapshot.publish(hours, minutes, seconds, frames,
+                                      self.last_frame_time)
+            shared = self.shared
+            if shared is not None:
+                shared.publish(hours, minutes, seconds, frames,
+                               timecode_to_frames(hours, minutes, seconds, frames,
+                                                  shared.fps, shared.drop_frame),
+                               self.last_position, self.last_frame_time)
+
+            if self.trace.enabled:
+                self.trace.log("Decoded %s %s (offset applied)",
+                               self.osc.base_address, tc)
+
+            # Monitor status changes
+            status_changed = self.status_monitor.update_timecode(tc)
+            if prof is not None:
+                prof.mark("offset")
+            if self.redundancy is not None:
+                group, index = self.redundancy
+                group.selector.frame(index, hours, minutes, seconds, frames,
+                                     getattr(stime, "volume", None))
+                if prof is not None:
+                    prof.mark("send")
+                continue
+            if status_changed:
+                # Send status with timecode via OSC
+                logging.info("Sending status: %s, timecode: %s",
+                             self.status_monitor.is_running, tc)
+                self.osc.send_status(self.status_monitor.is_running, tc)
+
+            cues = self.cues
+            if cues is not None:
+                fired = cues.frame(hours, minutes, seconds, frames, self.last_frame_time)
+                if fired:
+                    self.osc.send_cues(tc, fired)
+                    if prof is not None:
+                        prof.mark("send")
+                    continue
+            # Send timecode only
+            self.osc.send(tc)
+            if prof is not None:
+                prof.mark("send")
+        if prof is not None:
+            prof.mark("decode_read")
+        if not frames_decoded and self.cues is not None:
+            fired = self.cues.tick()
+            if fired:
+                self.osc.send_cues(None, fired)
+
+        # Check for timeout periodically when no timecode is found
+        current_time = time.time()
+        # Check every 100ms
+        if not frames_decoded and (current_time - self.last_timeout_check) > 0.1:
+            timeout_status_changed = self.status_monitor.check_timeout()
+            if timeout_status_changed and self.shared is not None:
+                self.shared.set_status(self.status_monitor.is_running)
+            if timeout_status_changed and self.redundancy is None:
+                logging.info("Sending timeout status: %s",
+                             self.status_monitor.is_running)
+                self.osc.send_status(
+                    self.status_monitor.is_running, self.status_monitor.last_timecode)
+            self.last_timeout_check = current_time
+        if prof is not None:
+            prof.mark("other")
+        return frames_decoded
+
+    def close(self):
+        self.decoder.close()
+
 
-        # Send initial status message (stopped state)
-        logging.info("Sending initial status: stopped")
+class RedundancyGroup:
+    """Send one timecode stream chosen from redundant channels.
+
+    ``settings`` is the ``redundancy`` config: ``sources`` (channel,
+    optional device and name per source, in order of preference),
+    ``osc_address``, ``grace`` (frames), ``min_streak`` and ``min_volume``
+    (dBFS). Selection is done by ``modules.redundancy.RedundancySelector``;
+    every switchover is sent to ``<osc_address>/source``.
+    """
+
+    def __init__(self, settings: dict, decoders: list, names: list, osc: OSCClient,
+                 fps: float, stop_timeout: float = 0.5):
+        self.osc = osc
+        self.names = names
+        self.decoders = decoders
+        self.snapshot = None
+        self.shared = None
+        self.cues = None
+        self.status_monitor = TimecodeStatusMonitor(timeout=stop_timeout)
+        self.last_timeout_check = time.time()
+        self._lock = threading.Lock()
+        from modules.redundancy import RedundancySelector
+
+        min_volume = settings.get("min_volume")
+        self.selector = RedundancySelector(
+            names, fps, self._on_frame, self._on_switch,
+            grace=float(settings.get("grace", 0.5)),
+            min_streak=int(settings.get("min_streak", 3)),
+            min_volume=None if min_volume is None else float(min_volume))
+        for index, decoder in enumerate(decoders):
+            decoder.redundancy = (self, index)
+        logging.info("Redundancy on %s: %s", osc.base_address,
+                     ", ".join(f"{n} (ch{d.channel})" for n, d in zip(names, decoders)))
+
+    def start(self):
+        logging.info("Sending initial status (%s): stopped", self.osc.base_address)
         self.osc.send_status(False)
 
-        last_timeout_check = time.time()
+    def _on_frame(self, hours, minutes, seconds, frames):
+        # Called by the selector under its lock, so never concurrently.
+        tc = f"{hours:02d}:{minutes:02d}:{seconds:02d}:{frames:02d}"
+        if self.status_monitor.update_timecode(tc):
+            logging.info("Sending status: %s, timecode: %s",
+                         self.status_monitor.is_running, tc)
+            self.osc.send_status(self.status_monitor.is_running, tc)
+        started = self.decoders[self.selector.active].last_frame_time
+        fired = (self.cues.frame(hours, minutes, seconds, frames, started)
+                 if self.cues is not None else None)
+        if fired:
+            self.osc.send_cues(tc, fired)
+        else:
+            self.osc.send(tc)
+        if self.snapshot is not None and started is not None:
+            self.snapshot.publish(hours, minutes, seconds, frames, started)
+        shared = self.shared
+        if shared is not None:
+            shared.publish(hours, minutes, seconds, frames,
+                           timecode_to_frames(hours, minutes, seconds, frames,
+                                              shared.fps, shared.drop_frame),
+                           self.decoders[self.selector.active].last_position,
+                           started if started is not None else time.monotonic())
+
+    def _on_switch(self, old, new, reason):
+        if old is None:
+            logging.info("Redundancy: following '%s'", new)
+            return
+        logging.warning("Redundancy: switched from '%s' to '%s' (%s)", old, new, reason)
+        self.osc.send_source(new, reason)
+
+    def tick(self):
+        """Run failover and stop detection; called after every capture chunk."""
+        self.selector.tick()
+        if self.cues is not None:
+            fired = self.cues.tick()
+            if fired:
+                self.osc.send_cues(None, fired)
+        current_time = time.time()
+        if current_time - self.last_timeout_check <= 0.1:
+            return
+        with self._lock:
+            self.last_timeout_check = current_time
+            if self.status_monitor.check_timeout():
+                if self.shared is not None:
+                    self.shared.set_status(self.status_monitor.is_running)
+                logging.info("Sending timeout status: %s",
+                             self.status_monitor.is_running)
+                self.osc.send_status(
+                    self.status_monitor.is_running, self.status_monitor.last_timecode)
+
+    def get_status(self) -> dict:
+        status = self.selector.get_status()
+        status["osc_address"] = self.osc.base_address
+        status["status"] = self.status_monitor.get_status()
+        return status
+
 
-        while self.running:
-            data = self.stream.read(
-                self.chunk_size, exception_on_overflow=False)
-            samples = array.array('h', data)
-            if self.num_channels > 1:
-                samples = samples[self.channel::self.num_channels]
-            self.decoder.write(samples)
+class LTCReader:
+    """Capture one input device and decode one or more of its channels."""
+
+    def __init__(self, config: dict, config_path: str = "config.json", source=None,
+                 osc: OSCClient | None = None, fallback: bool = True):
+        """``source`` replaces the configured audio device with a stand-in
+        (see ``modules.audio_sources.SimulatedSource``). ``osc`` shares the
+        OSC output stage of a ``CaptureManager``. Without ``fallback`` a
+        missing device is not replaced by another input: the reader starts
+        disconnected and waits for it."""
+        self.config_path = config_path
+        self.fallback = fallback
+        self.config = config
+        self.sample_rate = int(config.get("sample_rate", 48000))
+        self.device_index = config.get("audio_device_index")
+        profile = resolve_latency_profile(config)
+        self.latency_profile = profile["name"]
+        self.chunk_size = profile["chunk_size"]
+        self.chunk_controller = None
+        if config.get("adaptive_chunk"):
+            self.chunk_controller = AdaptiveChunkController(
+                profile["min_chunk"], profile["max_chunk"])
+        silence_timeout = float(config.get("silence_timeout", 0.0))
+
+        if source is not None:
+            self.registry = None
+            self.capture = None
+            self._capture_settings = None
+            self.device = None
+            self.device_index = None
+            self.host_api = None
+            self.device_name = source.device_name
+            self.num_channels = source.num_channels
+            self.sample_rate = source.sample_rate
+            self.supervisor = CaptureSupervisor(
+                lambda refresh: self._reopen_simulated(source), silence_timeout)
+            logging.info("Input device: '%s' (simulated)", self.device_name)
+        else:
+            self._resolve_device(config)
+            # Capture in a child process (see modules.capture_process).
+            self.capture = None
+            self._capture_settings = config.get("capture_process") or None
+            if self._capture_settings is True:
+                self._capture_settings = {}
+            if self._capture_settings is not None:
+                self._silence_timeout = silence_timeout
+                # The child watches the device; the ring only stalls if it dies.
+                self.supervisor = CaptureSupervisor(self._reopen_device)
+            else:
+                self.supervisor = CaptureSupervisor(
+                    self._reopen_device, silence_timeout)
+                # Another reader refreshing the shared PortAudio instance
+                # invalidates this stream; close it first and reconnect after.
+                self.registry.add_refresh_listener(self.supervisor.suspend)
+        self._open_initial_stream(config)
+
+        self.stats = LoopStats(self.sample_rate, self.chunk_size)
+        if self.supervisor.source is not None:
+            self.stats.stream_latency = self.supervisor.source.latency
+        self.stats_interval = float(config.get("stats_interval", 0.0))
+        logging.info(
+            "Latency profile '%s': %d frames per chunk (%.1fms), stream latency %s%s",
+            self.latency_profile, self.chunk_size,
+            self.chunk_size * 1000.0 / self.sample_rate,
+            f"{self.stats.stream_latency * 1000.0:.1f}ms"
+            if self.stats.stream_latency is not None else "n/a",
+            ", adaptive" if self.chunk_controller else "")
+
+        self.fps = float(config.get("fps", 30))
+        self.decimation = self._decimation_factor(config)
+        if osc is None:
+            osc = OSCClient(
+                config.get("osc_ip", "127.0.0.1"),
+                int(config.get("osc_port", 9000)),
+                config.get("osc_address", "/ltc"),
+                _parse_destinations(config),
+            )
+        self.osc = osc
+
+        # One decoder set per channel; each sends to its own OSC address.
+        stop_timeout = float(config.get("stop_timeout", 0.5))
+        self.channels = []
+        for spec in channel_specs(config):
+            if spec["channel"] >= self.num_channels:
+                logging.warning("Channel %d not available on '%s' (%d channels)",
+                                spec["channel"], self.device_name, self.num_channels)
+            self.channels.append(ChannelDecoder(
+                spec["channel"], self.sample_rate, self.fps,
+                osc.for_address(spec["osc_address"]),
+                spec["timecode_offset"], stop_timeout,
+                float(config.get("frame_trace", 0.0)), self.decimation))
+
+        # Redundancy groups fed by this reader's channels, ticked per chunk.
+        self.groups = []
+
+        # Maps sample positions to time for extrapolating decoded frames.
+        from modules.timecode_query import SampleClock
+
+        self.clock = SampleClock(self.sample_rate, self.stats.stream_latency)
+        self.samples_read = 0
+        for decoder in self.channels:
+            decoder.clock = self.clock
+
+        # Switched at runtime over IPC: per-stage timers and a pending
+        # cProfile capture (see modules.profiling).
+        self.profile = None
+        self.profile_capture = None
+
+        self.running = True
+        self._started = False
+        # Set by _run_once so the loop can report time-to-first-timecode.
+        self.startup_timer = None
+        signal.signal(signal.SIGINT, self._on_sigint)
+
+    # Single-channel view kept for the tray, settings window and IPC.
+    @property
+    def channel(self) -> int:
+        return self.channels[0].channel
+
+    @property
+    def status_monitor(self) -> TimecodeStatusMonitor:
+        return self.channels[0].status_monitor
+
+    @property
+    def timecode_offset(self) -> float:
+        return self.channels[0].timecode_offset
+
+    def _decimation_factor(self, config: dict) -> int:
+        try:
+            factor = decimation_factor(config.get("decimation", 1), self.sample_rate)
+        except ValueError as e:
+            logging.error("Decimation disabled: %s", e)
+            return 1
+        if factor > 1 and not numpy_available():
+            logging.error("Decimation disabled: numpy is not installed")
+            return 1
+        if factor > 1:
+            logging.info("Decimating %dHz input by %d to %dHz before decoding",
+                         self.sample_rate, factor, self.sample_rate // factor)
+        return factor
+
+    def _on_sigint(self, *_):
+        self.running = False
+
+    # Settings that need the audio stream or decoder to be recreated.
+    RESTART_KEYS = (
+        "audio_device_index", "audio_device_name", "audio_host_api",
+        "channel", "channels", "sample_rate", "fps", "osc_address", "silence_timeout",
+        "latency_profile", "chunk_size", "adaptive_chunk", "stats_interval", "ltc_output",
+        "decimation", "redundancy", "timecode_query", "capture_process", "cues",
+        "timecode_shm",
+    )
 
-            timecode_found = False
-
-            # print("Samples:", samples[:10])
-            # print("Samples len:", len(samples))
-            for stime in self.decoder.read():
-                timecode_found = True
-                # Apply timecode offset
-                hours, minutes, seconds, frames = self._apply_timecode_offset(
-                    stime.hours, stime.mins, stime.secs, stime.frame
-                )
-                tc = f"{hours:02d}:{minutes:02d}:{seconds:02d}:{frames:02d}"
-
-                # Monitor status changes
-                status_changed = self.status_monitor.update_timecode(tc)
-                if status_changed:
-                    # Send status with timecode via OSC
-                    logging.info(
-                        f"Sending status: {self.status_monitor.is_running}, timecode: {tc}")
-                    self.osc.send_status(self.status_monitor.is_running, tc)
-
-                logging.debug("Decoded %s (offset applied)", tc)
-                # Send timecode only
-                self.osc.send(tc)
-
-            # Check for timeout periodically when no timecode is found
-            current_time = time.time()
-            # Check every 100ms
-            if not timecode_found and (current_time - last_timeout_check) > 0.1:
-                timeout_status_changed = self.status_monitor.check_timeout()
-                if timeout_status_changed:
-                    logging.info(
-                        f"Sending timeout status: {self.status_monitor.is_running}")
-                    self.osc.send_status(
-                        self.status_monitor.is_running, self.status_monitor.last_timecode)
-                last_timeout_check = current_time
+    def set_timecode_offset(self, offset: float, channel: int | None = None) -> None:
+        """Change the offset of one channel (default: all channels)."""
+        for decoder in self.channels:
+            if channel is None or decoder.channel == channel:
+                decoder.set_timecode_offset(offset)
+
+    def apply_config(self, config: dict) -> bool:
+        """Apply the settings that can change while running.
+
+        Returns True if other settings changed that only take effect after
+        a restart.
+        """
+        restart = any(config.get(k) != self.config.get(k)
+                      for k in self.RESTART_KEYS)
+        stop_timeout = float(config.get("stop_timeout", 0.5))
+        for decoder, spec in zip(self.channels, channel_specs(config)):
+            if spec["timecode_offset"] != decoder.timecode_offset:
+                decoder.set_timecode_offset(spec["timecode_offset"])
+            decoder.status_monitor.timeout = stop_timeout
+            decoder.trace.set_rate(float(config.get("frame_trace", 0.0)))
+        self.osc.set_destinations(_parse_destinations(config))
+        self.config = config
+        return restart
+
+    def _resolve_device(self, config: dict) -> None:
+        """Pick the input device from config, falling back to the default one."""
+        self.registry = get_registry()
+
+        # デバイス名 (+ Host API) を優先して解決し、見つからなければフォールバック
+        configured_name = config.get("audio_device_name")
+        dev = self.registry.resolve(
+            self.device_index, configured_name, config.get("audio_host_api"))
+        if dev is None and not self.fallback:
+            # One of several inputs: another device would be decoded twice
+            # or under the wrong address, so wait for this one instead.
+            self.device = {"index": self.device_index, "name": configured_name,
+                           "host_api": config.get("audio_host_api"),
+                           "max_input_channels": 0}
+            self.host_api = self.device["host_api"]
+            self.device_name = configured_name or f"Device {self.device_index}"
+            self.num_channels = max(spec["channel"] for spec in channel_specs(config)) + 1
+            return
+        if dev is None:
+            fallback = self.registry.default_input()
+            if fallback is None:
+                logging.error("No audio input device available")
+                raise SystemExit(1)
+            if self.device_index is None and not configured_name:
+                logging.warning(
+                    "Audio device not specified, using default device: %d", fallback["index"])
+            else:
+                logging.error("Configured audio device not found (name: %s, index: %s)",
+                              configured_name, self.device_index)
+                logging.warning(
+                    "Falling back to default device: %d", fallback["index"])
+            dev = fallback
+        self._use_device(dev)
+        self.num_channels = max(1, dev["max_input_channels"])
+        logging.info(
+            "Input device: '%s' (index: %d, host API: %s)",
+            self.device_name,
+            self.device_index,
+            self.host_api,
+        )
+
+    def _use_device(self, dev: dict) -> None:
+        self.device = dev
+        self.device_index = dev["index"]
+        self.host_api = dev["host_api"]
+        # デバイス名の文字化け対策
+        try:
+            self.device_name = dev["name"].encode(
+                'cp932').decode('utf-8', errors='ignore')
+        except (UnicodeEncodeError, UnicodeDecodeError, AttributeError):
+            self.device_name = f"Device {self.device_index}"
+
+    def _open_device_source(self, dev: dict, num_channels: int):
+        if self._capture_settings is not None:
+            return self._start_capture_process(dev, num_channels)
+        source = PyAudioSource(self.registry.pa, dev, self.sample_rate,
+                               num_channels, self.chunk_size)
+        source.open()
+        return source
+
+    def _start_capture_process(self, dev: dict, num_channels: int):
+        from modules.capture_process import CaptureProcess
+
+        if self.capture is not None:
+            self.capture.stop()
+        settings = self._capture_settings
+        self.capture = CaptureProcess(
+            dev, self.sample_rate, num_channels,
+            int(settings.get("frames_per_buffer") or self.chunk_size),
+            float(settings.get("ring_seconds", 2.0)), self._silence_timeout)
+        try:
+            self.capture.start()
+        except OSError:
+            self.capture = None
+            raise
+        return self.capture.attach(self.chunk_size)
+
+    def _reopen_device(self, refresh: bool):
+        """Reopen the device in use by name; called by the capture supervisor."""
+        if self.capture is not None:
+            # The capture process reconnects to the device by itself.
+            return self.capture.attach(self.chunk_size)
+        if self._capture_settings is not None and self.device["max_input_channels"]:
+            return self._start_capture_process(self.device, self.num_channels)
+        if refresh:
+            # Rate-limited: every reader and the LTC output lose their
+            # streams on a refresh, however many inputs are missing.
+            self.registry.refresh(max_age=REFRESH_INTERVAL)
+        dev = self.registry.resolve(self.device_index, self.device["name"], self.host_api)
+        if dev is None:
+            raise AudioSourceError(f"'{self.device_name}' is not present")
+        source = self._open_device_source(
+            dev, min(self.num_channels, dev["max_input_channels"]))
+        self._use_device(dev)
+        self.num_channels = source.num_channels
+        return source
+
+    def _reopen_simulated(self, source):
+        source.frames_per_buffer = self.chunk_size
+        source.open()
+        return source
+
+    def _open_initial_stream(self, config: dict) -> None:
+        """Open the audio stream, trying other input devices as a last resort."""
+        if self.device is not None and not self.device["max_input_channels"]:
+            self.supervisor.start_disconnected(
+                f"'{self.device_name}' not found (index: {self.device_index})")
+            return
+        max_attempts = 3
+        for attempt in range(max_attempts):
+            try:
+                self.supervisor.open()
+                return
+            except OSError as e:
+                logging.warning(
+                    "Failed to open audio stream (attempt %d/%d): %s",
+                    attempt + 1, max_attempts, e)
+
+        if self.registry is None:
+            logging.error("No working audio input device found")
+            raise SystemExit(1)
+        if not self.fallback:
+            self.supervisor.start_disconnected(f"'{self.device_name}' failed to open")
+            return
+
+        # Try to find any available input device
+        logging.error(
+            "All attempts failed, searching for any available input device...")
+        for alt in self.registry.input_devices():
+            if alt["index"] == self.device_index:  # Skip the failing device
+                continue
+            alt_index = alt["index"]
+            alt_name = alt["name"]
+            try:
+                logging.info(
+                    "Trying alternative device: '%s' (index: %d)", alt_name, alt_index)
+                self.supervisor.source = self._open_device_source(
+                    alt, min(self.num_channels, alt["max_input_channels"]))
+            except OSError as alt_e:
+                logging.warning(
+                    "Alternative device %d also failed: %s", alt_index, alt_e)
+                continue
+
+            # Update device info if successful
+            self._use_device(alt)
+            self.num_channels = self.supervisor.source.num_channels
+
+            # Update config file with the new device
+            config["audio_device_index"] = alt_index
+            config["audio_device_name"] = alt_name
+            config["audio_host_api"] = alt["host_api"]
+            logging.info(
+                "Successfully using alternative device: '%s' (index: %d)", alt_name, alt_index)
+            # Entries of an "inputs" list are not written back: that would
+            # flatten the list into top-level keys.
+            if self.config_path:
+                self._save_config(config, self.config_path)
+                logging.info("Config updated with new device: %s", alt_name)
+            return
+
+        # No working device found
+        logging.error("No working audio input device found")
+        raise SystemExit(1)
+
+    def start(self):
+        """Send the initial status message (stopped state) once."""
+        if self._started:
+            return
+        self._started = True
+        for decoder in self.channels:
+            decoder.start()
+
+    def loop(self):
+        logging.info("Starting LTC decode loop (%s)...", self.device_name)
+        self.start()
+
+        # Stats windows drive the periodic log, the adaptive chunk size and
+        # the figures reported over IPC, so they are always collected.
+        stats_period = self.stats_interval or 5.0
+        self.stats.reset()
+
+        while self.running:
+            prof = self.profile
+            if prof is not None:
+                prof.begin()
+            if self.profile_capture is not None and not self.profile_capture.poll():
+                self.profile_capture = None
+            # None while the device is lost; the supervisor reconnects in the
+            # background of this loop and the decoder state is kept.
+            data = self.supervisor.read()
+            chunk_start = time.perf_counter()
+            if prof is not None:
+                prof.mark("read")
+            interleaved = array.array('h', data) if data is not None else None
+            if interleaved is not None:
+                self.samples_read += len(interleaved) // self.num_channels
+                self.clock.update(self.samples_read, time.monotonic())
+
+            frames_decoded = 0
+            for decoder in self.channels:
+                samples = interleaved
+                if samples is not None and self.num_channels > 1:
+                    samples = samples[decoder.channel::self.num_channels]
+                if prof is not None:
+                    prof.mark("deinterleave")
+                frames_decoded += decoder.process(samples)
+            for group in self.groups:
+                group.tick()
+
+            if frames_decoded and self.startup_timer is not None:
+                logging.info("First timecode decoded %.1fms after launch",
+                             self.startup_timer.elapsed_ms())
+                self.startup_timer = None
+
+            if data is not None:
+                self.stats.record_chunk(
+                    time.perf_counter() - chunk_start, frames_decoded)
+                self.stats.record_overflows(self.supervisor.take_overflows())
+            if self.stats.window_elapsed() >= stats_period:
+                self._on_stats_window(self.stats.window())
+            if prof is not None:
+                prof.mark("other")
         self.close()
 
+    def _on_stats_window(self, stats: dict) -> None:
+        if self.stats_interval:
+            logging.info(
+                "Loop stats [%s]: chunk %d (%.1fms), %.1f chunks/s, %.1f frames/s, "
+                "overflows %.2f/s, busy %.1f%% (max %.2fms), cpu %.1f%%",
+                self.device_name, stats["chunk_size"], stats["chunk_ms"], stats["chunks_per_s"],
+                stats["frames_per_s"], stats["overflows_per_s"], stats["busy_pct"],
+                stats["busy_max_ms"], stats["cpu_pct"])
+        if self.chunk_controller is None or not self.supervisor.connected:
+            return
+        new_size = self.chunk_controller.evaluate(self.chunk_size, stats)
+        if new_size is not None:
+            self._set_chunk_size(new_size)
+
+    def _set_chunk_size(self, chunk_size: int) -> None:
+        """Reopen the stream with a new buffer/read size, keeping decoder state."""
+        logging.info("Adaptive chunk size: %d -> %d frames",
+                     self.chunk_size, chunk_size)
+        self.chunk_size = chunk_size
+        self.stats.chunk_size = chunk_size
+        self.supervisor.reopen()
+        if self.supervisor.source is not None:
+            self.stats.stream_latency = self.supervisor.source.latency
+            self.clock.latency = self.stats.stream_latency or 0.0
+
     def close(self):
-        self.stream.stop_stream()
-        self.stream.close()
-        self.pa.terminate()
-        self.decoder.close()
+        # Called by the loop thread, which a cProfile capture is recording:
+        # a loop stopped by a restart or shutdown still writes its profile.
+        if self.profile_capture is not None:
+            self.profile_capture.stop()
+            self.profile_capture = None
+        if self.registry is not None:
+            self.registry.remove_refresh_listener(self.supervisor.suspend)
+        self.supervisor.close()
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
+        for decoder in self.channels:
+            decoder.close()
 
     def _save_config(self, config: dict, config_path: str = "config.json") -> None:
         """Save configuration to JSON file."""
         try:
             with open(config_path, "w", encoding="utf-8") as fh:
                 json.dump(config, fh, indent=2, ensure_ascii=False)
-            logging.info(f"Config saved to {config_path}")
+            logging.info("Config saved to %s", config_path)
         except Exception as e:
-            logging.error(f"Failed to save config: {e}")
+            logging.error("Failed to save config: %s", e)
+
+
+class CaptureManager:
+    """Run one ``LTCReader`` per configured input device in one process.
+
+    All readers share the PortAudio instance (``DeviceRegistry``) and one
+    OSC output stage, so destinations and mute apply to every input. The
+    first reader runs in the calling thread, the others in their own
+    threads; each keeps its own stream, decoders and reconnect logic, so a
+    lost device does not stall the other inputs.
+    """
+
+    def __init__(self, config: dict, config_path: str = "config.json", source=None):
+        self.config = config
+        self.config_path = config_path
+        self.osc = OSCClient(
+            config.get("osc_ip", "127.0.0.1"),
+            int(config.get("osc_port", 9000)),
+            config.get("osc_address", "/ltc"),
+            _parse_destinations(config),
+        )
+        input_configs = expand_inputs(config)
+        if source is not None and len(input_configs) > 1:
+            logging.warning("Simulated input replaces the first input only")
+        # A plain single-device config may be rewritten on device fallback.
+        reader_path = None if config.get("inputs") else config_path
+        self.readers = []
+        for i, input_config in enumerate(input_configs):
+            self.readers.append(LTCReader(
+                input_config, reader_path, source if i == 0 else None, self.osc,
+                fallback=len(input_configs) == 1))
+        addresses = [d.osc.base_address for r in self.readers for d in r.channels]
+        for address in sorted({a for a in addresses if addresses.count(a) > 1}):
+            logging.warning("Several input channels send to %s; give each its own "
+                            "'osc_address'", address)
+        self._threads = []
+        self.ltc_output = None
+        self.timecode_query = None
+        self.timecode_shm = None
+        self.cues = None
+        self.cue_settings = None
+        self._sampler = None
+        self.redundancy = None
+        if config.get("redundancy"):
+            self.redundancy = self._create_redundancy(config["redundancy"])
+
+    @property
+    def running(self) -> bool:
+        return self.readers[0].running
+
+    @running.setter
+    def running(self, value: bool) -> None:
+        for reader in self.readers:
+            reader.running = value
+
+    @property
+    def startup_timer(self):
+        return self.readers[0].startup_timer
+
+    @startup_timer.setter
+    def startup_timer(self, timer) -> None:
+        self.readers[0].startup_timer = timer
+
+    def _create_redundancy(self, settings: dict) -> "RedundancyGroup | None":
+        decoders, names = [], []
+        for i, source in enumerate(settings.get("sources", [])):
+            if not isinstance(source, dict):
+                source = {"channel": source}
+            channel = int(source.get("channel", 0))
+            device = source.get("device")
+            matches = [d for r in self.readers for d in r.channels
+                       if d.channel == channel and device in (None, r.device_name)]
+            if not matches:
+                logging.error("Redundancy source ch%d%s is not decoded; add it to "
+                              "'channels' or 'inputs'", channel,
+                              f" on '{device}'" if device else "")
+                return None
+            if len(matches) > 1:
+                logging.error("Redundancy source ch%d is decoded on several inputs; "
+                              "set its 'device'", channel)
+                return None
+            if matches[0] in decoders:
+                logging.error("Redundancy sources %d and %d are the same input (ch%d)",
+                              decoders.index(matches[0]), i, channel)
+                return None
+            decoders.append(matches[0])
+            names.append(source.get("name") or ("main" if i == 0 else f"backup{i}"))
+        if len(decoders) < 2:
+            logging.error("Redundancy needs at least two sources")
+            return None
+        first = self.readers[0]
+        group = RedundancyGroup(
+            settings, decoders, names,
+            self.osc.for_address(settings.get("osc_address")
+                                 or self.config.get("osc_address", "/ltc")),
+            first.fps, float(self.config.get("stop_timeout", 0.5)))
+        for reader in self.readers:
+            if any(d.redundancy is not None and d.redundancy[0] is group
+                   for d in reader.channels):
+                reader.groups.append(group)
+        return group
+
+    def start(self):
+        """Announce the initial (stopped) status of every channel."""
+        for reader in self.readers:
+            reader.start()
+        if self.redundancy is not None:
+            self.redundancy.start()
+
+    def loop(self):
+        for reader in self.readers[1:]:
+            thread = threading.Thread(
+                target=reader.loop, name=f"capture-{reader.device_name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self.readers[0].loop()
+        # The first loop returns once running was cleared for all readers.
+        for thread in self._threads:
+            thread.join(timeout=2)
+        if self.ltc_output is not None:
+            self.ltc_output.close()
+            self.ltc_output = None
+        if self.timecode_query is not None:
+            self.timecode_query.close()
+            self.timecode_query = None
+        if self.timecode_shm is not None:
+            self.timecode_shm.close()
+            self.timecode_shm = None
+
+    def start_ltc_output(self, settings: dict) -> None:
+        """Start regenerating LTC as configured by ``ltc_output``."""
+        from modules.ltc_output import LTCOutput
+
+        first = self.readers[0]
+        try:
+            output = LTCOutput(settings, first.fps, first.sample_rate, get_registry())
+        except (OSError, ValueError) as e:
+            logging.error("LTC output disabled: %s", e)
+            return
+        if output.kind == "input":
+            wanted = settings.get("input_channel")
+            decoders = [d for r in self.readers for d in r.channels
+                        if wanted is None or d.channel == wanted]
+            if not decoders:
+                logging.error("LTC output disabled: no decoded channel %s", wanted)
+                return
+            decoders[0].timecode_listeners.append(output.source.update_started)
+        try:
+            output.start()
+        except OSError as e:
+            logging.error("Failed to open LTC output: %s", e)
+            output.close()
+            return
+        self.ltc_output = output
+
+    def start_timecode_query(self, settings: dict) -> None:
+        """Answer UDP timecode queries as configured by ``timecode_query``."""
+        from modules.timecode_query import TimecodeQueryServer, TimecodeSnapshot
+
+        first = self.readers[0]
+        fps = float(settings.get("fps") or first.fps)
+        drop_frame = bool(settings.get("drop_frame", False))
+        max_age = float(self.config.get("stop_timeout", 0.5))
+        snapshots = {}
+        if self.redundancy is not None:
+            self.redundancy.snapshot = TimecodeSnapshot(fps, drop_frame, max_age)
+            snapshots[self.redundancy.osc.base_address] = self.redundancy.snapshot
+        for reader in self.readers:
+            for decoder in reader.channels:
+                decoder.snapshot = TimecodeSnapshot(fps, drop_frame, max_age)
+                snapshots.setdefault(decoder.osc.base_address, decoder.snapshot)
+        try:
+            server = TimecodeQueryServer(snapshots, int(settings.get("port", 9100)),
+                                         settings.get("ip", "0.0.0.0"))
+        except OSError as e:
+            logging.error("Timecode query server disabled: %s", e)
+            return
+        server.start()
+        self.timecode_query = server
+
+    def start_timecode_shm(self, settings: dict) -> None:
+        """Publish the latest frames in shared memory as configured by ``timecode_shm``."""
+        from modules.timecode_shm import DEFAULT_NAME, TimecodeSharedMemory
+
+        first = self.readers[0]
+        fps = float(settings.get("fps") or first.fps)
+        drop_frame = bool(settings.get("drop_frame", False))
+        targets = {}
+        if self.redundancy is not None:
+            targets[self.redundancy.osc.base_address] = self.redundancy
+        for reader in self.readers:
+            for decoder in reader.channels:
+                targets.setdefault(decoder.osc.base_address, decoder)
+        try:
+            block = TimecodeSharedMemory(list(targets), fps, drop_frame,
+                                         settings.get("name") or DEFAULT_NAME)
+        except (OSError, ValueError) as e:
+            logging.error("Shared memory timecode disabled: %s", e)
+            return
+        for address, target in targets.items():
+            target.shared = block.slots[address]
+        self.timecode_shm = block
+        logging.info("Shared memory timecode '%s' (%s)", block.name, ", ".join(targets))
+
+    def start_cues(self, settings: dict) -> None:
+        """Fire the cue list configured by ``cues`` from one timecode stream."""
+        from modules.cues import CueEngine, load_cues
+
+        first = self.readers[0]
+        fps = float(settings.get("fps") or first.fps)
+        drop_frame = bool(settings.get("drop_frame", False))
+        follow = settings.get("follow")
+        target = None
+        if self.redundancy is not None and follow in (None, self.redundancy.osc.base_address):
+            target = self.redundancy
+        else:
+            target = next((d for r in self.readers for d in r.channels
+                           if follow in (None, d.osc.base_address)), None)
+            if target is not None and target.redundancy is not None:
+                logging.error("Cues disabled: %s is a redundancy source; follow %s",
+                              follow, target.redundancy[0].osc.base_address)
+                return
+        if target is None:
+            logging.error("Cues disabled: no input sends to %s", follow)
+            return
+        try:
+            engine = CueEngine(load_cues(settings, fps, drop_frame), fps, drop_frame,
+                               settings.get("on_jump", "skip"),
+                               float(settings.get("jump", 1.0)),
+                               float(settings.get("freewheel", 0.0)))
+        except (OSError, ValueError) as e:
+            logging.error("Cues disabled: %s", e)
+            return
+        target.cues = engine
+        self.cues = engine
+        self.cue_settings = dict(settings, follow=target.osc.base_address, fps=fps)
+        logging.info("Loaded %d cues following %s (on_jump=%s)",
+                     len(engine.index), target.osc.base_address, engine.on_jump)
+
+    def reload_cues(self, path: str | None = None) -> int:
+        """Re-read the cue list (optionally from another file); return its size."""
+        from modules.cues import load_cues
+
+        if self.cues is None:
+            raise RuntimeError("cues are not enabled")
+        settings = self.cue_settings
+        if path is not None:
+            settings = dict(settings, file=path, list=None)
+        cues = load_cues(settings, settings["fps"], self.cues.drop_frame)
+        self.cues.load(cues)
+        self.cue_settings = settings
+        logging.info("Reloaded %d cues", len(cues))
+        return len(cues)
+
+    def set_stage_timing(self, enabled: bool) -> None:
+        """Switch the per-stage loop timers on (reset) or off."""
+        from modules.profiling import StageTimers
+
+        for reader in self.readers:
+            timers = StageTimers() if enabled else None
+            reader.profile = timers
+            for decoder in reader.channels:
+                decoder.profile = timers
+
+    def capture_profile(self, mode: str, seconds: float, name: str | None = None,
+                        interval: float = 0.001) -> list[str]:
+        """Start a time-bounded profile; return the file(s) it will write."""
+        from modules.profiling import CProfileCapture, SamplingProfiler, profile_path
+
+        path = profile_path(mode, name)
+        if mode == "sample":
+            if self._sampler is not None and self._sampler.running:
+                raise RuntimeError("a sampling profile is already running")
+            self._sampler = SamplingProfiler(seconds, path, interval)
+            self._sampler.start()
+            return [path]
+        if mode != "cprofile":
+            raise ValueError(f"unknown profile mode: {mode}")
+        if any(r.profile_capture is not None for r in self.readers):
+            raise RuntimeError("a cProfile capture is already running")
+        # cProfile only sees its own thread: one capture per decode loop.
+        paths = [path]
+        if len(self.readers) > 1:
+            root, ext = os.path.splitext(path)
+            paths = [f"{root}-{i}{ext}" for i in range(len(self.readers))]
+        for reader, reader_path in zip(self.readers, paths):
+            reader.profile_capture = CProfileCapture(seconds, reader_path)
+        logging.info("Profiling decode loop (cProfile) for %.1fs", seconds)
+        return paths
+
+    def set_timecode_offset(self, offset: float, channel: int | None = None,
+                            device: str | None = None) -> int:
+        """Set the offset on matching channels; return how many changed."""
+        changed = 0
+        for reader in self.readers:
+            if device is not None and device not in (reader.device_name,
+                                                     (reader.device or {}).get("name")):
+                continue
+            for decoder in reader.channels:
+                if channel is None or decoder.channel == channel:
+                    decoder.set_timecode_offset(offset)
+                    changed += 1
+        return changed
+
+    def apply_config(self, config: dict) -> bool:
+        """Apply live settings to every reader; True if a restart is needed."""
+        input_configs = expand_inputs(config)
+        restart = len(input_configs) != len(self.readers)
+        for reader, input_config in zip(self.readers, input_configs):
+            restart = reader.apply_config(input_config) or restart
+        self.config = config
+        return restart
 
 
 def load_config(path: str) -> dict:
@@ -662,71 +1622,221 @@ def load_config(path: str) -> dict:
     return cfg
 
 
-def _run_once(config_path: str) -> None:
+def _create_simulated_source(args):
+    """Build the stand-in input requested with --simulate-input, if any."""
+    if not args.simulate_input:
+        return None
+    dropouts = []
+    for spec in args.simulate_dropout:
+        at, duration = spec.split(":")
+        dropouts.append((float(at), float(duration)))
+    return SimulatedSource.from_wav(
+        args.simulate_input, frames_per_buffer=512, dropouts=dropouts)
+
+
+def _instance_inputs(config: dict, manager: "CaptureManager") -> list[dict]:
+    """Inputs this process captures, as registered for instance discovery."""
+    from modules.communication.instances import input_scopes
+
+    inputs = input_scopes(config, get_registry())
+    for reader in manager.readers:
+        if reader.device is None or not reader.device["max_input_channels"]:
+            continue
+        for decoder in reader.channels:
+            resolved = {"device": reader.device["name"], "host_api": reader.host_api,
+                        "index": reader.device_index, "channel": decoder.channel}
+            if resolved not in inputs:
+                inputs.append(resolved)
+    return inputs
+
+
+def _run_once(config_path: str, service: bool = False, timer: StartupTimer | None = None,
+              args=None) -> None:
+    timer = timer or StartupTimer()
     config = load_config(config_path)
-
-    server_thread = threading.Thread(target=_run_ipc_server, daemon=True)
-    server_thread.start()
-
-    reader = LTCReader(config, config_path)
+    timer.mark("config")
+
+    # Critical path first: open the audio stream and announce the initial
+    # status before any non-critical subsystem (IPC, tray) is started.
+    source = _create_simulated_source(args) if args else None
+    manager = CaptureManager(config, config_path, source)
+    reader = manager.readers[0]
+    timer.mark("audio")
+    manager.start()
+    timer.mark("first_osc")
+    if config.get("ltc_output"):
+        manager.start_ltc_output(config["ltc_output"])
+        timer.mark("ltc_output")
+    if config.get("timecode_query"):
+        manager.start_timecode_query(config["timecode_query"])
+        timer.mark("timecode_query")
+    if config.get("timecode_shm"):
+        settings = config["timecode_shm"]
+        manager.start_timecode_shm(settings if isinstance(settings, dict) else {})
+        timer.mark("timecode_shm")
+    if config.get("cues"):
+        manager.start_cues(config["cues"])
+        timer.mark("cues")
+
+    from modules.communication.instances import register, unregister
+
+    server_thread = None
+    instance_path = None
 
     def exit_handler(reason: str):
         global _tray_icon
         logging.info("Shutting down: %s", reason)
-        reader.running = False
+        manager.running = False
+        if instance_path:
+            unregister(instance_path)
         if _tray_icon:
             _tray_icon.stop()
             _tray_icon = None
-        if _ipc_loop:
+        if _ipc_loop and not _ipc_loop.is_closed():
             def _cancel_server():
                 if _ipc_server_task:
                     _ipc_server_task.cancel()
-            _ipc_loop.call_soon_threadsafe(_cancel_server)
-            _ipc_loop.call_soon_threadsafe(_ipc_loop.stop)
-        server_thread.join(timeout=1)
+            try:
+                _ipc_loop.call_soon_threadsafe(_cancel_server)
+                _ipc_loop.call_soon_threadsafe(_ipc_loop.stop)
+            except RuntimeError:  # loop closed by the server thread meanwhile
+                pass
+        if server_thread is not None:
+            server_thread.join(timeout=1)
 
     def restart_cb() -> None:
         _restart_event.set()
-        reader.running = False
+        manager.running = False
 
     signal.signal(
         signal.SIGINT, lambda sig, frame: exit_handler(
             "[Exit] Signal Interrupt")
     )
+    if service and hasattr(signal, "SIGTERM"):
+        signal.signal(
+            signal.SIGTERM, lambda sig, frame: exit_handler(
+                "[Exit] Signal Terminate")
+        )
+
+    inputs = _instance_inputs(config, manager)
+    instance = {"pid": os.getpid(), "inputs": inputs}
+    handler = CommandHandler(manager, load_config, lambda _cfg: restart_cb(),
+                             instance)
+
+    def on_listening(port: int) -> None:
+        nonlocal instance_path
+        instance["port"] = port
+        instance_path = register(port, inputs, {"config_path": os.path.abspath(config_path)})
+
+    server_thread = threading.Thread(
+        target=_run_ipc_server,
+        args=(handler, int(config.get("ipc_port") or 0), on_listening),
+        daemon=True)
+    server_thread.start()
+    timer.mark("ipc")
 
     global _tray_icon
-    _tray_icon = _setup_tray(
-        config, exit_handler, config_path, restart_cb, reader.device_name, reader
-    )
+    if not service:
+        _tray_icon = _setup_tray(
+            config, exit_handler, config_path, restart_cb, reader.device_name, reader
+        )
+        timer.mark("tray")
+
+    timer.log()
+    manager.startup_timer = timer
 
     try:
-        reader.loop()
+        manager.loop()
     finally:
         exit_handler("[Exit] Normal")
 
 
 def main() -> None:
+    timer = StartupTimer(_PROCESS_T0)
+    timer.mark("imports")
+
     parser = argparse.ArgumentParser(description="LTC to OSC bridge")
     parser.add_argument(
         "--config",
         default="config.json",
         help="path to config.json (optional)",
     )
+    parser.add_argument(
+        "--service",
+        action="store_true",
+        help="headless mode: no tray icon or settings window",
+    )
+    parser.add_argument(
+        "--list-instances",
+        action="store_true",
+        help="list all bridges running on this host with their stats and exit",
+    )
+    parser.add_argument(
+        "--scan",
+        action="store_true",
+        help="look for LTC on every channel of every input device and exit",
+    )
+    parser.add_argument(
+        "--scan-write",
+        action="store_true",
+        help="with --scan, write the best result to the --config file",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="log level (default INFO)",
+    )
+    parser.add_argument(
+        "--simulate-input",
+        metavar="WAV",
+        help="read audio from a looped 16-bit WAV file instead of a device",
+    )
+    parser.add_argument(
+        "--simulate-dropout",
+        metavar="AT:DURATION",
+        action="append",
+        default=[],
+        help="with --simulate-input, unplug the simulated device for DURATION "
+             "seconds AT seconds into playback (repeatable)",
+    )
     args = parser.parse_args()
 
-    logging.basicConfig(level=logging.INFO,
-                        format="[%(levelname)s] %(message)s")
+    # Console output runs on a background thread; see modules.log_setup.
+    setup_logging(args.log_level)
+    from modules.communication.instances import find_conflict, input_scopes, print_instances
 
-    if check_existing_instance(INSTANCE_PORT, INSTANCE_KEY):
-        print("既に起動しています。")
+    if args.list_instances:
+        print_instances(INSTANCE_KEY)
         return
 
-    while True:
-        _run_once(args.config)
-        if not _restart_event.is_set():
-            break
-        _restart_event.clear()
+    if args.scan:
+        from modules.ltc_scan import main as scan_main
+        sys.exit(scan_main(["--write-config", args.config] if args.scan_write else []))
+
+    # 同じ (デバイス, チャンネル) を扱うブリッジが既に動いている場合のみ起動しない
+    # デバイス表はこの後のキャプチャーでもそのまま使われる
+    conflict = find_conflict(
+        input_scopes(load_config(args.config), get_registry()), INSTANCE_KEY)
+    if conflict:
+        print(f"既に起動しています。(pid {conflict['pid']}, IPC port {conflict['port']})")
+        return
+    timer.mark("instance_check")
+
+    try:
+        while True:
+            _run_once(args.config, args.service, timer, args)
+            timer = None
+            if not _restart_event.is_set():
+                break
+            _restart_event.clear()
+    finally:
+        get_registry().terminate()
 
 
 if __name__ == "__main__":
+    # The capture process (capture_process) is spawned; needed when frozen.
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
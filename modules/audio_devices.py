@@ -1,32 +1,17 @@
-import pyaudio
 import sys
 
+from modules.device_registry import get_registry
+
 
 def list_input_devices():
     """Return a list of tuples (index, name) for available input devices."""
-    pa = pyaudio.PyAudio()
-    devices = []
-    try:
-        for i in range(pa.get_device_count()):
-            info = pa.get_device_info_by_index(i)
-            if info.get("maxInputChannels", 0) > 0:
-                name = info.get("name")
-                devices.append((i, name))
-    finally:
-        pa.terminate()
-    return devices
+    return [(d["index"], d["name"]) for d in get_registry().input_devices()]
 
 
 def get_device_name(index: int) -> str | None:
     """Return the device name for the given index or None if not found."""
-    pa = pyaudio.PyAudio()
-    try:
-        info = pa.get_device_info_by_index(index)
-        return info.get("name")
-    except Exception:
-        return None
-    finally:
-        pa.terminate()
+    dev = get_registry().get(index)
+    return dev["name"] if dev else None
 
 
 def show_devices_info():
@@ -34,37 +19,28 @@ def show_devices_info():
     if hasattr(sys.stdout, "reconfigure"):
         sys.stdout.reconfigure(encoding="utf-8")
 
-    pa = pyaudio.PyAudio()
+    registry = get_registry()
     print("=== Available Audio Input Devices ===")
-    print(f"Total devices: {pa.get_device_count()}")
+    print(f"Total devices: {len(registry.devices())}")
     print()
 
-    devices = list_input_devices()
-
-    for i, name in devices:
-        try:
-            info = pa.get_device_info_by_index(i)
-            max_input_channels = info.get('maxInputChannels', 0)
-            sample_rate = info.get('defaultSampleRate', 0)
-            host_api = info.get('hostApi', -1)
-
-            print(
-                f"Index: {i:2d} | Channels: {max_input_channels:2d} | Name: {name}")
-            print(
-                f"         Sample Rate: {sample_rate} Hz | Host API: {host_api}")
-            print()
+    devices = registry.input_devices()
 
-        except Exception as e:
-            print(f"Index: {i:2d} | ERROR: {e}")
-            print()
-
-    pa.terminate()
+    for dev in devices:
+        print(
+            f"Index: {dev['index']:2d} | Channels: {dev['max_input_channels']:2d} | Name: {dev['name']}")
+        print(
+            f"         Sample Rate: {dev['default_sample_rate']} Hz | Host API: {dev['host_api']}")
+        print()
 
     print(f"\n=== Summary: {len(devices)} input devices found ===")
-    for i, name in devices:
-        print(f"{i:2d}: {name}")
+    for dev in devices:
+        print(f"{dev['index']:2d}: {dev['name']} [{dev['host_api']}]")
+
+    print("\nconfig.json の audio_device_name / audio_host_api に上記の Name と Host API を指定してください。"
+          "（audio_device_index は再起動で変わることがあります）")
 
-    print("\nconfig.json の audio_device_index に上記のIndexを指定してください。")
+    registry.terminate()
 
 
 def main():
@@ -0,0 +1,216 @@
+"""Audio input sources read chunk by chunk by the decode loop.
+
+All sources share the same small interface: ``open()``, ``read()`` returning
+one chunk of interleaved 16-bit PCM, ``close()`` and the ``device_name``,
+``num_channels``, ``sample_rate``, ``frames_per_buffer``, ``latency``
+(seconds, once open) and ``overflows`` attributes.
+``read`` raises ``AudioSourceError`` when the device is gone or stalls.
+"""
+import array
+import logging
+import queue
+import threading
+import time
+import wave
+
+import pyaudio
+
+
+class AudioSourceError(OSError):
+    """Raised when an audio source cannot be opened or stops delivering data."""
+
+
+class PyAudioSource:
+    """PortAudio input stream driven by a callback.
+
+    The callback only queues the raw buffers, so ``read`` can wait with a
+    timeout and report a stalled device instead of blocking forever.
+    """
+
+    def __init__(self, pa: pyaudio.PyAudio, device: dict, sample_rate: int,
+                 num_channels: int, frames_per_buffer: int,
+                 stall_timeout: float = 1.0, max_queued: int = 32):
+        self.pa = pa
+        self.device = device
+        self.device_index = device["index"]
+        self.device_name = device["name"]
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.frames_per_buffer = frames_per_buffer
+        self.stall_timeout = stall_timeout
+        self.overflows = 0
+        self.latency = None
+        self.stream = None
+        self._queue = queue.Queue(maxsize=max_queued)
+
+    def open(self) -> None:
+        try:
+            self.stream = self.pa.open(
+                format=pyaudio.paInt16,
+                channels=self.num_channels,
+                rate=self.sample_rate,
+                input=True,
+                input_device_index=self.device_index,
+                frames_per_buffer=self.frames_per_buffer,
+                stream_callback=self._callback,
+            )
+        except OSError as exc:
+            raise AudioSourceError(str(exc)) from exc
+        # PyAudio always requests the device's default low input latency;
+        # report what PortAudio actually granted.
+        self.latency = self.stream.get_input_latency()
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        if status_flags & pyaudio.paInputOverflow:
+            self.overflows += 1
+        try:
+            self._queue.put_nowait(in_data)
+        except queue.Full:
+            # The consumer fell behind; drop the oldest buffer.
+            self.overflows += 1
+            try:
+                self._queue.get_nowait()
+                self._queue.put_nowait(in_data)
+            except (queue.Empty, queue.Full):
+                pass
+        return (None, pyaudio.paContinue)
+
+    def read(self) -> bytes:
+        try:
+            data = self._queue.get(timeout=self.stall_timeout)
+        except queue.Empty:
+            if self.stream is None:
+                raise AudioSourceError("stream is closed") from None
+            if not self.stream.is_active():
+                raise AudioSourceError("stream is no longer active") from None
+            raise AudioSourceError(
+                f"no audio for {self.stall_timeout:.1f}s (device stalled)") from None
+        if data is None:
+            raise AudioSourceError("stream is closed")
+        return data
+
+    def close(self) -> None:
+        if self.stream is None:
+            return
+        stream, self.stream = self.stream, None
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception as exc:  # noqa: W0703
+            logging.debug("Error closing audio stream: %s", exc)
+        # Wake a reader blocked in read() on another thread.
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class SimulatedSource:
+    """Stand-in audio source that replays PCM and can simulate disconnects.
+
+    ``samples`` are interleaved 16-bit samples that are looped forever.
+    ``dropouts`` is a list of ``(at, duration)`` pairs in seconds of playback
+    time; during a dropout ``read`` and ``open`` fail as an unplugged USB
+    interface would. ``disconnect``/``reconnect`` do the same on demand.
+    """
+
+    def __init__(self, samples, sample_rate: int, num_channels: int = 1,
+                 frames_per_buffer: int = 512, realtime: bool = True,
+                 dropouts: list | None = None, name: str = "Simulated input"):
+        self.samples = array.array("h", samples)
+        if not self.samples:
+            self.samples = array.array("h", [0] * num_channels)
+        self.device_name = name
+        self.device_index = None
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.frames_per_buffer = frames_per_buffer
+        self.realtime = realtime
+        self.dropouts = sorted(dropouts or [])
+        self.overflows = 0
+        self.latency = None
+        self.is_open = False
+        self._pos = 0
+        self._played = 0  # frames delivered so far (playback clock)
+        self._manual_disconnect = False
+        self._outage_until = None
+        self._lock = threading.Lock()
+        self._next_deadline = None
+
+    @classmethod
+    def from_wav(cls, path: str, **kwargs) -> "SimulatedSource":
+        """Create a source that loops a 16-bit PCM WAV file."""
+        with wave.open(path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("only 16-bit PCM WAV files are supported")
+            data = wf.readframes(wf.getnframes())
+            kwargs.setdefault("name", f"Simulated ({path})")
+            return cls(array.array("h", data), wf.getframerate(),
+                       wf.getnchannels(), **kwargs)
+
+    def disconnect(self) -> None:
+        """Simulate unplugging the device until ``reconnect`` is called."""
+        with self._lock:
+            self._manual_disconnect = True
+
+    def reconnect(self) -> None:
+        with self._lock:
+            self._manual_disconnect = False
+
+    def _disconnected(self) -> bool:
+        if self._manual_disconnect:
+            return True
+        now = time.perf_counter()
+        if self._outage_until is not None:
+            if now < self._outage_until:
+                return True
+            self._outage_until = None
+            return False
+        played = self._played / self.sample_rate
+        for at, duration in self.dropouts:
+            if at <= played < at + duration:
+                # No frames are delivered while unplugged, so the rest of the
+                # dropout is timed on the wall clock and then skipped.
+                self._outage_until = now + (at + duration - played)
+                self._played = int((at + duration) * self.sample_rate)
+                return True
+        return False
+
+    def open(self) -> None:
+        with self._lock:
+            if self._disconnected():
+                raise AudioSourceError(f"{self.device_name}: device not present")
+            self.is_open = True
+            self.latency = self.frames_per_buffer / self.sample_rate
+            self._next_deadline = time.perf_counter()
+
+    def read(self) -> bytes:
+        with self._lock:
+            if not self.is_open:
+                raise AudioSourceError("stream is closed")
+            if self._disconnected():
+                self.is_open = False
+                raise AudioSourceError(f"{self.device_name}: device removed")
+            count = self.frames_per_buffer * self.num_channels
+            end = self._pos + count
+            if end <= len(self.samples):
+                chunk = self.samples[self._pos:end]
+            else:
+                chunk = self.samples[self._pos:]
+                while len(chunk) < count:
+                    chunk += self.samples[:count - len(chunk)]
+            self._pos = end % len(self.samples)
+            self._played += self.frames_per_buffer
+            deadline = None
+            if self.realtime:
+                self._next_deadline += self.frames_per_buffer / self.sample_rate
+                deadline = self._next_deadline
+        if deadline is not None:
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return chunk.tobytes()
+
+    def close(self) -> None:
+        with self._lock:
+            self.is_open = False
@@ -0,0 +1,183 @@
+"""Capture stream supervision: reconnect on device loss without restarting."""
+import logging
+import time
+
+from modules.audio_sources import AudioSourceError
+
+
+class CaptureSupervisor:
+    """Keep an audio input alive across device drop-outs.
+
+    ``open_source(refresh)`` must return an opened source (see
+    ``modules.audio_sources``) or raise ``AudioSourceError``. ``refresh`` is
+    True when the device table should be re-enumerated first, which is
+    requested from the second reconnect attempt on; ``open_source`` decides
+    how often it actually refreshes.
+
+    ``read`` never raises for device problems: it returns None while the
+    device is unavailable so the caller can keep its decoder state, OSC
+    clients and stop detection running. Reconnect attempts back off
+    exponentially between ``backoff_initial`` and ``backoff_max`` seconds.
+
+    ``silence_timeout`` > 0 also treats that many seconds of digital silence
+    (every sample exactly zero, as delivered by some drivers after a USB
+    drop) as a lost device.
+    """
+
+    def __init__(self, open_source, silence_timeout: float = 0.0,
+                 backoff_initial: float = 0.1, backoff_max: float = 2.0):
+        self.open_source = open_source
+        self.silence_timeout = silence_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.source = None
+
+        self.reconnects = 0
+        self.last_outage = 0.0
+        self.total_outage = 0.0
+        self.last_reopen_ms = 0.0
+        self._lost_at = None
+        self._attempts = 0
+        self._next_attempt = 0.0
+        self._silent_since = None
+        self._silence_limit = silence_timeout
+        self._overflow_source = None
+        self._overflow_seen = 0
+
+    @property
+    def connected(self) -> bool:
+        return self.source is not None
+
+    def open(self) -> None:
+        """Open the initial source; errors propagate to the caller."""
+        self.source = self.open_source(False)
+
+    def start_disconnected(self, reason: str) -> None:
+        """Start without a source; ``read`` keeps trying to open one."""
+        logging.warning("Audio input not available: %s", reason)
+        self._lost_at = time.monotonic()
+        self._attempts = 0
+        self._next_attempt = self._lost_at + self.backoff_initial
+
+    def reopen(self) -> None:
+        """Close and reopen the source, e.g. after a buffer size change."""
+        self._close_source()
+        try:
+            self.source = self.open_source(False)
+        except OSError as exc:
+            self._lost_at = time.monotonic()
+            self._attempts = 0
+            self._next_attempt = self._lost_at + self.backoff_initial
+            logging.warning("Failed to reopen audio input: %s", exc)
+
+    def suspend(self) -> None:
+        """Close the stream from another thread, e.g. before a device refresh.
+
+        The reading thread then sees the input as lost and reconnects with
+        the usual backoff.
+        """
+        source = self.source
+        if source is not None:
+            source.close()
+
+    def take_overflows(self) -> int:
+        """Return the overflows reported by the source since the last call."""
+        source = self.source
+        if source is None:
+            return 0
+        if source is not self._overflow_source:
+            self._overflow_source = source
+            self._overflow_seen = 0
+        count = source.overflows - self._overflow_seen
+        self._overflow_seen = source.overflows
+        return count
+
+    def read(self) -> bytes | None:
+        """Return the next chunk, or None while the device is unavailable."""
+        if self.source is None:
+            self._try_reconnect()
+            return None
+        try:
+            data = self.source.read()
+        except OSError as exc:
+            self._on_lost(str(exc))
+            return None
+        if self.silence_timeout > 0 and self._is_silent(data):
+            return None
+        return data
+
+    def _is_silent(self, data: bytes) -> bool:
+        if data.count(0) != len(data):
+            self._silent_since = None
+            self._silence_limit = self.silence_timeout
+            return False
+        now = time.monotonic()
+        if self._silent_since is None:
+            self._silent_since = now
+        elif now - self._silent_since > self._silence_limit:
+            self._silent_since = None
+            # A virtual cable with nothing playing is silent too; back off
+            # so a genuinely idle input is not reopened over and over.
+            self._silence_limit = min(self._silence_limit * 2, 60.0)
+            self._on_lost(f"digital silence for {self.silence_timeout:.1f}s+")
+            return True
+        return False
+
+    def _on_lost(self, reason: str) -> None:
+        name = getattr(self.source, "device_name", "?")
+        logging.warning("Audio input '%s' lost: %s", name, reason)
+        self._close_source()
+        self._lost_at = time.monotonic()
+        self._attempts = 0
+        self._next_attempt = self._lost_at + self.backoff_initial
+
+    def _try_reconnect(self) -> None:
+        now = time.monotonic()
+        if now < self._next_attempt:
+            # Sleep in short steps so the caller can still run timeouts.
+            time.sleep(min(self._next_attempt - now, 0.1))
+            return
+
+        self._attempts += 1
+        started = time.perf_counter()
+        try:
+            self.source = self.open_source(self._attempts > 1)
+        except (AudioSourceError, OSError) as exc:
+            delay = min(self.backoff_initial * (2 ** self._attempts),
+                        self.backoff_max)
+            logging.info("Reconnect attempt %d failed: %s (retry in %.1fs)",
+                         self._attempts, exc, delay)
+            self._next_attempt = time.monotonic() + delay
+            return
+
+        self.last_reopen_ms = (time.perf_counter() - started) * 1000.0
+        self.last_outage = time.monotonic() - (self._lost_at or now)
+        self.total_outage += self.last_outage
+        self.reconnects += 1
+        self._lost_at = None
+        logging.info(
+            "Audio input '%s' reconnected after %.2fs outage "
+            "(%d attempts, reopen %.1fms)",
+            self.source.device_name, self.last_outage, self._attempts,
+            self.last_reopen_ms)
+
+    def get_stats(self) -> dict:
+        """Return reconnect counters."""
+        outage = self.last_outage
+        if self._lost_at is not None:
+            outage = time.monotonic() - self._lost_at
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "last_outage_s": round(outage, 3),
+            "total_outage_s": round(self.total_outage, 3),
+            "last_reopen_ms": round(self.last_reopen_ms, 1),
+        }
+
+    def _close_source(self) -> None:
+        if self.source is not None:
+            source, self.source = self.source, None
+            source.close()
+
+    def close(self) -> None:
+        self._close_source()
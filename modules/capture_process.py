@@ -0,0 +1,238 @@
+"""Audio capture in a dedicated process, handed over through a shared ring.
+
+With ``capture_process`` enabled, the PortAudio stream of an input lives in
+a small child process that does nothing but move PCM from the callback
+queue into a ``modules.shm_ring.PcmRing``. The decode loop in the main
+process reads the ring through ``SharedMemorySource``, which has the usual
+audio source interface, so the decoders and everything after them are
+unchanged. GIL contention from the tray, the settings window or the IPC
+server can delay decoding but no longer makes the audio callback drop
+buffers: the ring holds ``ring_seconds`` of audio.
+
+The child reconnects to its device on its own; while it has no device the
+ring state is ``lost`` and the main process reports the input as lost too.
+"""
+import logging
+import multiprocessing
+import os
+import time
+
+from modules.audio_sources import AudioSourceError
+from modules.shm_ring import (
+    STATE_FAILED, STATE_LOST, STATE_NAMES, STATE_RUNNING, STATE_STARTING,
+    STATE_STOPPED, PcmRing, RingReader)
+
+
+def _raise_priority() -> None:
+    """Best effort: run the capture process above normal priority."""
+    try:
+        if os.name == "nt":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), 0x00000080)  # HIGH
+        else:
+            os.nice(-5)
+    except (OSError, AttributeError):
+        pass
+
+
+def capture_main(ring_name: str, device_name: str, host_api: str | None,
+                 frames_per_buffer: int, silence_timeout: float, stop_event,
+                 log_level: str = "INFO", device_index: int | None = None) -> None:
+    """Entry point of the capture process."""
+    from modules.audio_sources import PyAudioSource
+    from modules.capture import CaptureSupervisor
+    from modules.device_registry import get_registry
+    from modules.log_setup import setup_logging
+
+    setup_logging(log_level, "[%(levelname)s] [capture] %(message)s")
+    _raise_priority()
+    ring = PcmRing.attach(ring_name)
+    registry = get_registry()
+
+    def open_source(refresh: bool) -> PyAudioSource:
+        if refresh:
+            registry.refresh()
+        dev = registry.find(device_name, host_api, index=device_index)
+        if dev is None:
+            raise AudioSourceError(f"'{device_name}' is not present")
+        if dev["max_input_channels"] < ring.num_channels:
+            raise AudioSourceError(
+                f"'{device_name}' now has {dev['max_input_channels']} channels")
+        source = PyAudioSource(registry.pa, dev, ring.sample_rate,
+                               ring.num_channels, frames_per_buffer)
+        source.open()
+        ring.set_device(dev["name"], source.latency)
+        return source
+
+    supervisor = CaptureSupervisor(open_source, silence_timeout)
+    overflows = 0
+    try:
+        supervisor.open()
+    except OSError as exc:
+        ring.set_state(STATE_FAILED, error=str(exc))
+        ring.close()
+        registry.terminate()
+        return
+    ring.set_state(STATE_RUNNING)
+    logging.info("Capturing '%s' into shared memory (pid %d)", device_name, os.getpid())
+    try:
+        while not stop_event.is_set():
+            data = supervisor.read()
+            overflows += supervisor.take_overflows()
+            if data is None:
+                state = STATE_LOST
+            else:
+                ring.write(data)
+                state = STATE_RUNNING
+            ring.set_state(state, overflows, supervisor.reconnects)
+    except KeyboardInterrupt:
+        pass  # Ctrl+C reaches the whole console group; the parent stops us.
+    finally:
+        supervisor.close()
+        ring.set_state(STATE_STOPPED, overflows, supervisor.reconnects)
+        ring.close()
+        registry.terminate()
+
+
+class CaptureProcess:
+    """Parent-side handle of one capture process and its ring."""
+
+    def __init__(self, device: dict, sample_rate: int, num_channels: int,
+                 frames_per_buffer: int, ring_seconds: float = 2.0,
+                 silence_timeout: float = 0.0, start_timeout: float = 5.0):
+        self.device = device
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.frames_per_buffer = frames_per_buffer
+        self.ring_seconds = ring_seconds
+        self.silence_timeout = silence_timeout
+        self.start_timeout = start_timeout
+        self.ring = None
+        self.process = None
+        self.restarts = 0
+        self._stop_event = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self) -> None:
+        """Spawn the process and wait until it captures; raise on failure."""
+        ctx = multiprocessing.get_context("spawn")
+        self.ring = PcmRing.create(self.sample_rate, self.num_channels, self.ring_seconds)
+        self._stop_event = ctx.Event()
+        self.process = ctx.Process(
+            target=capture_main, name=f"capture-{self.device['name']}", daemon=True,
+            args=(self.ring.name, self.device["name"], self.device.get("host_api"),
+                  self.frames_per_buffer, self.silence_timeout, self._stop_event,
+                  logging.getLevelName(logging.getLogger().level),
+                  self.device.get("index")))
+        started = time.perf_counter()
+        self.process.start()
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            state = self.ring.counters()[1]
+            if state == STATE_RUNNING:
+                logging.info("Capture process for '%s' started (pid %d, %.0fms, ring %.1fs)",
+                             self.device["name"], self.process.pid,
+                             (time.perf_counter() - started) * 1000.0, self.ring_seconds)
+                return
+            if state == STATE_FAILED or not self.process.is_alive():
+                break
+            time.sleep(0.01)
+        error = self.ring.error or "capture process did not start"
+        self.stop()
+        raise AudioSourceError(error)
+
+    def attach(self, frames_per_buffer: int, stall_timeout: float = 1.0) -> "SharedMemorySource":
+        """Return a new source reading the ring, restarting a dead process."""
+        if not self.alive:
+            if self.process is not None:
+                logging.warning("Capture process for '%s' exited (code %s); restarting",
+                                self.device["name"], self.process.exitcode)
+                self.stop()
+                self.restarts += 1
+            self.start()
+        source = SharedMemorySource(self, frames_per_buffer, stall_timeout)
+        source.open()
+        return source
+
+    def get_stats(self) -> dict:
+        stats = {"pid": self.process.pid if self.process else None,
+                 "alive": self.alive, "restarts": self.restarts,
+                 "ring_seconds": self.ring_seconds}
+        if self.ring is not None:
+            overflows, state, reconnects = self.ring.counters()
+            stats.update(state=STATE_NAMES[state], overflows=overflows,
+                         reconnects=reconnects)
+        return stats
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self.process is not None:
+            self._stop_event.set()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+            self.process = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+
+class SharedMemorySource:
+    """Audio source reading one capture process's ring (see ``modules.audio_sources``)."""
+
+    def __init__(self, capture: CaptureProcess, frames_per_buffer: int,
+                 stall_timeout: float = 1.0):
+        self.capture = capture
+        self.ring = capture.ring
+        self.device_index = capture.device.get("index")
+        self.device_name = capture.device["name"]
+        self.sample_rate = capture.sample_rate
+        self.num_channels = capture.num_channels
+        self.frames_per_buffer = frames_per_buffer
+        self.stall_timeout = stall_timeout
+        self.latency = None
+        self.reader = None
+        self._overflow_base = 0
+
+    @property
+    def overflows(self) -> int:
+        reader, ring = self.reader, self.ring
+        if reader is None:
+            return 0
+        ring_overflows = ring.counters()[0] - self._overflow_base
+        # Ring overruns are counted per chunk, like device overflows.
+        return ring_overflows + reader.overruns // self.frames_per_buffer
+
+    def open(self) -> None:
+        state = self.ring.counters()[1]
+        if state != STATE_RUNNING:
+            raise AudioSourceError(
+                f"'{self.device_name}' is {STATE_NAMES[state]} in the capture process")
+        # Poll at a fraction of the chunk period; reading never spins.
+        poll = min(max(self.frames_per_buffer / self.sample_rate / 8, 0.0005), 0.005)
+        self.reader = RingReader(self.ring, poll)
+        self._overflow_base = self.ring.counters()[0]
+        self.latency = self.ring.latency + poll
+
+    def read(self) -> bytes:
+        reader = self.reader
+        if reader is None:
+            raise AudioSourceError("stream is closed")
+        data = reader.read(self.frames_per_buffer, self.stall_timeout)
+        if data is not None:
+            return data
+        if not self.capture.alive:
+            raise AudioSourceError("capture process exited")
+        state = self.ring.counters()[1]
+        if state in (STATE_LOST, STATE_STARTING, STATE_STOPPED):
+            raise AudioSourceError(f"device {STATE_NAMES[state]} in the capture process")
+        raise AudioSourceError(
+            f"no audio for {self.stall_timeout:.1f}s from the capture process")
+
+    def close(self) -> None:
+        # The capture process keeps running; only this cursor goes away.
+        self.reader = None
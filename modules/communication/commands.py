@@ -0,0 +1,231 @@
+"""Command handlers for the IPC control protocol.
+
+Handlers run on IPC server worker threads, never on the audio thread. They
+only read snapshots the decode loop publishes (status monitor, loop stats,
+supervisor counters) and change settings by swapping single attributes,
+which the loop picks up on its next frame.
+"""
+import logging
+
+
+class CommandError(Exception):
+    """Raised by a handler to reply with ``{"ok": false, "error": ...}``."""
+
+
+class CommandHandler:
+    """Dispatch ``{"cmd": name, ...}`` requests to ``cmd_<name>`` methods.
+
+    ``manager`` is the running ``CaptureManager``; the top-level fields of
+    ``get_status``/``get_stats`` describe its first input and ``inputs``
+    lists every device and channel. ``reload_cb(config)`` is called
+    by ``reload`` when a changed setting needs the audio stream reopened.
+    ``load_config`` re-reads the configuration file. ``instance`` is
+    reported by ``get_status`` so discovery can verify who answered.
+    """
+
+    def __init__(self, manager, load_config, reload_cb=None, instance=None):
+        self.manager = manager
+        self.load_config = load_config
+        self.reload_cb = reload_cb
+        # Identifies this process to instance discovery (pid, inputs).
+        self.instance = instance or {}
+
+    def __call__(self, request: dict) -> dict:
+        name = request.get("cmd")
+        method = getattr(self, f"cmd_{name}", None) if isinstance(name, str) else None
+        if method is None:
+            return {"ok": False, "error": f"unknown command: {name}"}
+        try:
+            result = method(request)
+        except CommandError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:  # noqa: W0703
+            logging.warning("IPC command '%s' failed: %s", name, e)
+            return {"ok": False, "error": str(e)}
+        response = {"ok": True}
+        response.update(result or {})
+        return response
+
+    def cmd_get_status(self, _request):
+        reader = self.manager.readers[0]
+        osc = self.manager.osc
+        return {
+            "instance": self.instance,
+            "status": reader.status_monitor.get_status(),
+            "device": self._device_info(reader),
+            "sample_rate": reader.sample_rate,
+            "fps": reader.fps,
+            "timecode_offset": reader.timecode_offset,
+            "destinations": osc.get_destinations(),
+            "osc_address": reader.channels[0].osc.base_address,
+            "muted": osc.muted,
+            "inputs": [
+                {
+                    "device": self._device_info(r),
+                    "channels": [
+                        {
+                            "channel": d.channel,
+                            "osc_address": d.osc.base_address,
+                            "timecode_offset": d.timecode_offset,
+                            "status": d.status_monitor.get_status(),
+                        }
+                        for d in r.channels
+                    ],
+                }
+                for r in self.manager.readers
+            ],
+            "redundancy": (self.manager.redundancy.get_status()
+                           if self.manager.redundancy is not None else None),
+            "cues": (dict(self.manager.cues.get_status(),
+                          follow=self.manager.cue_settings["follow"])
+                     if self.manager.cues is not None else None),
+        }
+
+    @staticmethod
+    def _device_info(reader) -> dict:
+        return {
+            "name": reader.device_name,
+            "index": reader.device_index,
+            "host_api": reader.host_api,
+            "channel": reader.channel,
+            "connected": reader.supervisor.connected,
+        }
+
+    @staticmethod
+    def _reader_stats(reader) -> dict:
+        return {
+            "latency_profile": reader.latency_profile,
+            "chunk_size": reader.chunk_size,
+            "loop": reader.stats.last_window,
+            "totals": dict(reader.stats.totals),
+            "capture": reader.supervisor.get_stats(),
+            "stages": reader.profile.get_stats() if reader.profile is not None else None,
+            "capture_process": (reader.capture.get_stats()
+                                if reader.capture is not None else None),
+        }
+
+    def cmd_get_stats(self, _request):
+        readers = self.manager.readers
+        result = self._reader_stats(readers[0])
+        result["inputs"] = [
+            dict(self._reader_stats(r), device=r.device_name) for r in readers]
+        result["osc"] = self.manager.osc.output.get_stats()
+        if self.manager.ltc_output is not None:
+            result["ltc_output"] = self.manager.ltc_output.get_stats()
+        if self.manager.timecode_query is not None:
+            result["timecode_query"] = self.manager.timecode_query.get_stats()
+        if self.manager.timecode_shm is not None:
+            result["timecode_shm"] = self.manager.timecode_shm.get_stats()
+        return result
+
+    def cmd_set_offset(self, request):
+        """``value`` in seconds; optional ``channel``/``device`` select inputs."""
+        try:
+            offset = float(request["value"])
+            channel = request.get("channel")
+            channel = None if channel is None else int(channel)
+        except (KeyError, TypeError, ValueError):
+            raise CommandError("set_offset needs a numeric 'value'") from None
+        changed = self.manager.set_timecode_offset(
+            offset, channel, request.get("device"))
+        if not changed:
+            raise CommandError("no matching input channel")
+        return {"timecode_offset": offset, "channels": changed}
+
+    def cmd_set_destinations(self, request):
+        destinations = request.get("destinations")
+        if not isinstance(destinations, list) or not destinations:
+            raise CommandError(
+                "set_destinations needs a non-empty 'destinations' list")
+        try:
+            parsed = [(str(d["ip"]), int(d["port"])) for d in destinations]
+        except (KeyError, TypeError, ValueError):
+            raise CommandError(
+                "each destination needs 'ip' and 'port'") from None
+        self.manager.osc.set_destinations(parsed)
+        logging.info("OSC destinations set via IPC: %s",
+                     ", ".join(f"{ip}:{port}" for ip, port in parsed))
+        return {"destinations": self.manager.osc.get_destinations()}
+
+    def cmd_mute(self, request):
+        muted = bool(request.get("value", True))
+        self.manager.osc.muted = muted
+        logging.info("OSC output %s via IPC", "muted" if muted else "unmuted")
+        return {"muted": muted}
+
+    def cmd_set_logging(self, request):
+        """``level`` (DEBUG/INFO/...) and/or ``frame_trace`` lines per second."""
+        root = logging.getLogger()
+        level = request.get("level")
+        if level is not None:
+            if not isinstance(level, str) or not isinstance(
+                    logging.getLevelName(level.upper()), int):
+                raise CommandError(f"unknown log level: {level}")
+            root.setLevel(level.upper())
+        trace = request.get("frame_trace")
+        if trace is not None:
+            try:
+                trace = float(trace)
+            except (TypeError, ValueError):
+                raise CommandError("'frame_trace' must be a number") from None
+            for reader in self.manager.readers:
+                for decoder in reader.channels:
+                    decoder.trace.set_rate(trace)
+        return {"level": logging.getLevelName(root.level),
+                "frame_trace": self.manager.readers[0].channels[0].trace.rate}
+
+    def cmd_set_profiling(self, request):
+        """Switch the per-stage loop timers; ``get_stats`` reports them."""
+        enabled = bool(request.get("enabled", True))
+        readers = self.manager.readers
+        # Final figures of the run being switched off.
+        stages = [r.profile.get_stats() for r in readers if r.profile is not None]
+        self.manager.set_stage_timing(enabled)
+        logging.info("Stage timing %s via IPC", "enabled" if enabled else "disabled")
+        return {"enabled": enabled, "stages": stages}
+
+    def cmd_capture_profile(self, request):
+        """``mode`` cprofile (decode loops) or sample (all threads), ``seconds``,
+        optional ``path`` (a file name in the bridge's working directory) and
+        ``interval`` (sample mode). Returns at once; the file is written when
+        the time is up."""
+        mode = request.get("mode", "cprofile")
+        try:
+            seconds = float(request.get("seconds", 10.0))
+            interval = float(request.get("interval", 0.001))
+        except (TypeError, ValueError):
+            raise CommandError("'seconds' and 'interval' must be numbers") from None
+        if not 0 < seconds <= 600:
+            raise CommandError("'seconds' must be between 0 and 600")
+        try:
+            paths = self.manager.capture_profile(
+                mode, seconds, request.get("path"), interval)
+        except (RuntimeError, ValueError) as e:
+            raise CommandError(str(e)) from None
+        return {"mode": mode, "seconds": seconds, "paths": paths}
+
+    def cmd_load_cues(self, request):
+        """Re-read the cue list, or load ``path`` instead; the position is kept."""
+        try:
+            count = self.manager.reload_cues(request.get("path"))
+        except (OSError, RuntimeError, ValueError) as e:
+            raise CommandError(str(e)) from None
+        return {"cues": count}
+
+    def cmd_list_devices(self, _request):
+        # The cached table only: refreshing would re-initialise PortAudio
+        # underneath the running stream.
+        registry = next((r.registry for r in self.manager.readers
+                         if r.registry is not None), None)
+        if registry is None:
+            return {"devices": []}
+        return {"devices": registry.input_devices()}
+
+    def cmd_reload(self, _request):
+        config = self.load_config(self.manager.config_path)
+        restart = self.manager.apply_config(config)
+        if restart:
+            if self.reload_cb is None:
+                raise CommandError("settings changed that need a restart")
+            self.reload_cb(config)
+        return {"restart": restart}
@@ -0,0 +1,228 @@
+"""Registry of running bridge instances, scoped per (device, channel).
+
+Every running bridge writes ``<pid>.json`` into ``instance_dir()`` with its
+IPC port and the inputs it captures. A new bridge only refuses to start
+when another live bridge already captures one of its inputs, so several
+bridges can run side by side on different sound cards or channels.
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.communication.ipc_client import send_command
+from modules.inputs import channel_specs, expand_inputs
+
+
+def instance_dir() -> str:
+    """Return the directory holding the instance files."""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, "LTCOSCBridge", "instances")
+
+
+def input_scopes(config: dict, registry=None) -> list[dict]:
+    """Return the identity of every (device, channel) input a config captures.
+
+    With a ``DeviceRegistry`` every input is resolved as the capture does,
+    so a device configured by name in one bridge and by index in another
+    is recognised as the same; the scope then carries the device's
+    ``index``. An input that does not resolve keeps its configured name
+    (or ``#index`` / ``default``).
+    """
+    scopes = []
+    for input_config in expand_inputs(config):
+        name = input_config.get("audio_device_name")
+        index = input_config.get("audio_device_index")
+        host_api = input_config.get("audio_host_api")
+        dev = None
+        if registry is not None:
+            dev = registry.resolve(index, name, host_api)
+            if dev is None and not name and index is None:
+                dev = registry.default_input()
+        if dev is not None:
+            scope = {"device": dev["name"], "host_api": dev["host_api"], "index": dev["index"]}
+        else:
+            device = name if name or index is None else f"#{index}"
+            scope = {"device": device or "default", "host_api": host_api}
+        for spec in channel_specs(input_config):
+            scopes.append(dict(scope, channel=spec["channel"]))
+    return scopes
+
+
+def _same_input(a: dict, b: dict) -> bool:
+    if a["device"] != b["device"] or a["channel"] != b["channel"]:
+        return False
+    if a.get("index") is not None and b.get("index") is not None:
+        # Both resolved: devices with the same name differ by index.
+        return (a["host_api"], a["index"]) == (b["host_api"], b["index"])
+    # An unset host API matches any, as the device resolver does.
+    return not a.get("host_api") or not b.get("host_api") or a["host_api"] == b["host_api"]
+
+
+def register(port: int, inputs: list[dict], extra: dict | None = None) -> str:
+    """Write this process's instance file and return its path."""
+    os.makedirs(instance_dir(), exist_ok=True)
+    path = os.path.join(instance_dir(), f"{os.getpid()}.json")
+    info = {
+        "pid": os.getpid(),
+        "port": port,
+        "inputs": inputs,
+        "started": time.time(),
+    }
+    info.update(extra or {})
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(info, fh, ensure_ascii=False)
+    os.replace(tmp, path)
+    return path
+
+
+def unregister(path: str | None = None) -> None:
+    """Remove this process's instance file."""
+    path = path or os.path.join(instance_dir(), f"{os.getpid()}.json")
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning("Failed to remove instance file %s: %s", path, e)
+
+
+def _read_instances() -> list[dict]:
+    try:
+        names = os.listdir(instance_dir())
+    except FileNotFoundError:
+        return []
+    instances = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(instance_dir(), name)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                info = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        if info.get("pid") == os.getpid():
+            continue
+        info["_path"] = path
+        instances.append(info)
+    return instances
+
+
+def _pid_alive(pid: int) -> bool:
+    """Return whether process ``pid`` exists.
+
+    On Windows ``os.kill(pid, 0)`` would terminate the process, so the
+    process is opened and its exit code checked instead.
+    """
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5  # access denied: it exists
+        try:
+            code = wintypes.DWORD()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+def _probe(info: dict, key: str, cmd: str = "get_status") -> dict | None:
+    """Query an instance; return its response or None if it is not running."""
+    response = send_command(info["port"], key, cmd, timeout=1.0)
+    if not response.get("ok"):
+        return None
+    if cmd == "get_status" and response.get("instance", {}).get("pid") != info["pid"]:
+        # The port was reused by another process after a crash.
+        return None
+    return response
+
+
+def _live_instances(key: str) -> list[tuple[dict, dict | None]]:
+    """Return ``(info, status)`` of live instances, pruning stale files.
+
+    A file is only removed once its process is gone. A bridge that is
+    alive but does not answer in time (busy, or starting up) stays live
+    with status None, so its inputs still count as taken.
+    """
+    instances = _read_instances()
+    if not instances:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(instances))) as pool:
+        statuses = list(pool.map(lambda i: _probe(i, key), instances))
+    live = []
+    for info, status in zip(instances, statuses):
+        if status is None and not _pid_alive(int(info.get("pid") or 0)):
+            logging.debug("Removing stale instance file %s", info["_path"])
+            unregister(info["_path"])
+            continue
+        if status is None:
+            logging.debug("Instance pid %s does not answer on port %s",
+                          info.get("pid"), info.get("port"))
+        live.append((info, status))
+    return live
+
+
+def find_conflict(inputs: list[dict], key: str) -> dict | None:
+    """Return the live instance already capturing one of ``inputs``, if any."""
+    for info, _status in _live_instances(key):
+        for theirs in info.get("inputs", []):
+            if any(_same_input(mine, theirs) for mine in inputs):
+                return info
+    return None
+
+
+def discover(key: str) -> list[dict]:
+    """Return all live instances with their status and stats."""
+    live = _live_instances(key)
+    if not live:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(live))) as pool:
+        stats = list(pool.map(lambda item: _probe(item[0], key, "get_stats"), live))
+    result = []
+    for (info, status), stat in zip(live, stats):
+        info = {k: v for k, v in info.items() if not k.startswith("_")}
+        info["status"] = status
+        info["stats"] = stat
+        result.append(info)
+    return sorted(result, key=lambda i: i["port"])
+
+
+def print_instances(key: str) -> None:
+    """Print a table of all running bridges."""
+    instances = discover(key)
+    if not instances:
+        print("No running bridges found.")
+        return
+    print(f"{'PID':>7} {'PORT':>6}  {'STATE':8} {'TIMECODE':12} {'FPS':>6} {'OVF/S':>6}  INPUT")
+    for info in instances:
+        status = (info["status"] or {}).get("status", {})
+        loop = ((info["stats"] or {}).get("loop") or {})
+        state = "running" if status.get("is_running") else "stopped"
+        if info["status"] is None:
+            state = "no reply"
+        inputs = ", ".join(
+            f"{i['device']}"
+            + (f" [{i['host_api']}]" if i.get("host_api") else "")
+            + f" ch{i['channel']}"
+            for i in info.get("inputs", []))
+        print(f"{info['pid']:>7} {info['port']:>6}  {state:8} "
+              f"{status.get('last_timecode') or '-':12} "
+              f"{loop.get('frames_per_s', 0):>6} {loop.get('overflows_per_s', 0):>6}  {inputs}")
@@ -1,6 +1,13 @@
-"""IPC client for checking existing instances."""
+"""IPC client for checking existing instances and sending commands."""
+import argparse
+import json
 import socket
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PORT = 12321
+DEFAULT_KEY = "LTCOSCReader"
 
 
 def check_existing_instance(port: int, key: str) -> bool:
@@ -25,3 +32,88 @@ def check_existing_instance(port: int, key: str) -> bool:
     except Exception as e:
         logging.warning("Error checking existing instance: %s", e)
         return False
+
+
+def send_command(port: int, key: str, cmd: str, host: str = "127.0.0.1",
+                 timeout: float = 2.0, **args) -> dict:
+    """Send one JSON command to a running bridge and return its response.
+
+    Connection problems are returned as ``{"ok": False, "error": ...}`` so a
+    script talking to many bridges does not have to catch exceptions.
+    """
+    request = dict(args, key=key, cmd=cmd)
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            data = b""
+            while b"\n" not in data:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+    except OSError as e:
+        return {"ok": False, "error": str(e)}
+    try:
+        return json.loads(data.split(b"\n", 1)[0].decode("utf-8"))
+    except ValueError:
+        return {"ok": False, "error": "invalid response"}
+
+
+def _parse_value(text: str):
+    """Parse a CLI argument value as JSON, falling back to a plain string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Send a command to one or more running LTC-OSC bridges")
+    parser.add_argument("cmd", help="command name, e.g. get_status, set_offset")
+    parser.add_argument("args", nargs="*", metavar="NAME=VALUE",
+                        help="command arguments; values are parsed as JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, action="append",
+                        help=f"IPC port (repeatable, default {DEFAULT_PORT})")
+    parser.add_argument("--all", action="store_true",
+                        help="send to every running bridge on this host")
+    parser.add_argument("--key", default=DEFAULT_KEY)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    cmd_args = {}
+    for item in args.args:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"argument '{item}' must be NAME=VALUE")
+        cmd_args[name] = _parse_value(value)
+
+    if args.all:
+        from modules.communication.instances import discover
+        ports = [info["port"] for info in discover(args.key)]
+        if not ports:
+            print("No running bridges found.")
+            return 1
+    else:
+        ports = args.port or [DEFAULT_PORT]
+    with ThreadPoolExecutor(max_workers=min(32, len(ports))) as pool:
+        results = list(pool.map(
+            lambda p: send_command(p, args.key, args.cmd, args.host,
+                                   args.timeout, **cmd_args),
+            ports))
+
+    failed = 0
+    for port, result in zip(ports, results):
+        if not result.get("ok"):
+            failed += 1
+        if len(ports) == 1:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(f"{args.host}:{port} {json.dumps(result, ensure_ascii=False)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,37 @@
-"""IPC server for single instance enforcement."""
+"""IPC server for single instance enforcement and remote control.
+
+Two protocols share the socket:
+
+* Legacy: the client sends the bare application key and receives ``OK`` or
+  ``INVALID`` (used by ``check_existing_instance``).
+* Commands: the client sends line-delimited JSON objects such as
+  ``{"key": "...", "cmd": "get_status"}`` and receives one JSON object per
+  line, ``{"ok": true, ...}`` or ``{"ok": false, "error": "..."}``. The
+  connection stays open for further commands until the client closes it.
+"""
 import asyncio
+import errno
+import json
 import logging
 
+MAX_LINE = 64 * 1024
+
 
-async def handle_client(reader, writer, key: str):
+async def handle_client(reader, writer, key: str, handler=None):
     """Handle client connection."""
     try:
         data = await reader.read(1024)
-        client_key = data.decode("utf-8")
-
-        if client_key == key:
-            writer.write(b"OK")
+        if data.lstrip().startswith(b"{") and handler is not None:
+            await _handle_commands(reader, writer, key, handler, data)
         else:
-            writer.write(b"INVALID")
+            client_key = data.decode("utf-8")
 
-        await writer.drain()
+            if client_key == key:
+                writer.write(b"OK")
+            else:
+                writer.write(b"INVALID")
+
+            await writer.drain()
         writer.close()
         await writer.wait_closed()
     except Exception as e:
@@ -26,26 +43,73 @@ async def handle_client(reader, writer, key: str):
             pass
 
 
-async def start_server(port: int, key: str):
+async def _handle_commands(reader, writer, key: str, handler, buffer: bytes):
+    """Serve line-delimited JSON commands until the client disconnects."""
+    loop = asyncio.get_running_loop()
+    while True:
+        while b"\n" not in buffer:
+            if len(buffer) > MAX_LINE:
+                return
+            chunk = await reader.read(4096)
+            if not chunk:
+                if not buffer.strip():
+                    return
+                buffer += b"\n"  # last command without trailing newline
+                break
+            buffer += chunk
+        line, buffer = buffer.split(b"\n", 1)
+        if not line.strip():
+            continue
+
+        try:
+            request = json.loads(line.decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            response = {"ok": False, "error": f"bad request: {e}"}
+        else:
+            if request.get("key") != key:
+                response = {"ok": False, "error": "invalid key"}
+            else:
+                # Handlers may touch PortAudio or the file system; keep the
+                # event loop responsive for other clients.
+                response = await loop.run_in_executor(None, handler, request)
+
+        writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+async def start_server(port: int, key: str, handler=None, on_listening=None):
     """Start IPC server for single instance enforcement.
 
     Args:
-        port: Port to listen on
+        port: Port to listen on; if it is taken (another bridge on this
+            host), an ephemeral port is used instead. 0 always picks one.
         key: Application key to verify
+        handler: Callable taking a command dict and returning a response
+            dict; JSON commands are rejected when omitted
+        on_listening: Called with the bound port once the server listens
     """
+    def client_cb(r, w):
+        return handle_client(r, w, key, handler)
+
     try:
-        server = await asyncio.start_server(
-            lambda r, w: handle_client(r, w, key),
-            "127.0.0.1",
-            port
-        )
+        try:
+            server = await asyncio.start_server(client_cb, "127.0.0.1", port)
+        except OSError as e:
+            if port == 0 or e.errno not in (errno.EADDRINUSE, 10048):
+                raise
+            logging.info("Port %d already in use, using an ephemeral port", port)
+            server = await asyncio.start_server(client_cb, "127.0.0.1", 0)
+
+        bound_port = server.sockets[0].getsockname()[1]
+        logging.info("IPC server listening on 127.0.0.1:%d", bound_port)
+        if on_listening is not None:
+            on_listening(bound_port)
 
         async with server:
             await server.serve_forever()
     except OSError as e:
-        if e.errno == 10048:  # Address already in use
-            logging.warning("Port %d already in use", port)
-        else:
-            logging.error("Failed to start IPC server: %s", e)
+        logging.error("Failed to start IPC server: %s", e)
     except Exception as e:
         logging.error("IPC server error: %s", e)
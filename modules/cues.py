@@ -0,0 +1,256 @@
+"""Timecode-triggered OSC cues.
+
+A cue list maps timecodes to OSC messages. ``CueIndex`` keeps the cues
+sorted by integer frame number, so the cues crossed between two frames are
+found with two binary searches however long the list is. ``CueEngine``
+follows one decoded timecode stream and decides, frame by frame, which
+cues to fire; the caller sends them in one OSC bundle together with the
+frame's ``/decode`` message.
+
+Continuous playback fires every cue whose frame was passed, including
+frames the decoder missed. A move of more than ``jump`` seconds is a jump
+and is handled by the ``on_jump`` policy:
+
+- ``skip``: only cues on the landing frame fire.
+- ``chase``: a forward jump fires every cue it crossed, in timecode order;
+  backwards it behaves like ``skip``.
+- ``last``: the latest cue at or before the landing frame fires, so
+  receivers end up in the state the show has at that point.
+
+With ``freewheel`` seconds set, cues keep firing on the extrapolated
+timecode while the signal drops out, and are not fired again when it
+returns.
+
+Cue files are JSON (a list of ``{"tc", "address", "args", "name"}``
+objects, or ``{"cues": [...]}``) or CSV (``tc,address,arg,...`` per line;
+``#`` starts a comment).
+"""
+import bisect
+import collections
+import csv
+import json
+import logging
+import os
+import threading
+import time
+
+from modules.ltc_encoder import frames_to_timecode, parse_timecode, timecode_to_frames
+
+JUMP_POLICIES = ("skip", "chase", "last")
+
+Cue = collections.namedtuple("Cue", "frame address args name")
+
+
+def _csv_value(text: str):
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _make_cue(tc: str, address: str, args, name, fps: float, drop_frame: bool) -> Cue:
+    if not address or not address.startswith("/"):
+        raise ValueError(f"invalid OSC address: {address!r}")
+    frame = timecode_to_frames(*parse_timecode(tc), fps, drop_frame)
+    if args is None:
+        args = ()
+    elif not isinstance(args, (list, tuple)):
+        args = (args,)
+    return Cue(frame, address, tuple(args), name or tc)
+
+
+def load_cue_file(path: str, fps: float, drop_frame: bool = False) -> list[Cue]:
+    """Read a JSON or CSV cue list; raise ValueError with the position of an error."""
+    cues = []
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        if os.path.splitext(path)[1].lower() == ".csv":
+            for line, row in enumerate(csv.reader(fh), 1):
+                if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                    continue
+                if line == 1 and row[0].strip().lower() in ("tc", "timecode"):
+                    continue  # header
+                try:
+                    cues.append(_make_cue(
+                        row[0].strip(), row[1].strip() if len(row) > 1 else "",
+                        [_csv_value(v.strip()) for v in row[2:]], None, fps, drop_frame))
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line}: {e}") from None
+            return cues
+        data = json.load(fh)
+    return parse_cues(data.get("cues", []) if isinstance(data, dict) else data,
+                      fps, drop_frame, path)
+
+
+def parse_cues(items: list, fps: float, drop_frame: bool = False,
+               source: str = "cues") -> list[Cue]:
+    """Build cues from ``{"tc", "address", "args", "name"}`` dicts."""
+    cues = []
+    for i, item in enumerate(items):
+        try:
+            cues.append(_make_cue(str(item["tc"]), item.get("address", ""),
+                                  item.get("args"), item.get("name"), fps, drop_frame))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{source}[{i}]: {e}") from None
+    return cues
+
+
+class CueIndex:
+    """Cues sorted by frame; cues on the same frame keep their list order."""
+
+    def __init__(self, cues: list[Cue]):
+        self.cues = sorted(cues, key=lambda c: c.frame)
+        self.frames = [c.frame for c in self.cues]
+
+    def __len__(self) -> int:
+        return len(self.cues)
+
+    def span(self, after: int, upto: int) -> tuple[int, int]:
+        """Index range of the cues with ``after < frame <= upto``."""
+        return (bisect.bisect_right(self.frames, after),
+                bisect.bisect_right(self.frames, upto))
+
+    def latest(self, upto: int) -> list[Cue]:
+        """The cue(s) on the last cue frame at or before ``upto``."""
+        end = bisect.bisect_right(self.frames, upto)
+        if not end:
+            return []
+        start = bisect.bisect_left(self.frames, self.frames[end - 1])
+        return self.cues[start:end]
+
+
+class CueEngine:
+    """Fire cues from one timecode stream (see the module docstring).
+
+    ``frame`` is called with every decoded frame and ``tick`` once per
+    capture chunk; both return the cues to send now. Redundant inputs may
+    call them from several capture threads, so they share a lock.
+    ``load`` swaps in a new cue list without losing the position.
+    """
+
+    def __init__(self, cues: list[Cue], fps: float, drop_frame: bool = False,
+                 on_jump: str = "skip", jump: float = 1.0, freewheel: float = 0.0):
+        if on_jump not in JUMP_POLICIES:
+            raise ValueError(f"unknown on_jump policy: {on_jump}")
+        self.index = CueIndex(cues)
+        self.fps = fps
+        self.drop_frame = drop_frame
+        self.on_jump = on_jump
+        self.jump_frames = max(int(round(jump * fps)), 1)
+        self.freewheel = freewheel
+        self.done = None       # cues up to this frame have been dealt with
+        self.last_count = None
+        self.last_time = None  # monotonic start time of the last decoded frame
+        self.last_arrival = None
+        self.fired = 0
+        self.skipped = 0
+        self.jumps = 0
+        self.freewheeled = 0
+        self.last_cue = None
+        self._lock = threading.Lock()
+
+    def load(self, cues: list[Cue]) -> None:
+        self.index = CueIndex(cues)
+
+    def _fire(self, after: int, upto: int) -> list[Cue]:
+        index = self.index
+        start, end = index.span(after, upto)
+        self.done = upto
+        return index.cues[start:end]
+
+    def _land(self, count: int) -> list[Cue]:
+        """Apply the jump policy for a move from ``self.done`` to ``count``."""
+        index = self.index
+        previous = self.done
+        if previous is not None:
+            self.jumps += 1
+        if self.on_jump == "chase" and previous is not None and count > previous:
+            return self._fire(previous, count)
+        if self.on_jump == "last":
+            cues = index.latest(count)
+        else:
+            start, end = index.span(count - 1, count)
+            cues = index.cues[start:end]
+        if previous is not None and count > previous:
+            start, end = index.span(previous, count)
+            self.skipped += end - start - sum(1 for c in cues if c.frame > previous)
+        self.done = count
+        return cues
+
+    def frame(self, hours: int, minutes: int, seconds: int, frames: int,
+              started: float | None = None) -> list[Cue]:
+        count = timecode_to_frames(hours, minutes, seconds, frames,
+                                   self.fps, self.drop_frame)
+        with self._lock:
+            self.last_count = count
+            self.last_arrival = time.monotonic()
+            self.last_time = self.last_arrival if started is None else started
+            done = self.done
+            if done is None:
+                cues = self._land(count)
+            elif count > done:
+                if count - done <= self.jump_frames:
+                    cues = self._fire(done, count)
+                else:
+                    cues = self._land(count)
+            elif done - count <= self.jump_frames:
+                # Repeated frame, or behind the freewheel position: the
+                # cues up to ``done`` were already sent.
+                return []
+            else:
+                cues = self._land(count)
+            return self._count(cues)
+
+    def tick(self, now: float | None = None) -> list[Cue]:
+        """Fire cues on the extrapolated timecode while the signal is missing."""
+        if not self.freewheel or self.last_time is None:
+            return []
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            # Frames reach the decoder late and in chunks; a gap of less
+            # than two frame periods is ordinary delivery jitter.
+            missing = now - self.last_arrival
+            if missing * self.fps < 2 or missing > self.freewheel:
+                return []
+            position = self.last_count + int((now - self.last_time) * self.fps)
+            if position <= self.done:
+                return []
+            cues = self._fire(self.done, position)
+            self.freewheeled += len(cues)
+            return self._count(cues)
+
+    def _count(self, cues: list[Cue]) -> list[Cue]:
+        if cues:
+            self.fired += len(cues)
+            self.last_cue = cues[-1].name
+        return cues
+
+    def get_status(self) -> dict:
+        done = self.done
+        position = None
+        if done is not None:
+            position = "%02d:%02d:%02d:%02d" % frames_to_timecode(
+                done, self.fps, self.drop_frame)
+        return {
+            "cues": len(self.index),
+            "on_jump": self.on_jump,
+            "position": position,
+            "fired": self.fired,
+            "skipped": self.skipped,
+            "jumps": self.jumps,
+            "freewheeled": self.freewheeled,
+            "last_cue": self.last_cue,
+        }
+
+
+def load_cues(settings: dict, fps: float, drop_frame: bool = False) -> list[Cue]:
+    """Cues of a ``cues`` config: ``file`` and/or inline ``list``."""
+    cues = []
+    path = settings.get("file")
+    if path:
+        cues.extend(load_cue_file(path, fps, drop_frame))
+    cues.extend(parse_cues(settings.get("list") or [], fps, drop_frame))
+    if not cues:
+        logging.warning("Cue list is empty")
+    return cues
@@ -0,0 +1,92 @@
+"""Anti-alias filter and integer downsampling ahead of the LTC decoder.
+
+LTC occupies at most a few kHz, so a 96 or 192 kHz input can be reduced
+to 48 kHz before libltc sees it. The FIR filter runs in numpy, one call
+per chunk, and only evaluates the output samples that are kept.
+
+numpy is imported on first use so it does not slow down startup when
+decimation is off.
+"""
+import importlib.util
+
+# Lowest effective rate "auto" decimates to.
+MIN_DECODE_RATE = 44100
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def decimation_factor(setting, sample_rate: int) -> int:
+    """Resolve the ``decimation`` setting (1/int/"auto") to a factor."""
+    if setting in (None, False, 0, 1):
+        return 1
+    if setting == "auto":
+        return max(1, sample_rate // MIN_DECODE_RATE)
+    factor = int(setting)
+    if factor < 1 or sample_rate // factor < 8000:
+        raise ValueError(f"invalid decimation factor {setting} for {sample_rate}Hz")
+    return factor
+
+
+def design_lowpass(factor: int, taps_per_phase: int = 16):
+    """Return a windowed-sinc low-pass for ``factor`` x downsampling.
+
+    The cut-off sits at 90% of the output Nyquist frequency, far above
+    the LTC band at any frame rate.
+    """
+    import numpy as np
+
+    taps = taps_per_phase * factor - 1
+    cutoff = 0.45 / factor  # cycles per input sample
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+class Decimator:
+    """Stateful low-pass + downsample for a stream of int16 chunks.
+
+    Filter history and the downsampling phase carry over between chunks,
+    so chunk boundaries (and chunk size changes) leave no trace in the
+    output. Output sample ``k`` corresponds to input sample ``k * factor``
+    (after the fixed group delay of ``delay`` input samples).
+    """
+
+    def __init__(self, factor: int, taps_per_phase: int = 16):
+        import numpy as np
+
+        self._np = np
+        self.factor = factor
+        # Symmetric, so no need to reverse it for the dot products.
+        self._h = design_lowpass(factor, taps_per_phase)
+        taps = len(self._h)
+        self.delay = (taps - 1) // 2
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._phase = 0
+
+    def process(self, samples):
+        """Return the decimated int16 samples for one chunk."""
+        np = self._np
+        chunk = np.frombuffer(samples, dtype=np.int16) if isinstance(
+            samples, (bytes, bytearray, memoryview)) else np.asarray(samples, dtype=np.int16)
+        x = np.empty(len(self._history) + len(chunk), dtype=np.float32)
+        x[:len(self._history)] = self._history
+        x[len(self._history):] = chunk
+        taps = len(self._h)
+        n_windows = len(x) - taps + 1
+        if n_windows <= 0:
+            self._history = x
+            return np.zeros(0, dtype=np.int16)
+        # One row per kept output sample, as a strided view of x; the
+        # product only evaluates the samples that survive downsampling.
+        count = (n_windows - self._phase + self.factor - 1) // self.factor
+        step = x.strides[0]
+        windows = np.lib.stride_tricks.as_strided(
+            x[self._phase:], (count, taps), (step * self.factor, step), writeable=False)
+        y = windows @ self._h
+        self._phase += count * self.factor - n_windows
+        self._history = x[n_windows:]
+        np.rint(y, out=y)
+        np.clip(y, -32768, 32767, out=y)
+        return y.astype(np.int16)
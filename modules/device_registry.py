@@ -0,0 +1,210 @@
+"""Shared PortAudio instance and cached audio device table."""
+import logging
+import threading
+import time
+
+import pyaudio
+
+
+class DeviceRegistry:
+    """Own a single ``pyaudio.PyAudio`` instance and cache its device table.
+
+    PortAudio scans every host API when it initialises, which can take
+    seconds on machines with many ASIO/WASAPI endpoints. The instance is
+    therefore created once and shared. ``refresh`` re-initialises PortAudio
+    to pick up added or removed devices; streams opened before the refresh
+    are invalid afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pa = None
+        self._devices = None
+        # Incremented on every refresh so holders of device indices can
+        # tell that the table changed underneath them.
+        self.generation = 0
+        self._refreshed_at = None
+        self._refresh_listeners = []
+
+    @property
+    def pa(self) -> pyaudio.PyAudio:
+        """Return the shared PyAudio instance, initialising it on first use."""
+        with self._lock:
+            if self._pa is None:
+                self._pa = pyaudio.PyAudio()
+            return self._pa
+
+    def add_refresh_listener(self, callback, after=None) -> None:
+        """Call ``callback()`` before PortAudio is re-initialised.
+
+        Every stream on the shared instance must be closed at that point;
+        the stream handles do not survive ``Pa_Terminate``. ``after()`` is
+        called once the new device table is ready.
+        """
+        with self._lock:
+            self._refresh_listeners.append((callback, after))
+
+    def remove_refresh_listener(self, callback) -> None:
+        with self._lock:
+            self._refresh_listeners = [
+                entry for entry in self._refresh_listeners if entry[0] != callback]
+
+    def _notify(self, index: int) -> None:
+        for entry in list(self._refresh_listeners):
+            callback = entry[index]
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception as exc:  # noqa: W0703
+                logging.warning("Refresh listener failed: %s", exc)
+
+    def refresh(self, max_age: float = 0.0) -> bool:
+        """Re-initialise PortAudio and rebuild the device table.
+
+        With ``max_age`` the refresh is skipped if the table was rebuilt
+        less than that many seconds ago: a refresh stops every stream on
+        the shared instance, so callers retrying in a loop must not issue
+        one per attempt. Returns whether the table was rebuilt.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (max_age > 0 and self._refreshed_at is not None
+                    and now - self._refreshed_at < max_age):
+                return False
+            self._refreshed_at = now
+            self._notify(0)
+            if self._pa is not None:
+                self._pa.terminate()
+                self._pa = None
+            self._devices = None
+            self.generation += 1
+            count = len(self.devices())
+            self._notify(1)
+        logging.info("Audio device table refreshed (%d devices)", count)
+        return True
+
+    def devices(self) -> list[dict]:
+        """Return the cached table of all devices."""
+        with self._lock:
+            if self._devices is None:
+                self._devices = self._scan()
+            return self._devices
+
+    def input_devices(self) -> list[dict]:
+        """Return the cached devices that have at least one input channel."""
+        return [d for d in self.devices() if d["max_input_channels"] > 0]
+
+    def output_devices(self) -> list[dict]:
+        """Return the cached devices that have at least one output channel."""
+        return [d for d in self.devices() if d["max_output_channels"] > 0]
+
+    def get(self, index: int) -> dict | None:
+        """Return the cached entry for ``index`` or None if not found."""
+        for dev in self.devices():
+            if dev["index"] == index:
+                return dev
+        return None
+
+    def _named(self, name: str, host_api: str | None, output: bool) -> list[dict]:
+        return [dev for dev in (self.output_devices() if output else self.input_devices())
+                if dev["name"] == name and (not host_api or dev["host_api"] == host_api)]
+
+    def find(self, name: str, host_api: str | None = None,
+             output: bool = False, index: int | None = None) -> dict | None:
+        """Return the input (or output) device matching ``name`` (and ``host_api``).
+
+        Identical interfaces share a name. Of several matches the one at
+        ``index`` is returned, otherwise the first; ``name#2`` selects the
+        second device of that name in table order.
+        """
+        matches = self._named(name, host_api, output)
+        if not matches:
+            base, sep, ordinal = name.rpartition("#")
+            if not (sep and ordinal.isdigit() and int(ordinal) >= 1):
+                return None
+            matches = self._named(base, host_api, output)
+            return matches[int(ordinal) - 1] if int(ordinal) <= len(matches) else None
+        for dev in matches:
+            if dev["index"] == index:
+                return dev
+        return matches[0]
+
+    def resolve(self, index: int | None = None, name: str | None = None,
+                host_api: str | None = None) -> dict | None:
+        """Resolve a configured device, preferring the stable name over the index.
+
+        Device indices change when interfaces are plugged in or the machine
+        reboots, so ``name``/``host_api`` are tried first and ``index`` is
+        only used when no name is configured, or to choose between devices
+        with the same name.
+        """
+        if name:
+            dev = self.find(name, host_api, index=index)
+            if dev is not None and index is not None and dev["index"] != index:
+                logging.info(
+                    "Device '%s' moved from index %s to %d",
+                    name, index, dev["index"])
+            return dev
+        if index is None:
+            return None
+        dev = self.get(index)
+        if dev is None or dev["max_input_channels"] <= 0:
+            return None
+        return dev
+
+    def default_input(self) -> dict | None:
+        """Return the first available input device."""
+        devices = self.input_devices()
+        return devices[0] if devices else None
+
+    def terminate(self) -> None:
+        """Release the shared PortAudio instance."""
+        with self._lock:
+            if self._pa is not None:
+                self._pa.terminate()
+                self._pa = None
+            self._devices = None
+
+    def _scan(self) -> list[dict]:
+        pa = self.pa
+        host_apis = {}
+        for i in range(pa.get_host_api_count()):
+            try:
+                host_apis[i] = pa.get_host_api_info_by_index(i).get("name")
+            except Exception:  # noqa: W0703
+                host_apis[i] = None
+
+        devices = []
+        for i in range(pa.get_device_count()):
+            try:
+                info = pa.get_device_info_by_index(i)
+            except Exception as exc:  # noqa: W0703
+                logging.warning("Failed to query audio device %d: %s", i, exc)
+                continue
+            devices.append({
+                "index": i,
+                "name": info.get("name"),
+                "host_api": host_apis.get(info.get("hostApi", -1)),
+                "max_input_channels": int(info.get("maxInputChannels", 0)),
+                "max_output_channels": int(info.get("maxOutputChannels", 0)),
+                "default_sample_rate": info.get("defaultSampleRate", 0),
+                "default_low_input_latency":
+                    info.get("defaultLowInputLatency", 0.0),
+                "default_high_input_latency":
+                    info.get("defaultHighInputLatency", 0.0),
+            })
+        return devices
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> DeviceRegistry:
+    """Return the process-wide device registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DeviceRegistry()
+        return _registry
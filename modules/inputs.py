@@ -0,0 +1,60 @@
+"""Expansion of the ``inputs`` / ``channels`` configuration.
+
+A config without ``inputs`` describes a single device and the top-level
+``channel``, exactly as before. With ``inputs``, every entry describes one
+device and overrides the top-level settings, e.g.::
+
+    "inputs": [
+        {"audio_device_name": "ASIO Card A", "channel": 0},
+        {"audio_device_name": "USB LTC In", "channels": [
+            {"channel": 0, "osc_address": "/ltc/main"},
+            {"channel": 1, "osc_address": "/ltc/backup"}]}
+    ]
+"""
+
+
+def expand_inputs(config: dict) -> list[dict]:
+    """Return one flat config per input device.
+
+    With several inputs, an entry without its own ``osc_address`` sends to
+    ``<osc_address>/<input number>`` so that two devices never share an
+    address.
+    """
+    inputs = config.get("inputs")
+    base = {k: v for k, v in config.items() if k != "inputs"}
+    if not inputs:
+        return [base]
+    base_address = config.get("osc_address", "/ltc")
+    expanded = []
+    for i, entry in enumerate(inputs):
+        if len(inputs) > 1 and not entry.get("osc_address"):
+            entry = dict(entry, osc_address=f"{base_address}/{i}")
+        expanded.append(dict(base, **entry))
+    return expanded
+
+
+def channel_specs(config: dict) -> list[dict]:
+    """Return ``{"channel", "osc_address", "timecode_offset"}`` per decoded channel.
+
+    ``channels`` entries are channel numbers or objects with their own
+    ``osc_address``/``timecode_offset``. When one device decodes several
+    channels, channels without an explicit address get ``<osc_address>/<n>``.
+    """
+    channels = config.get("channels")
+    if not channels:
+        channels = [config.get("channel", 0)]
+    base_address = config.get("osc_address", "/ltc")
+    specs = []
+    for entry in channels:
+        spec = entry if isinstance(entry, dict) else {"channel": entry}
+        channel = int(spec.get("channel", 0))
+        address = spec.get("osc_address")
+        if not address:
+            address = base_address if len(channels) == 1 else f"{base_address}/{channel}"
+        specs.append({
+            "channel": channel,
+            "osc_address": address,
+            "timecode_offset": float(
+                spec.get("timecode_offset", config.get("timecode_offset", 0.0))),
+        })
+    return specs
@@ -0,0 +1,89 @@
+"""Latency profiles and adaptive chunk sizing for the capture stream."""
+import logging
+
+# chunk_size is used for both frames_per_buffer and the read size; the
+# decoder only sees a frame once the chunk that completes it was read, so
+# it bounds the added latency (512 frames = 10.7ms at 48kHz).
+# min/max_chunk bound the adaptive controller.
+LATENCY_PROFILES = {
+    "low": {"chunk_size": 128, "min_chunk": 64, "max_chunk": 512},
+    "balanced": {"chunk_size": 512, "min_chunk": 256, "max_chunk": 2048},
+    "efficient": {"chunk_size": 2048, "min_chunk": 1024, "max_chunk": 8192},
+}
+DEFAULT_LATENCY_PROFILE = "balanced"
+
+
+def resolve_latency_profile(config: dict) -> dict:
+    """Return the profile selected in ``config`` with overrides applied.
+
+    ``chunk_size`` in the config overrides the profile's chunk size (and
+    widens the adaptive bounds if needed).
+    """
+    name = config.get("latency_profile") or DEFAULT_LATENCY_PROFILE
+    if name not in LATENCY_PROFILES:
+        logging.warning("Unknown latency_profile '%s', using '%s'",
+                        name, DEFAULT_LATENCY_PROFILE)
+        name = DEFAULT_LATENCY_PROFILE
+    profile = dict(LATENCY_PROFILES[name], name=name)
+    if config.get("chunk_size"):
+        chunk = int(config["chunk_size"])
+        profile["chunk_size"] = chunk
+        profile["min_chunk"] = min(profile["min_chunk"], chunk)
+        profile["max_chunk"] = max(profile["max_chunk"], chunk)
+    return profile
+
+
+class AdaptiveChunkController:
+    """Grow or shrink the chunk size from measured overflow rate and load.
+
+    ``evaluate`` takes one ``LoopStats.window()`` result and returns the new
+    chunk size, or None to keep the current one. The chunk doubles as soon
+    as a window shows overflows or a busy loop, and halves only after
+    ``calm_windows`` consecutive quiet windows. It does not shrink back below
+    a size it had to grow away from, so it settles instead of oscillating;
+    that floor halves again after ``floor_decay_windows`` windows without
+    overflows or high load, so a passing spike does not raise the latency
+    for good.
+    """
+
+    def __init__(self, min_chunk: int, max_chunk: int,
+                 max_overflow_rate: float = 0.1, high_load_pct: float = 50.0,
+                 low_load_pct: float = 10.0, calm_windows: int = 3,
+                 floor_decay_windows: int = 60):
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.max_overflow_rate = max_overflow_rate
+        self.high_load_pct = high_load_pct
+        self.low_load_pct = low_load_pct
+        self.calm_windows = calm_windows
+        self.floor_decay_windows = floor_decay_windows
+        self._calm = 0
+        self._quiet = 0
+        self._floor = min_chunk
+
+    def evaluate(self, chunk_size: int, stats: dict) -> int | None:
+        load = max(stats["busy_pct"], stats["cpu_pct"])
+        if (stats["overflows_per_s"] > self.max_overflow_rate
+                or load > self.high_load_pct):
+            self._calm = 0
+            self._quiet = 0
+            if chunk_size < self.max_chunk:
+                new_size = min(chunk_size * 2, self.max_chunk)
+                self._floor = max(self._floor, new_size)
+                return new_size
+            return None
+
+        self._quiet += 1
+        if self._quiet >= self.floor_decay_windows and self._floor > self.min_chunk:
+            self._quiet = 0
+            self._floor = max(self._floor // 2, self.min_chunk)
+            logging.debug("Adaptive chunk floor lowered to %d", self._floor)
+
+        if stats["overflows_per_s"] == 0 and load < self.low_load_pct:
+            self._calm += 1
+            if self._calm >= self.calm_windows and chunk_size > self._floor:
+                self._calm = 0
+                return max(chunk_size // 2, self._floor)
+        else:
+            self._calm = 0
+        return None
@@ -0,0 +1,95 @@
+"""Asynchronous logging so audio threads never wait on console or file I/O."""
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+LOG_FORMAT = "[%(levelname)s] %(message)s"
+
+_listener = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted; the listener thread formats them.
+
+    The stock ``QueueHandler.prepare`` merges the message with its
+    arguments in the calling thread. Records stay in this process, so that
+    is not needed, as long as callers do not mutate the arguments after
+    the call (the hot paths only pass strings and numbers).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=logging.INFO, fmt: str = LOG_FORMAT) -> None:
+    """Route every record through a queue served by a background thread.
+
+    Replaces the handlers of the root logger; calling it again only
+    changes the level.
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(fmt))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush the queue and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
+
+
+class RateLimitedLog:
+    """Log at most ``rate`` records per second and count the rest.
+
+    The dropped count is appended to the next record that gets through.
+    ``rate`` <= 0 disables the log; ``enabled`` lets callers skip building
+    arguments entirely. One instance may be shared by several capture
+    threads and retuned from the IPC thread; the counters are locked.
+    """
+
+    def __init__(self, rate: float, level: int = logging.INFO,
+                 logger: logging.Logger | None = None):
+        self.level = level
+        self.logger = logger or logging.getLogger()
+        self._lock = threading.Lock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self.rate = rate
+            self._interval = 1.0 / rate if rate > 0 else 0.0
+            self._next = 0.0
+            self.suppressed = 0
+            self.enabled = rate > 0
+
+    def log(self, msg: str, *args) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next:
+                self.suppressed += 1
+                return
+            self._next = now + self._interval
+            suppressed, self.suppressed = self.suppressed, 0
+        if suppressed:
+            msg += " (+%d suppressed)"
+            args += (suppressed,)
+        self.logger.log(self.level, msg, *args)
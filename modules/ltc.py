@@ -36,9 +36,15 @@ class SMPTETimecode(ctypes.Structure):
 
 
 class LibLTC:
-    """Minimal wrapper for libltc decoder."""
+    """Minimal wrapper for libltc decoder.
 
-    def __init__(self, lib_path: str, sample_rate: int, fps: float):
+    ``sample_rate`` is the rate of the samples passed to ``write``. When
+    they were decimated from the device rate, ``decimation`` is the factor
+    so that frame offsets can be reported in device samples.
+    """
+
+    def __init__(self, lib_path: str, sample_rate: int, fps: float,
+                 decimation: int = 1):
         self.lib = ctypes.cdll.LoadLibrary(lib_path)
         self.lib.ltc_decoder_create.argtypes = [ctypes.c_int, ctypes.c_int]
         self.lib.ltc_decoder_create.restype = ctypes.c_void_p
@@ -64,23 +70,43 @@ class LibLTC:
         self.lib.ltc_frame_to_time.restype = None
         apv = int(sample_rate / fps)
         self.decoder = self.lib.ltc_decoder_create(apv, 10)
+        self.decimation = decimation
         self.posinfo = 0
 
     def write(self, samples):
-        if not samples:
+        """Feed 16-bit samples (array('h'), int16 ndarray, bytes or a list)."""
+        count = len(samples)
+        if not count:
             return
-        arr_type = ctypes.c_short * len(samples)
-        c_samples = arr_type(*samples)
+        arr_type = ctypes.c_short * count
+        try:
+            # Zero-copy for writable contiguous buffers such as array('h').
+            c_samples = arr_type.from_buffer(samples)
+        except (TypeError, ValueError, BufferError):
+            if hasattr(samples, "tobytes"):
+                c_samples = arr_type.from_buffer_copy(samples.tobytes())
+            else:
+                c_samples = arr_type(*samples)
         self.lib.ltc_decoder_write_s16(
-            self.decoder, c_samples, len(samples), self.posinfo)
-        self.posinfo += len(samples)
+            self.decoder, c_samples, count, self.posinfo)
+        self.posinfo += count
 
     def read(self):
+        """Yield decoded ``SMPTETimecode`` values.
+
+        Each carries ``off_start``/``off_end``, the frame's position in
+        device samples since the decoder was created, ``volume``, the
+        frame's level in dBFS, and ``drop_frame``, the frame's drop-frame flag.
+        """
         frame = LTCFrameExt()
         while self.lib.ltc_decoder_read(self.decoder, ctypes.byref(frame)):
             stime = SMPTETimecode()
             self.lib.ltc_frame_to_time(
                 ctypes.byref(stime), ctypes.byref(frame.ltc), 0)
+            stime.off_start = frame.off_start * self.decimation
+            stime.off_end = frame.off_end * self.decimation
+            stime.volume = frame.volume
+            stime.drop_frame = bool(frame.ltc.data[1] & 0x04)  # bit 10
             yield stime
 
     def close(self):
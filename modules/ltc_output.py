@@ -0,0 +1,306 @@
+"""LTC output stage: regenerate clean timecode audio on an output device.
+
+The timecode comes from the system clock, from OSC messages (e.g. another
+bridge's ``/ltc/decode``) or from a channel decoded by this process, which
+turns a degraded input signal into a clean one. Frames are produced on the
+PortAudio callback thread from the precomputed tables of ``LTCEncoder``.
+"""
+import array
+import logging
+import threading
+import time
+
+import pyaudio
+
+from modules.ltc_encoder import (
+    LTCEncoder, clock_frame, parse_timecode, timecode_to_frames)
+
+LTC_OUTPUT_SOURCES = ("clock", "osc", "input")
+
+
+class ClockTimecodeSource:
+    """Timecode of the local time of day."""
+
+    def __init__(self, fps: float, drop_frame: bool = False):
+        self.fps = fps
+        self.drop_frame = drop_frame
+
+    def frame_at(self, when: float) -> int:
+        return clock_frame(self.fps, self.drop_frame, when)
+
+
+class ReferenceTimecodeSource:
+    """Follow timecode pushed by a decoder or OSC, extrapolated to any time.
+
+    ``update`` may be called from any thread; the reference is published by
+    a single attribute swap. After ``freewheel`` seconds without an update
+    the source reports stopped (None).
+    """
+
+    def __init__(self, fps: float, drop_frame: bool = False, freewheel: float = 1.0):
+        self.fps = fps
+        self.drop_frame = drop_frame
+        self.freewheel = freewheel
+        self.updates = 0
+        self._ref = None  # (frame number, wall clock time the frame started)
+
+    def update(self, hours: int, minutes: int, seconds: int, frames: int,
+               received: float | None = None) -> None:
+        count = timecode_to_frames(hours, minutes, seconds, frames,
+                                   self.fps, self.drop_frame)
+        self._ref = (count, time.time() if received is None else received)
+        self.updates += 1
+
+    def update_started(self, hours: int, minutes: int, seconds: int, frames: int,
+                       started: float) -> None:
+        """Anchor at ``started``, the monotonic time the frame began in the input.
+
+        A decoded frame is only known once it has ended and its chunk was
+        read; anchoring at that moment would delay the output by as much.
+        """
+        self.update(hours, minutes, seconds, frames,
+                    time.time() - (time.monotonic() - started))
+
+    def update_text(self, text: str) -> None:
+        self.update(*parse_timecode(text))
+
+    def frame_at(self, when: float) -> int | None:
+        ref = self._ref
+        if ref is None:
+            return None
+        count, received = ref
+        if time.time() - received > self.freewheel:
+            return None
+        return count + int((when - received) * self.fps)
+
+
+class OSCTimecodeListener:
+    """Feed ``HH:MM:SS:FF`` strings received on an OSC address into a source."""
+
+    def __init__(self, source: ReferenceTimecodeSource, port: int,
+                 address: str = "/ltc/decode", ip: str = "0.0.0.0"):
+        from pythonosc.dispatcher import Dispatcher
+        from pythonosc.osc_server import BlockingOSCUDPServer
+
+        self.source = source
+        self.address = address
+        dispatcher = Dispatcher()
+        dispatcher.map(address, self._on_message)
+        self.server = BlockingOSCUDPServer((ip, port), dispatcher)
+        self.thread = None
+
+    def _on_message(self, _address, *args):
+        try:
+            self.source.update_text(str(args[0]))
+        except (IndexError, ValueError) as e:
+            logging.debug("Ignoring OSC timecode %r: %s", args, e)
+
+    def start(self) -> None:
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="ltc-osc-in", daemon=True)
+        self.thread.start()
+        logging.info("LTC output listening for OSC %s on port %d",
+                     self.address, self.server.server_address[1])
+
+    def close(self) -> None:
+        if self.thread is not None:
+            self.server.shutdown()
+            self.thread = None
+        self.server.server_close()
+
+
+class LTCGenerator:
+    """Turn a timecode source into consecutive LTC frames.
+
+    While the source moves by one frame per frame the output simply counts
+    on, so jitter in the source never shows up in the signal; larger
+    differences (locate, loop) make the output jump.
+    """
+
+    def __init__(self, encoder: LTCEncoder, source):
+        self.encoder = encoder
+        self.source = source
+        self.frames_out = 0
+        self.jumps = 0
+        self._next = None
+
+    def next_frame(self, when: float) -> array.array:
+        """Return the samples of the frame that starts playing at ``when``."""
+        target = self.source.frame_at(when)
+        if target is None:
+            if self._next is not None:
+                logging.info("LTC output stopped")
+                self._next = None
+            return self.encoder.silence()
+        if self._next is None:
+            logging.info("LTC output started")
+            self._next = target
+        elif abs(target - self._next) > 1:
+            self.jumps += 1
+            self._next = target
+        samples = self.encoder.encode_count(self._next)
+        self._next += 1
+        self.frames_out += 1
+        return samples
+
+
+class LTCOutputStream:
+    """PortAudio output stream driven by a callback that pulls LTC frames."""
+
+    def __init__(self, pa: pyaudio.PyAudio, device: dict, generator: LTCGenerator,
+                 sample_rate: int, num_channels: int = 1, channel: int = 0,
+                 frames_per_buffer: int = 512):
+        self.pa = pa
+        self.device = device
+        self.generator = generator
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.channel = channel
+        self.frames_per_buffer = frames_per_buffer
+        self.latency = 0.0
+        self.underflows = 0
+        self.stream = None
+        self._pending = array.array("h")
+
+    def open(self) -> None:
+        self.stream = self.pa.open(
+            format=pyaudio.paInt16,
+            channels=self.num_channels,
+            rate=self.sample_rate,
+            output=True,
+            output_device_index=self.device["index"],
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=self._callback,
+        )
+        self.latency = self.stream.get_output_latency()
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        if status_flags & pyaudio.paOutputUnderflow:
+            self.underflows += 1
+        pending = self._pending
+        while len(pending) < frame_count:
+            # Wall clock time at which the new frame will be heard.
+            when = time.time() + self.latency + len(pending) / self.sample_rate
+            pending.extend(self.generator.next_frame(when))
+        mono = pending[:frame_count]
+        del pending[:frame_count]
+        if self.num_channels == 1:
+            return (mono.tobytes(), pyaudio.paContinue)
+        out = array.array("h", bytes(2 * frame_count * self.num_channels))
+        out[self.channel::self.num_channels] = mono
+        return (out.tobytes(), pyaudio.paContinue)
+
+    def close(self) -> None:
+        if self.stream is None:
+            return
+        stream, self.stream = self.stream, None
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception as exc:  # noqa: W0703
+            logging.debug("Error closing LTC output stream: %s", exc)
+        self._pending = array.array("h")
+
+
+class LTCOutput:
+    """Output stage configured by the ``ltc_output`` settings.
+
+    ``settings`` keys: ``source`` (clock/osc/input), ``audio_device_name``,
+    ``audio_host_api``, ``audio_device_index``, ``channel``, ``fps``,
+    ``drop_frame``, ``amplitude``, ``frames_per_buffer``, ``freewheel``,
+    ``osc_port`` and ``osc_address`` (osc source), ``input_channel`` (input
+    source). ``fps`` and ``sample_rate`` default to the bridge's.
+    """
+
+    def __init__(self, settings: dict, fps: float, sample_rate: int, registry):
+        self.kind = settings.get("source", "clock")
+        if self.kind not in LTC_OUTPUT_SOURCES:
+            raise ValueError(f"unknown ltc_output source: {self.kind}")
+        self.registry = registry
+        self.fps = float(settings.get("fps") or fps)
+        self.sample_rate = int(settings.get("sample_rate") or sample_rate)
+        drop_frame = bool(settings.get("drop_frame", False))
+
+        self.listener = None
+        if self.kind == "clock":
+            self.source = ClockTimecodeSource(self.fps, drop_frame)
+        else:
+            self.source = ReferenceTimecodeSource(
+                self.fps, drop_frame, float(settings.get("freewheel", 1.0)))
+            if self.kind == "osc":
+                self.listener = OSCTimecodeListener(
+                    self.source, int(settings.get("osc_port", 9001)),
+                    settings.get("osc_address", "/ltc/decode"))
+
+        self.encoder = LTCEncoder(self.sample_rate, self.fps,
+                                  float(settings.get("amplitude", 0.5)), drop_frame)
+        self.generator = LTCGenerator(self.encoder, self.source)
+
+        dev = self._resolve_device(settings)
+        channel = int(settings.get("channel", 0))
+        num_channels = min(max(channel + 1, 1), dev["max_output_channels"])
+        if channel >= num_channels:
+            logging.warning("LTC output channel %d not available on '%s', using 0",
+                            channel, dev["name"])
+            channel = 0
+        self.device_name = dev["name"]
+        self.stream = LTCOutputStream(
+            registry.pa, dev, self.generator, self.sample_rate, num_channels,
+            channel, int(settings.get("frames_per_buffer", 512)))
+
+    def _resolve_device(self, settings: dict) -> dict:
+        name = settings.get("audio_device_name")
+        index = settings.get("audio_device_index")
+        dev = None
+        if name:
+            dev = self.registry.find(name, settings.get("audio_host_api"), output=True,
+                                     index=index)
+        elif index is not None:
+            dev = self.registry.get(index)
+        if dev is not None and dev["max_output_channels"] > 0:
+            return dev
+        if name or index is not None:
+            # Timecode on the wrong output can reach a PA or a recorder.
+            raise OSError(f"LTC output device not found (name: {name}, index: {index})")
+        outputs = self.registry.output_devices()
+        if not outputs:
+            raise OSError("no audio output device available")
+        return outputs[0]
+
+    def start(self) -> None:
+        if self.listener is not None:
+            self.listener.start()
+        self.stream.open()
+        # Re-initialising PortAudio invalidates the stream; reopen it after.
+        self.registry.add_refresh_listener(self.stream.close, after=self._reopen)
+        logging.info("LTC output: %s -> '%s' ch%d @ %s fps (latency %.1fms)",
+                     self.kind, self.device_name, self.stream.channel,
+                     self.fps, self.stream.latency * 1000.0)
+
+    def _reopen(self) -> None:
+        dev = self.registry.find(self.device_name, self.stream.device["host_api"],
+                                 output=True, index=self.stream.device["index"])
+        if dev is None:
+            logging.warning("LTC output device '%s' is gone", self.device_name)
+            return
+        self.stream.pa = self.registry.pa
+        self.stream.device = dev
+        try:
+            self.stream.open()
+        except OSError as exc:
+            logging.warning("Failed to reopen LTC output: %s", exc)
+
+    def get_stats(self) -> dict:
+        return {
+            "source": self.kind,
+            "device": self.device_name,
+            "frames_out": self.generator.frames_out,
+            "jumps": self.generator.jumps,
+            "underflows": self.stream.underflows,
+        }
+
+    def close(self) -> None:
+        self.registry.remove_refresh_listener(self.stream.close)
+        self.stream.close()
+        if self.listener is not None:
+            self.listener.close()
@@ -0,0 +1,287 @@
+"""Find the input devices and channels that carry LTC.
+
+Every input device is opened in turn for a short capture with all of its
+channels. The capture is checked for every channel at once with numpy:
+zero crossings with hysteresis, and the intervals between them must be
+the one-bit and half-bit periods of biphase-mark code at an LTC bit rate
+(80 bits per frame). Only channels that pass are handed to libltc, which
+confirms them by decoding frames. A 64-channel device costs one capture
+and well under a tenth of a second of analysis.
+
+Without numpy every channel with signal goes straight to libltc.
+
+Run as a script (or ``ltc_reader.py --scan``)::
+
+    python -m modules.ltc_scan --seconds 0.5
+    python -m modules.ltc_scan --host-api "Windows WASAPI" --write-config config.json
+"""
+import argparse
+import array
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+from modules.audio_sources import AudioSourceError, PyAudioSource
+from modules.decimation import numpy_available
+from modules.device_registry import get_registry
+from modules.ltc import LibLTC, find_libltc
+
+FRAME_RATES = (23.976, 24, 25, 29.97, 30)
+# Channels quieter than this (peak dBFS) are not analysed.
+MIN_LEVEL = -50.0
+# Share of crossing intervals that must be a bit or half-bit period.
+MIN_VALID = 0.9
+# Both interval lengths must occur: rules out steady tones.
+MIN_SHARE = 0.1
+
+
+def _db(value: float) -> float:
+    return 20.0 * math.log10(value / 32768.0) if value > 0 else -120.0
+
+
+def _match_rate(fps: float) -> float | None:
+    best = min(FRAME_RATES, key=lambda r: abs(r - fps))
+    return best if abs(best - fps) <= best * 0.03 else None
+
+
+def detect(block, sample_rate: int) -> list[dict]:
+    """Check every column of ``block`` (frames x channels, int16) for LTC.
+
+    Returns per channel ``{"channel", "level", "fps"}``; ``fps`` is the
+    measured frame rate, or None when the channel does not look like LTC.
+    """
+    import numpy as np
+
+    data = block.astype(np.int32)
+    data -= data.mean(axis=0, dtype=np.int64).astype(np.int32)
+    peak = np.abs(data).max(axis=0)
+    # Hysteresis at a quarter of each channel's peak: noise riding on the
+    # signal cannot add crossings.
+    band = np.maximum(peak // 4, 1)
+    signs = np.sign(data) * (np.abs(data) > band)
+    results = []
+    for channel in range(block.shape[1]):
+        level = _db(float(peak[channel]))
+        result = {"channel": channel, "level": round(level, 1), "fps": None}
+        results.append(result)
+        if level < MIN_LEVEL:
+            continue
+        column = signs[:, channel]
+        idx = np.flatnonzero(column)
+        flips = idx[1:][column[idx[1:]] != column[idx[:-1]]]
+        intervals = np.diff(flips)
+        if len(intervals) < 100:
+            continue
+        bit = float(np.percentile(intervals, 90))
+        long = np.abs(intervals - bit) <= bit * 0.25
+        short = np.abs(intervals - bit / 2) <= bit * 0.125
+        n_long, n_short = int(long.sum()), int(short.sum())
+        if (n_long + n_short < MIN_VALID * len(intervals)
+                or min(n_long, n_short) < MIN_SHARE * len(intervals)):
+            continue
+        # Average bit period over every valid interval.
+        period = float(intervals[long | short].sum()) / (n_long + n_short / 2)
+        result["fps"] = round(sample_rate / period / 80, 3)
+    return results
+
+
+def confirm(samples, sample_rate: int, fps: float) -> dict | None:
+    """Decode mono int16 ``samples`` with libltc; None if no frame decodes."""
+    decoder = LibLTC(find_libltc(), sample_rate, fps)
+    try:
+        decoder.write(samples)
+        frames = [(t.hours, t.mins, t.secs, t.frame, getattr(t, "drop_frame", False))
+                  for t in decoder.read()]
+    finally:
+        decoder.close()
+    if len(frames) < 2:
+        return None
+    hours, minutes, seconds, frame, drop_frame = frames[-1]
+    return {
+        "frames": len(frames),
+        "timecode": f"{hours:02d}:{minutes:02d}:{seconds:02d}{';' if drop_frame else ':'}{frame:02d}",
+        "drop_frame": drop_frame,
+    }
+
+
+def capture(dev: dict, seconds: float, sample_rate: int | None = None,
+            frames_per_buffer: int = 1024) -> tuple[bytes, int, int]:
+    """Record ``seconds`` of every input channel of ``dev``."""
+    rate = int(sample_rate or dev.get("default_sample_rate") or 48000)
+    channels = dev["max_input_channels"]
+    source = PyAudioSource(get_registry().pa, dev, rate, channels, frames_per_buffer)
+    source.open()
+    chunks = []
+    try:
+        wanted = int(seconds * rate)
+        got = 0
+        while got < wanted:
+            data = source.read()
+            chunks.append(data)
+            got += len(data) // (2 * channels)
+    finally:
+        source.close()
+    return b"".join(chunks), rate, channels
+
+
+def scan_device(dev: dict, seconds: float = 0.5, sample_rate: int | None = None) -> list[dict]:
+    """Return one entry per channel of ``dev`` that carries LTC."""
+    data, rate, channels = capture(dev, seconds, sample_rate)
+    if numpy_available():
+        import numpy as np
+
+        block = np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+        candidates = [r for r in detect(block, rate) if r["fps"] is not None]
+        columns = {r["channel"]: np.ascontiguousarray(block[:, r["channel"]])
+                   for r in candidates}
+    else:
+        samples = array.array("h")
+        samples.frombytes(data)
+        candidates, columns = [], {}
+        for channel in range(channels):
+            column = samples[channel::channels]
+            level = _db(float(max(map(abs, column), default=0)))
+            if level >= MIN_LEVEL:
+                candidates.append({"channel": channel, "level": round(level, 1), "fps": None})
+                columns[channel] = column
+    hits = []
+    for result in candidates:
+        guess = _match_rate(result["fps"]) if result["fps"] else 30.0
+        try:
+            confirmed = confirm(columns[result["channel"]], rate, guess or 30.0)
+        except FileNotFoundError:
+            confirmed = None  # no libltc: the detector's verdict stands
+            if result["fps"] is None:
+                continue
+        else:
+            if confirmed is None:
+                continue
+        fps = _match_rate(result["fps"]) if result["fps"] else None
+        if confirmed is not None and confirmed["drop_frame"]:
+            fps = 29.97
+        hits.append({
+            "device": dev["name"],
+            "host_api": dev["host_api"],
+            "index": dev["index"],
+            "sample_rate": rate,
+            "channel": result["channel"],
+            "fps": fps,
+            "measured_fps": result["fps"],
+            "level": result["level"],
+            "confirmed": confirmed is not None,
+            "timecode": confirmed["timecode"] if confirmed else None,
+            "drop_frame": bool(confirmed and confirmed["drop_frame"]),
+        })
+    return hits
+
+
+def scan(seconds: float = 0.5, host_api: str | None = None, name: str | None = None,
+         sample_rate: int | None = None) -> tuple[list[dict], list[dict]]:
+    """Scan every matching input device; return ``(hits, errors)``."""
+    hits, errors = [], []
+    for dev in get_registry().input_devices():
+        if host_api and dev["host_api"] != host_api:
+            continue
+        if name and name.lower() not in (dev["name"] or "").lower():
+            continue
+        started = time.perf_counter()
+        try:
+            found = scan_device(dev, seconds, sample_rate)
+        except (AudioSourceError, ValueError) as e:
+            errors.append({"device": dev["name"], "host_api": dev["host_api"],
+                           "index": dev["index"], "error": str(e)})
+            logging.debug("Scan of '%s' failed: %s", dev["name"], e)
+            continue
+        logging.debug("Scanned '%s' [%s] (%d ch) in %.0fms: %d LTC",
+                      dev["name"], dev["host_api"], dev["max_input_channels"],
+                      (time.perf_counter() - started) * 1000.0, len(found))
+        hits.extend(found)
+    hits.sort(key=lambda h: (not h["confirmed"], -h["level"]))
+    return hits, errors
+
+
+def write_config(path: str, hit: dict) -> dict:
+    """Point the single-input settings of ``path`` at ``hit``.
+
+    Raises ValueError if the config lists ``inputs`` or ``channels``: those
+    take precedence over the single-input keys and are left to the user.
+    """
+    config = {}
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as fh:
+            config = json.load(fh)
+    for key in ("inputs", "channels"):
+        if config.get(key):
+            raise ValueError(f"'{key}' is set in {path} and overrides the scanned "
+                             f"device; edit it by hand")
+    config.update(
+        audio_device_name=hit["device"],
+        audio_host_api=hit["host_api"],
+        audio_device_index=hit["index"],
+        channel=hit["channel"],
+        sample_rate=hit["sample_rate"],
+    )
+    if hit["fps"]:
+        config["fps"] = hit["fps"]
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(config, fh, indent=2, ensure_ascii=False)
+    return config
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Find the inputs that carry LTC")
+    parser.add_argument("--seconds", type=float, default=0.5,
+                        help="capture length per device (default 0.5)")
+    parser.add_argument("--host-api", help="only scan devices of this host API")
+    parser.add_argument("--device", help="only scan devices whose name contains this")
+    parser.add_argument("--sample-rate", type=int,
+                        help="capture rate (default: each device's default rate)")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--write-config", metavar="PATH",
+                        help="set device, channel and fps in this config file")
+    parser.add_argument("--pick", type=int, default=1,
+                        help="result number to write with --write-config (default 1)")
+    args = parser.parse_args(argv)
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    started = time.perf_counter()
+    try:
+        hits, errors = scan(args.seconds, args.host_api, args.device, args.sample_rate)
+    finally:
+        get_registry().terminate()
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({"hits": hits, "errors": errors, "seconds": round(elapsed, 2)},
+                         indent=2, ensure_ascii=False))
+    else:
+        for number, hit in enumerate(hits, 1):
+            fps = f"{hit['fps']:g}" if hit["fps"] else "?"
+            state = hit["timecode"] if hit["confirmed"] else "(not confirmed by libltc)"
+            print(f"{number:2d}: {hit['device']} [{hit['host_api']}] ch{hit['channel']} | "
+                  f"{fps} fps{' DF' if hit['drop_frame'] else ''} "
+                  f"(measured {hit['measured_fps']}) | {hit['level']:.1f} dBFS | {state}")
+        for error in errors:
+            print(f"    {error['device']} [{error['host_api']}]: {error['error']}")
+        print(f"{len(hits)} LTC input(s) found in {elapsed:.1f}s")
+
+    if args.write_config:
+        if not 1 <= args.pick <= len(hits):
+            print("Nothing to write", file=sys.stderr)
+            return 1
+        hit = hits[args.pick - 1]
+        try:
+            write_config(args.write_config, hit)
+        except ValueError as e:
+            print(f"Not written: {e}", file=sys.stderr)
+            return 1
+        print(f"{args.write_config}: {hit['device']} [{hit['host_api']}] ch{hit['channel']}")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
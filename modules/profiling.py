@@ -0,0 +1,191 @@
+"""On-demand instrumentation of the running decode loop.
+
+``StageTimers`` splits the time of every chunk into the stages of the
+loop. The loop and the decoders hold it in a ``profile`` attribute that is
+None unless timing was switched on over IPC, so the disabled cost is one
+attribute test per stage.
+
+``CProfileCapture`` and ``SamplingProfiler`` record a time-bounded profile
+of the live process into a file: the former with cProfile inside a decode
+loop thread (cProfile only sees the thread it is enabled in), the latter by
+sampling the stacks of every thread from a background thread.
+"""
+import cProfile
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+
+# In loop order; "other" is status and timeout handling, stats and ticks.
+STAGES = ("read", "deinterleave", "decimate", "decode_write", "decode_read",
+          "offset", "send", "other")
+
+
+class StageTimers:
+    """Accumulate wall time per loop stage for one capture thread.
+
+    ``begin`` starts a chunk; each ``mark(stage)`` charges the time since
+    the previous mark to ``stage``. Only the loop thread calls these;
+    ``get_stats`` may be called from any thread.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # Every key exists up front so readers never see the dict resize.
+        self.total = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.max = dict.fromkeys(STAGES, 0.0)
+        self.chunks = 0
+        self._last = self.started
+
+    def begin(self) -> None:
+        self._last = time.perf_counter()
+        self.chunks += 1
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.total[stage] += elapsed
+        self.calls[stage] += 1
+        if elapsed > self.max[stage]:
+            self.max[stage] = elapsed
+
+    def get_stats(self) -> dict:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        stages = {}
+        for stage in STAGES:
+            calls = self.calls[stage]
+            if not calls:
+                continue
+            total = self.total[stage]
+            stages[stage] = {
+                "calls": calls,
+                "total_ms": round(total * 1000.0, 3),
+                "mean_us": round(total * 1e6 / calls, 2),
+                "max_us": round(self.max[stage] * 1e6, 1),
+                "pct": round(total * 100.0 / elapsed, 3),
+            }
+        return {"seconds": round(elapsed, 3), "chunks": self.chunks, "stages": stages}
+
+
+class CProfileCapture:
+    """cProfile the thread that calls ``poll`` for ``seconds``.
+
+    The loop calls ``poll`` once per chunk; it returns False once the
+    profile has been written to ``path`` (pstats format). A loop that ends
+    before the deadline calls ``stop`` to write what was recorded so far;
+    like ``poll`` it must run in the profiled thread.
+    """
+
+    def __init__(self, seconds: float, path: str):
+        self.seconds = seconds
+        self.path = path
+        self.profiler = None
+        self.started = None
+        self.deadline = None
+
+    def poll(self) -> bool:
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.started = time.perf_counter()
+            self.deadline = self.started + self.seconds
+            self.profiler.enable()
+            return True
+        if time.perf_counter() < self.deadline:
+            return True
+        self.stop()
+        return False
+
+    def stop(self) -> None:
+        """Stop profiling and write the profile; no-op if not running."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+        profiler.disable()
+        elapsed = time.perf_counter() - self.started
+        try:
+            profiler.dump_stats(self.path)
+            logging.info("cProfile written to %s (%.1fs)", self.path, elapsed)
+        except OSError as e:
+            logging.error("Failed to write profile %s: %s", self.path, e)
+
+
+class SamplingProfiler:
+    """Sample the stacks of all threads every ``interval`` for ``seconds``.
+
+    Writes collapsed stacks (``thread;outer;...;inner count`` per line),
+    the input format of flamegraph.pl and speedscope, and logs the
+    functions seen most often on top of a stack.
+    """
+
+    def __init__(self, seconds: float, path: str, interval: float = 0.001):
+        self.seconds = seconds
+        self.path = path
+        self.interval = interval
+        self.samples = 0
+        self.thread = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        stacks = collections.Counter()
+        deadline = time.perf_counter() + self.seconds
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():  # noqa: W0212
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                                 f":{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+        self._write(stacks)
+
+    def _write(self, stacks: collections.Counter) -> None:
+        try:
+            with open(self.path, "w", encoding="utf-8") as fh:
+                for stack, count in stacks.most_common():
+                    fh.write(f"{stack} {count}\n")
+        except OSError as e:
+            logging.error("Failed to write profile %s: %s", self.path, e)
+            return
+        leaves = collections.Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        logging.info("Sampling profile written to %s (%d samples); top: %s",
+                     self.path, self.samples,
+                     ", ".join(f"{name} {count * 100.0 / total:.0f}%"
+                               for name, count in leaves.most_common(5)))
+
+
+def profile_path(mode: str, name: str | None = None) -> str:
+    """Absolute path of a profile file in the working directory.
+
+    ``name`` defaults to ``profile-<pid>-<time>.prof`` (cprofile) or
+    ``.txt`` (sample). It comes from IPC clients and must be a bare file
+    name, so a request cannot write outside that directory.
+    """
+    if name is None:
+        suffix = "prof" if mode == "cprofile" else "txt"
+        name = f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.{suffix}"
+    elif not name or name in (".", "..") or os.path.basename(name) != name:
+        raise ValueError(f"profile name must be a file name without a directory: {name!r}")
+    return os.path.abspath(name)
@@ -0,0 +1,215 @@
+"""Main/backup LTC failover.
+
+Several decoded channels carrying the same timecode feed one
+``RedundancySelector``, which forwards a single continuous frame stream
+from the active source. When the active source stops delivering the next
+frame while another healthy source already has it, or jumps while another
+source carries on, the selector switches and fills the gap from the new
+source, so the output neither stops nor jumps when one cable fails.
+"""
+import threading
+import time
+
+from modules.ltc_encoder import frames_to_timecode, timecode_to_frames
+
+
+class SourceHealth:
+    """Continuity and level tracking for one redundant input."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.last_count = None
+        self.last_time = None
+        self.streak = 0       # consecutive frames that followed on
+        self.jumps = 0
+        self.volume = None    # dBFS of the last frame, when known
+
+    def update(self, count: int, now: float, volume: float | None) -> None:
+        if self.last_count is not None and count == self.last_count + 1:
+            self.streak += 1
+        else:
+            if self.last_count is not None:
+                self.jumps += 1
+            self.streak = 1
+        self.last_count = count
+        self.last_time = now
+        self.volume = volume
+
+    def healthy(self, now: float, max_age: float, min_streak: int,
+                min_volume: float | None) -> bool:
+        if self.last_time is None or now - self.last_time > max_age:
+            return False
+        if self.streak < min_streak:
+            return False
+        if min_volume is not None and self.volume is not None and self.volume < min_volume:
+            return False
+        return True
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "last_count": self.last_count,
+            "streak": self.streak,
+            "jumps": self.jumps,
+            "volume": self.volume,
+        }
+
+
+class RedundancySelector:
+    """Pick one of several redundant timecode sources frame by frame.
+
+    ``on_frame(hours, minutes, seconds, frames)`` receives the output
+    stream; ``on_switch(old_name, new_name, reason)`` is called on every
+    switchover. ``frame`` and ``tick`` may be called from different
+    capture threads. ``grace`` (in frames) is how long the active source
+    may lag behind a backup, or how long an unconfirmed jump is held,
+    before the selector acts.
+    """
+
+    def __init__(self, names, fps: float, on_frame, on_switch=None,
+                 drop_frame: bool = False, grace: float = 0.5,
+                 min_streak: int = 3, min_volume: float | None = None):
+        self.sources = [SourceHealth(name) for name in names]
+        self.fps = fps
+        self.drop_frame = drop_frame
+        self.on_frame = on_frame
+        self.on_switch = on_switch
+        self.frame_period = 1.0 / fps
+        self.grace = grace * self.frame_period
+        self.min_streak = min_streak
+        self.min_volume = min_volume
+        self.active = None
+        self.switches = 0
+        self._expected = None
+        self._pending_jump = None  # (count, time) of an unconfirmed jump
+        self._lock = threading.Lock()
+
+    def frame(self, index: int, hours: int, minutes: int, seconds: int, frames: int,
+              volume: float | None = None, now: float | None = None) -> None:
+        """Report a frame decoded by source ``index``."""
+        now = time.monotonic() if now is None else now
+        count = timecode_to_frames(hours, minutes, seconds, frames,
+                                   self.fps, self.drop_frame)
+        with self._lock:
+            self.sources[index].update(count, now, volume)
+            if self.active is None:
+                self._switch(index, "start")
+                self._emit(count)
+            elif index == self.active:
+                self._on_active_frame(count, now)
+            else:
+                self._on_backup_frame(index, count)
+
+    def _on_active_frame(self, count: int, now: float) -> None:
+        expected = self._expected
+        if count == expected:
+            self._pending_jump = None
+            self._emit(count)
+            return
+        if count == expected - 1:
+            return  # repeated frame
+        if self._continuous_backup(now) is not None:
+            # Another source carries on: hold the jump until it either
+            # confirms it (locate) or delivers the expected frame.
+            self._pending_jump = (count, now)
+            self._try_backup("jump", now)
+        else:
+            self._emit(count)
+
+    def _on_backup_frame(self, index: int, count: int) -> None:
+        if self._pending_jump is not None:
+            if count == self._pending_jump[0]:
+                # Both sources jumped: a real locate, follow it.
+                self._pending_jump = None
+                self._emit(count)
+            elif self._continues(count):
+                self._switch(index, "jump")
+                self._pending_jump = None
+                self._catch_up(index)
+
+    def tick(self, now: float | None = None) -> None:
+        """Detect a stalled active source; call after every capture chunk."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.active is None:
+                return
+            if self._pending_jump is not None:
+                count, since = self._pending_jump
+                if now - since > self.grace:
+                    self._pending_jump = None
+                    self._emit(count)
+                return
+            active = self.sources[self.active]
+            if active.last_count is not None and active.last_count >= self._expected:
+                return
+            stalled = now - active.last_time > self.frame_period + self.grace
+            for i in self._by_preference():
+                source = self.sources[i]
+                # Only a backup that delivered the frame the active one
+                # owes can take over: one that stopped too (a normal stop)
+                # or jumped on its own must not.
+                if (not self._continues(source.last_count)
+                        or not source.healthy(now, 1.5 * self.frame_period,
+                                              self.min_streak, self.min_volume)):
+                    continue
+                ahead = now - source.last_time > self.grace
+                if ahead or stalled:
+                    self._switch(i, "dropout")
+                    self._catch_up(i)
+                    return
+
+    def _continuous_backup(self, now: float):
+        for i in self._by_preference():
+            source = self.sources[i]
+            if (source.last_count is not None
+                    and source.last_count >= self._expected - 1
+                    and source.healthy(now, 1.5 * self.frame_period,
+                                       self.min_streak, self.min_volume)):
+                return i
+        return None
+
+    def _try_backup(self, reason: str, now: float) -> None:
+        i = self._continuous_backup(now)
+        if i is not None and self._continues(self.sources[i].last_count):
+            self._switch(i, reason)
+            self._pending_jump = None
+            self._catch_up(i)
+
+    def _by_preference(self):
+        return [i for i in range(len(self.sources)) if i != self.active]
+
+    def _continues(self, count: int | None) -> bool:
+        """Whether ``count`` is the next output frame, or the one after it."""
+        return count is not None and self._expected <= count <= self._expected + 1
+
+    def _catch_up(self, index: int) -> None:
+        """Emit the frames the new source has that the output has not.
+
+        Callers only switch to a source that continues the output, so a
+        count that disagrees with it is never emitted here.
+        """
+        last = self.sources[index].last_count
+        if not self._continues(last):
+            return
+        for count in range(self._expected, last + 1):
+            self._emit(count)
+
+    def _emit(self, count: int) -> None:
+        self._expected = count + 1
+        self.on_frame(*frames_to_timecode(count, self.fps, self.drop_frame))
+
+    def _switch(self, index: int, reason: str) -> None:
+        old = None if self.active is None else self.sources[self.active].name
+        self.active = index
+        if old is not None:
+            self.switches += 1
+        if self.on_switch is not None:
+            self.on_switch(old, self.sources[index].name, reason)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                "active": None if self.active is None else self.sources[self.active].name,
+                "switches": self.switches,
+                "sources": [s.as_dict() for s in self.sources],
+            }
@@ -0,0 +1,215 @@
+"""Interleaved 16-bit PCM ring buffer in ``multiprocessing.shared_memory``.
+
+One process writes (the capture process), any number of processes or
+threads read with their own ``RingReader`` cursor. The writer never waits:
+a reader that falls more than the ring's capacity behind loses the
+overwritten audio and counts an overrun.
+
+Two 64-bit frame counts are shared for synchronisation: ``write_seq``,
+the end of the chunk the writer is about to overwrite, stored before the
+samples, and ``write_pos``, stored after the samples it covers. Readers
+read each twice and retry until both reads agree, so a torn 8-byte access
+can never be mistaken for progress. They wait for ``write_pos``; after
+copying, they check ``write_seq`` so a chunk the writer moved into while
+it was being copied is discarded rather than returned torn.
+"""
+import struct
+import time
+from multiprocessing import shared_memory
+
+MAGIC = b"LTCR"
+VERSION = 2
+
+STATE_STARTING = 0
+STATE_RUNNING = 1
+STATE_LOST = 2
+STATE_FAILED = 3
+STATE_STOPPED = 4
+STATE_NAMES = ("starting", "running", "lost", "failed", "stopped")
+
+# magic, version, sample_rate, num_channels, capacity (frames)
+_FORMAT = struct.Struct("<4sIIIQ")
+_WRITE_POS = struct.Struct("<Q")        # offset 24
+_COUNTERS = struct.Struct("<QII")       # overflows, state, reconnects; offset 32
+_TIMES = struct.Struct("<dd")           # latency, heartbeat (monotonic); offset 48
+_TEXT = 128                             # device name and error message
+_WRITE_POS_AT = 24
+_COUNTERS_AT = 32
+_TIMES_AT = 48
+_NAME_AT = 64
+_ERROR_AT = _NAME_AT + _TEXT
+_WRITE_SEQ_AT = _ERROR_AT + _TEXT
+HEADER_SIZE = _WRITE_SEQ_AT + 8
+
+
+class PcmRing:
+    """Shared PCM ring; ``create`` in the owner, ``attach`` elsewhere."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf
+        magic, version, self.sample_rate, self.num_channels, self.capacity = \
+            _FORMAT.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{shm.name} is not a PCM ring")
+        self.frame_bytes = 2 * self.num_channels
+        self.data = buf[HEADER_SIZE:HEADER_SIZE + self.capacity * self.frame_bytes]
+        self._write_pos = self.write_pos()
+
+    @classmethod
+    def create(cls, sample_rate: int, num_channels: int, seconds: float = 2.0) -> "PcmRing":
+        capacity = max(int(sample_rate * seconds), 1024)
+        shm = shared_memory.SharedMemory(
+            create=True, size=HEADER_SIZE + capacity * 2 * num_channels)
+        shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+        _FORMAT.pack_into(shm.buf, 0, MAGIC, VERSION, sample_rate, num_channels, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "PcmRing":
+        # Meant for child processes: they share the creator's resource
+        # tracker, so attaching does not make them unlink the segment.
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # --- writer side -------------------------------------------------------
+
+    def write(self, data) -> None:
+        """Append one chunk of interleaved frames (never blocks)."""
+        size = len(data)
+        frames = size // self.frame_bytes
+        # Announced before the first sample is overwritten.
+        _WRITE_POS.pack_into(self.shm.buf, _WRITE_SEQ_AT, self._write_pos + frames)
+        start = (self._write_pos % self.capacity) * self.frame_bytes
+        end = start + size
+        if end <= len(self.data):
+            self.data[start:end] = data
+        else:
+            first = len(self.data) - start
+            view = memoryview(data)
+            self.data[start:] = view[:first]
+            self.data[:size - first] = view[first:]
+        self._write_pos += frames
+        # Published only after the samples are in place.
+        _WRITE_POS.pack_into(self.shm.buf, _WRITE_POS_AT, self._write_pos)
+        _TIMES.pack_into(self.shm.buf, _TIMES_AT, self.latency, time.monotonic())
+
+    def set_state(self, state: int, overflows: int = 0, reconnects: int = 0,
+                  error: str = "") -> None:
+        _COUNTERS.pack_into(self.shm.buf, _COUNTERS_AT, overflows, state, reconnects)
+        if error:
+            self._put_text(_ERROR_AT, error)
+
+    def set_device(self, name: str, latency: float | None) -> None:
+        self._put_text(_NAME_AT, name)
+        _TIMES.pack_into(self.shm.buf, _TIMES_AT, latency or 0.0, time.monotonic())
+
+    def _put_text(self, offset: int, text: str) -> None:
+        raw = text.encode("utf-8")[:_TEXT - 1]
+        self.shm.buf[offset:offset + _TEXT] = raw + bytes(_TEXT - len(raw))
+
+    # --- shared ------------------------------------------------------------
+
+    def write_pos(self) -> int:
+        """Frames written so far."""
+        return self._read_count(_WRITE_POS_AT)
+
+    def write_seq(self) -> int:
+        """Frames written so far plus the chunk being written, if any."""
+        return self._read_count(_WRITE_SEQ_AT)
+
+    def _read_count(self, offset: int) -> int:
+        buf = self.shm.buf
+        while True:
+            first = _WRITE_POS.unpack_from(buf, offset)[0]
+            if _WRITE_POS.unpack_from(buf, offset)[0] == first:
+                return first
+
+    def counters(self) -> tuple[int, int, int]:
+        """``(overflows, state, reconnects)`` as last published by the writer."""
+        return _COUNTERS.unpack_from(self.shm.buf, _COUNTERS_AT)
+
+    @property
+    def latency(self) -> float:
+        return _TIMES.unpack_from(self.shm.buf, _TIMES_AT)[0]
+
+    @property
+    def heartbeat(self) -> float:
+        return _TIMES.unpack_from(self.shm.buf, _TIMES_AT)[1]
+
+    def _get_text(self, offset: int) -> str:
+        raw = bytes(self.shm.buf[offset:offset + _TEXT])
+        return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+    @property
+    def device_name(self) -> str:
+        return self._get_text(_NAME_AT)
+
+    @property
+    def error(self) -> str:
+        return self._get_text(_ERROR_AT)
+
+    def close(self) -> None:
+        self.data.release()
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class RingReader:
+    """Independent read cursor, starting at the newest audio."""
+
+    def __init__(self, ring: PcmRing, poll_interval: float = 0.001):
+        self.ring = ring
+        self.poll_interval = poll_interval
+        self.pos = ring.write_pos()
+        self.overruns = 0  # frames lost because the writer lapped us
+
+    def available(self) -> int:
+        return self.ring.write_pos() - self.pos
+
+    def read(self, frames: int, timeout: float) -> bytes | None:
+        """Return the next ``frames`` frames, or None after ``timeout`` seconds."""
+        ring = self.ring
+        deadline = None
+        while True:
+            write_pos = ring.write_pos()
+            if write_pos - self.pos >= frames:
+                break
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + timeout
+            elif now >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+        while True:
+            if write_pos - self.pos > ring.capacity:
+                # Lapped: skip to the newest chunk.
+                skipped = write_pos - frames - self.pos
+                self.overruns += skipped
+                self.pos += skipped
+            data = self._copy(self.pos, frames)
+            # The first frame copied is the first overwritten; if the
+            # writer has started on its slot the copy may be torn.
+            if ring.write_seq() - self.pos <= ring.capacity:
+                self.pos += frames
+                return data
+            # Overwritten while copying; try again, skipping to the newest
+            # audio once the writer has lapped us.
+            write_pos = ring.write_pos()
+
+    def _copy(self, pos: int, frames: int) -> bytes:
+        ring = self.ring
+        start = (pos % ring.capacity) * ring.frame_bytes
+        end = start + frames * ring.frame_bytes
+        if end <= len(ring.data):
+            return bytes(ring.data[start:end])
+        return bytes(ring.data[start:]) + bytes(ring.data[:end - len(ring.data)])
@@ -0,0 +1,215 @@
+"""UDP request/response service answering "what is the timecode now?".
+
+The decode loop publishes every decoded frame into a ``TimecodeSnapshot``
+together with the time the frame started, derived from its sample
+position by a ``SampleClock``. A query thread answers each datagram by
+extrapolating the latest snapshot to the moment of the request, so the
+reply carries the current frame and its elapsed fraction, not the frame
+that was decoded last. Snapshots are published by a single attribute
+swap; queries never take a lock or wait for the audio thread.
+
+Protocol (ASCII, one datagram each way)::
+
+    request:  [<osc address> [<token>]]
+    reply:    <osc address> HH:MM:SS:FF <fraction> <running|stopped|nosignal> [<token>]
+
+An empty request asks for the first input. The token is echoed back so
+clients can match replies to requests. Run as a script to query a bridge
+and measure the round trip::
+
+    python -m modules.timecode_query --port 9100 --count 1000
+"""
+import argparse
+import logging
+import socket
+import sys
+import threading
+import time
+
+from modules.ltc_encoder import frames_to_timecode, timecode_to_frames
+
+MAX_REQUEST = 256
+
+
+class SampleClock:
+    """Map sample positions of a capture stream to ``time.monotonic()``.
+
+    Chunks arrive with scheduling jitter but never early, so the arrival
+    time minus the stream position gives an upper bound of the time the
+    stream started. The lowest bound seen is kept and allowed to creep up
+    by ``creep`` seconds per chunk, which follows the drift between the
+    audio clock and the system clock. Gaps (device reconnects) longer than
+    ``reset`` seconds restart the estimate.
+    """
+
+    def __init__(self, sample_rate: int, latency: float | None = None,
+                 creep: float = 20e-6, reset: float = 0.05):
+        self.sample_rate = sample_rate
+        self.latency = latency or 0.0
+        self.creep = creep
+        self.reset = reset
+        self.origin = None
+
+    def update(self, position: int, now: float) -> None:
+        """Record that samples up to ``position`` had arrived at ``now``."""
+        candidate = now - position / self.sample_rate
+        if self.origin is None or candidate - self.origin > self.reset:
+            self.origin = candidate
+        else:
+            self.origin = min(candidate, self.origin + self.creep)
+
+    def time_of(self, position: float) -> float | None:
+        """Return the monotonic time at which sample ``position`` was captured."""
+        if self.origin is None:
+            return None
+        return self.origin + position / self.sample_rate - self.latency
+
+
+class TimecodeSnapshot:
+    """Latest decoded frame of one output, extrapolated on request.
+
+    ``publish`` is called by the decode loop, ``query`` from any thread.
+    After ``max_age`` seconds without a frame the timecode is reported as
+    stopped at the last frame.
+    """
+
+    def __init__(self, fps: float, drop_frame: bool = False, max_age: float = 0.5):
+        self.fps = fps
+        self.drop_frame = drop_frame
+        self.max_age = max_age
+        self._ref = None  # (frame number, monotonic time the frame started)
+
+    def publish(self, hours: int, minutes: int, seconds: int, frames: int,
+                started: float) -> None:
+        count = timecode_to_frames(hours, minutes, seconds, frames,
+                                   self.fps, self.drop_frame)
+        self._ref = (count, started)
+
+    def query(self, now: float | None = None):
+        """Return ``(hours, minutes, seconds, frames, fraction, state)`` or None."""
+        ref = self._ref
+        if ref is None:
+            return None
+        count, started = ref
+        elapsed = (time.monotonic() if now is None else now) - started
+        if elapsed > self.max_age:
+            return frames_to_timecode(count, self.fps, self.drop_frame) + (0.0, "stopped")
+        position = count + max(elapsed, 0.0) * self.fps
+        whole = int(position)
+        return (frames_to_timecode(whole, self.fps, self.drop_frame)
+                + (position - whole, "running"))
+
+
+class TimecodeQueryServer:
+    """Answer timecode queries on a UDP port from a dedicated thread.
+
+    ``snapshots`` maps OSC addresses to ``TimecodeSnapshot`` objects; the
+    first one answers empty requests.
+    """
+
+    def __init__(self, snapshots: dict, port: int = 9100, ip: str = "0.0.0.0"):
+        self.snapshots = dict(snapshots)
+        self.default = next(iter(self.snapshots))
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((ip, port))
+        self.port = self.sock.getsockname()[1]
+        self.requests = 0
+        self.errors = 0
+        self._running = False
+        self.thread = None
+
+    def answer(self, request: bytes) -> bytes:
+        parts = request.decode("ascii", "replace").split(None, 1)
+        address = parts[0] if parts else self.default
+        token = f" {parts[1].strip()}" if len(parts) > 1 else ""
+        snapshot = self.snapshots.get(address)
+        if snapshot is None:
+            self.errors += 1
+            return f"{address} error unknown-address{token}".encode("ascii", "replace")
+        result = snapshot.query()
+        if result is None:
+            return f"{address} --:--:--:-- 0.000 nosignal{token}".encode("ascii", "replace")
+        hours, minutes, seconds, frames, fraction, state = result
+        return (f"{address} {hours:02d}:{minutes:02d}:{seconds:02d}:{frames:02d} "
+                f"{fraction:.3f} {state}{token}").encode("ascii", "replace")
+
+    def _serve(self) -> None:
+        sock = self.sock
+        while self._running:
+            try:
+                request, client = sock.recvfrom(MAX_REQUEST)
+                if not self._running:
+                    break
+                sock.sendto(self.answer(request), client)
+                self.requests += 1
+            except OSError as e:
+                if self._running:
+                    logging.debug("Timecode query error: %s", e)
+
+    def start(self) -> None:
+        self._running = True
+        self.thread = threading.Thread(
+            target=self._serve, name="timecode-query", daemon=True)
+        self.thread.start()
+        logging.info("Timecode query server on UDP port %d (%s)",
+                     self.port, ", ".join(self.snapshots))
+
+    def get_stats(self) -> dict:
+        return {
+            "port": self.port,
+            "requests": self.requests,
+            "errors": self.errors,
+            "addresses": list(self.snapshots),
+        }
+
+    def close(self) -> None:
+        if self.thread is not None:
+            self._running = False
+            # Wake the blocking recvfrom.
+            try:
+                self.sock.sendto(b"", ("127.0.0.1", self.port))
+            except OSError:
+                pass
+            self.thread.join(timeout=1)
+            self.thread = None
+        self.sock.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query the bridge's timecode over UDP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--address", default="", help="OSC address of the input")
+    parser.add_argument("--count", type=int, default=1,
+                        help="number of queries; more than one prints round-trip times")
+    parser.add_argument("--timeout", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(args.timeout)
+    sock.connect((args.host, args.port))
+    rtts = []
+    reply = b""
+    for i in range(args.count):
+        # A token needs an address in front of it.
+        request = f"{args.address} {i}" if args.address else ""
+        started = time.perf_counter()
+        try:
+            sock.send(request.encode("ascii"))
+            reply = sock.recv(MAX_REQUEST)
+        except socket.timeout:
+            print(f"No reply from {args.host}:{args.port}", file=sys.stderr)
+            return 1
+        rtts.append(time.perf_counter() - started)
+    print(reply.decode("ascii", "replace"))
+    if len(rtts) > 1:
+        rtts.sort()
+        total = sum(rtts)
+        print(f"{len(rtts)} queries in {total * 1000:.1f}ms ({len(rtts) / total:.0f}/s), "
+              f"round trip median {rtts[len(rtts) // 2] * 1e6:.0f}us, "
+              f"p99 {rtts[int(len(rtts) * 0.99)] * 1e6:.0f}us, max {rtts[-1] * 1e6:.0f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
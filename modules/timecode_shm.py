@@ -0,0 +1,337 @@
+"""Latest timecode in shared memory for consumers on the same host.
+
+The bridge keeps one fixed-layout slot per output address in a named
+shared memory block and overwrites it in place with every decoded frame.
+Readers map the block and read a slot with plain memory loads, no socket
+and no system call per read. Each slot is protected by a seqlock: the
+writer makes the slot's sequence number odd, writes the fields and makes
+it even again; a reader retries until it reads the same even number before
+and after copying the fields.
+
+This file depends on the standard library only and can be copied into
+another project (TouchDesigner, a media server's Python) to read the
+block; ``TimecodeReader`` is the reference reader. Run as a script to
+print the slots and measure the read cost::
+
+    python -m modules.timecode_shm --name ltc_osc_bridge --watch
+
+Layout (little endian; all slots ``SLOT_SIZE`` bytes, the first at
+``HEADER_SIZE``)::
+
+    header  0  char[4] magic "LTCT"      slot   0  u64   sequence (odd while written)
+            4  u32     layout version           8  u8[4] hours, minutes, seconds, frames
+            8  u32     slot count              12  u8    status (0 no signal, 1 running, 2 stopped)
+           12  u32     slot size               13  u8    drop frame
+           16  u32     writer pid              14  u16   reserved
+                                               16  f64   frame rate
+                                               24  u32   frame number since 00:00:00:00
+                                               28  u32   frames published
+                                               32  i64   sample position of the frame start
+                                               40  f64   frame start (monotonic seconds)
+                                               48  f64   time of this update (monotonic seconds)
+                                               64  char[64] OSC address, NUL padded
+
+Times are on the clock of Python's ``time.monotonic()`` in the bridge
+process. The sample position counts device samples since the input was
+opened and starts again after a reconnect. The writer is a Python process
+and issues no memory barriers; readers in C should load the sequence
+number with acquire semantics.
+"""
+import argparse
+import collections
+import os
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+MAGIC = b"LTCT"
+VERSION = 1
+HEADER_SIZE = 64
+SLOT_SIZE = 128
+DEFAULT_NAME = "ltc_osc_bridge"
+# Reads give up after this many torn copies (writer killed mid-update).
+MAX_RETRIES = 10000
+
+STATUS_NOSIGNAL = 0
+STATUS_RUNNING = 1
+STATUS_STOPPED = 2
+STATUS_NAMES = ("nosignal", "running", "stopped")
+
+_HEADER = struct.Struct("<4sIIII")
+_SEQ = struct.Struct("<Q")
+_FIELDS = struct.Struct("<BBBBBBxxdIIqdd")  # offset 8 of a slot
+_ADDRESS_AT = 64
+
+Timecode = collections.namedtuple(
+    "Timecode", "address hours minutes seconds frames status drop_frame fps "
+                "frame_number updates position frame_time updated")
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """Keep this process's resource tracker from deleting a block it attached to."""
+    if os.name != "nt":
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: W0212
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows.
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5  # access denied: it exists
+        try:
+            code = wintypes.DWORD()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class TimecodeSlot:
+    """Writer side of one slot.
+
+    A seqlock allows a single writer; the lock serialises the frame and the
+    stop timeout of a redundancy group, which may come from two threads.
+    """
+
+    def __init__(self, buf, offset: int, fps: float, drop_frame: bool):
+        self.buf = buf
+        self.offset = offset
+        self.fps = fps
+        self.drop_frame = drop_frame
+        self.seq = 0
+        self.updates = 0
+        self.status = STATUS_NOSIGNAL
+        self._last = (0, 0, 0, 0, 0, 0, 0.0)
+        self._lock = threading.Lock()
+
+    def _write(self) -> None:
+        hours, minutes, seconds, frames, number, position, started = self._last
+        buf, offset = self.buf, self.offset
+        self.seq += 1
+        _SEQ.pack_into(buf, offset, self.seq)
+        _FIELDS.pack_into(buf, offset + 8, hours, minutes, seconds, frames, self.status,
+                          self.drop_frame, self.fps, number, self.updates, position,
+                          started, time.monotonic())
+        self.seq += 1
+        _SEQ.pack_into(buf, offset, self.seq)
+
+    def publish(self, hours: int, minutes: int, seconds: int, frames: int,
+                number: int, position: int | None, started: float) -> None:
+        with self._lock:
+            self.updates += 1
+            self.status = STATUS_RUNNING
+            self._last = (hours, minutes, seconds, frames, number,
+                          -1 if position is None else position, started)
+            self._write()
+
+    def set_status(self, running: bool) -> None:
+        status = STATUS_RUNNING if running else STATUS_STOPPED
+        with self._lock:
+            if status != self.status:
+                self.status = status
+                self._write()
+
+
+class TimecodeSharedMemory:
+    """The bridge's shared memory block with one slot per OSC address."""
+
+    def __init__(self, addresses: list[str], fps: float, drop_frame: bool = False,
+                 name: str = DEFAULT_NAME):
+        size = HEADER_SIZE + SLOT_SIZE * len(addresses)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self.shm = self._take_over(name, size, len(addresses))
+        buf = self.shm.buf
+        buf[:size] = bytes(size)
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, len(addresses), SLOT_SIZE, os.getpid())
+        self.slots = {}
+        for i, address in enumerate(addresses):
+            offset = HEADER_SIZE + i * SLOT_SIZE
+            raw = address.encode("utf-8")[:63]
+            buf[offset + _ADDRESS_AT:offset + _ADDRESS_AT + len(raw)] = raw
+            self.slots[address] = TimecodeSlot(buf, offset, fps, drop_frame)
+            self.slots[address]._write()
+
+    @staticmethod
+    def _take_over(name: str, size: int, count: int) -> shared_memory.SharedMemory:
+        """Reuse a block left behind by a bridge that exited or crashed.
+
+        The block is in use while its writer pid is alive. Otherwise a
+        block with the same layout is written in place, so readers that
+        still map it follow the new bridge. On Windows that is the only
+        way: the name lives as long as any reader holds the mapping and
+        cannot be unlinked. Elsewhere a block of another layout is
+        replaced.
+        """
+        old = shared_memory.SharedMemory(name=name)
+        magic, version, old_count, slot_size, pid = _HEADER.unpack_from(old.buf, 0)
+        if magic == MAGIC and pid != os.getpid() and _pid_alive(pid):
+            _untrack(old)
+            old.close()
+            raise FileExistsError(f"shared memory '{name}' is in use by pid {pid}")
+        if ((magic, version, old_count, slot_size) == (MAGIC, VERSION, count, SLOT_SIZE)
+                and old.size >= size):
+            return old
+        if os.name == "nt":
+            old.close()
+            raise FileExistsError(
+                f"shared memory '{name}' has another layout and is still open in a reader")
+        old.close()
+        old.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def get_stats(self) -> dict:
+        return {"name": self.name, "size": self.shm.size,
+                "slots": {a: s.updates for a, s in self.slots.items()}}
+
+    def close(self) -> None:
+        # Readers still mapping the block see writer pid 0.
+        _HEADER.pack_into(self.shm.buf, 0, MAGIC, VERSION, len(self.slots), SLOT_SIZE, 0)
+        for slot in self.slots.values():
+            slot.buf = None
+        self.slots = {}
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class TimecodeReader:
+    """Reference reader: map the bridge's block and read slots lock-free.
+
+    ``read(address)`` returns a ``Timecode`` (``address`` None for the
+    first slot), or None for an unknown address or a slot that stays torn.
+    Once ``alive`` is False the bridge has closed the block; open a new
+    reader to follow a restarted bridge.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13
+            shm = shared_memory.SharedMemory(name=name)
+            _untrack(shm)
+        self.shm = shm
+        magic, version, count, slot_size, self.writer_pid = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            shm.close()
+            raise ValueError(f"'{name}' is not a timecode block (version {version})")
+        self.buf = shm.buf
+        self.offsets = {}
+        for i in range(count):
+            offset = HEADER_SIZE + i * slot_size
+            raw = bytes(self.buf[offset + _ADDRESS_AT:offset + SLOT_SIZE])
+            self.offsets[raw.split(b"\0", 1)[0].decode("utf-8", "replace")] = offset
+        self.first = next(iter(self.offsets), None)
+        self.retries = 0
+
+    @property
+    def alive(self) -> bool:
+        return _HEADER.unpack_from(self.buf, 0)[4] != 0
+
+    @property
+    def addresses(self) -> list[str]:
+        return list(self.offsets)
+
+    def read(self, address: str | None = None) -> Timecode | None:
+        address = address or self.first
+        offset = self.offsets.get(address)
+        if offset is None:
+            return None
+        buf = self.buf
+        for _ in range(MAX_RETRIES):
+            before = _SEQ.unpack_from(buf, offset)[0]
+            if not before & 1:
+                fields = _FIELDS.unpack_from(buf, offset + 8)
+                if _SEQ.unpack_from(buf, offset)[0] == before:
+                    break
+            self.retries += 1
+        else:
+            return None
+        return Timecode(address, *fields[:5], bool(fields[5]), *fields[6:])
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+
+
+def format_timecode(tc: Timecode) -> str:
+    sep = ";" if tc.drop_frame else ":"
+    age = time.monotonic() - tc.frame_time if tc.frame_time else None
+    return (f"{tc.address} {tc.hours:02d}:{tc.minutes:02d}:{tc.seconds:02d}{sep}{tc.frames:02d} "
+            f"{STATUS_NAMES[tc.status]} @{tc.fps:g} frame {tc.frame_number} "
+            f"pos {tc.position} "
+            + (f"age {age * 1000:.1f}ms" if age is not None else ""))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Read the bridge's shared memory timecode")
+    parser.add_argument("--name", default=DEFAULT_NAME)
+    parser.add_argument("--address", help="OSC address of the input (default: all)")
+    parser.add_argument("--watch", action="store_true", help="print every new frame")
+    parser.add_argument("--bench", type=int, default=100000,
+                        help="number of reads to time (0 to skip)")
+    args = parser.parse_args(argv)
+
+    try:
+        reader = TimecodeReader(args.name)
+    except FileNotFoundError:
+        print(f"No shared memory '{args.name}' (is timecode_shm enabled?)", file=sys.stderr)
+        return 1
+    addresses = [args.address] if args.address else reader.addresses
+    for address in addresses:
+        tc = reader.read(address)
+        print(format_timecode(tc) if tc else f"{address}: unknown address")
+    if args.bench and reader.first:
+        read = reader.read
+        started = time.perf_counter()
+        for _ in range(args.bench):
+            read(addresses[0])
+        elapsed = time.perf_counter() - started
+        print(f"{args.bench} reads: {elapsed * 1e9 / args.bench:.0f}ns each "
+              f"({reader.retries} retries)")
+    try:
+        last = {}
+        while args.watch:
+            if not reader.alive:
+                print("The bridge closed the shared memory")
+                break
+            for address in addresses:
+                tc = reader.read(address)
+                if tc is not None and (tc.updates, tc.status) != last.get(address):
+                    last[address] = (tc.updates, tc.status)
+                    print(format_timecode(tc))
+            time.sleep(0.002)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Timing helpers for startup and loop measurements."""
+import logging
+import time
+
+
+class StartupTimer:
+    """Record named startup phases and log a breakdown.
+
+    ``t0`` should be a ``time.perf_counter()`` value taken as early as
+    possible in the process; each ``mark`` stores the time spent since the
+    previous mark.
+    """
+
+    def __init__(self, t0: float | None = None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self._last = self.t0
+        self.phases = []
+
+    def mark(self, name: str) -> float:
+        """Close the current phase as ``name`` and return its duration in ms."""
+        now = time.perf_counter()
+        elapsed_ms = (now - self._last) * 1000.0
+        self.phases.append((name, elapsed_ms))
+        self._last = now
+        return elapsed_ms
+
+    def elapsed_ms(self) -> float:
+        """Return the time since ``t0`` in ms."""
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def log(self, title: str = "Startup") -> None:
+        """Log all phases recorded so far on a single line."""
+        parts = ", ".join(f"{name} {ms:.1f}ms" for name, ms in self.phases)
+        logging.info("%s: %s (total %.1fms)", title, parts,
+                     (self._last - self.t0) * 1000.0)
+
+
+class LoopStats:
+    """Per-interval counters for the decode loop.
+
+    ``record_chunk`` is called once per audio chunk with the time spent
+    processing it. ``window`` returns rates for the interval since the last
+    call and starts a new one; ``totals`` holds the lifetime counters. Both
+    must be called from the loop thread (CPU time is per thread); other
+    threads should read ``last_window`` and ``totals`` instead.
+    """
+
+    def __init__(self, sample_rate: int, chunk_size: int):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.stream_latency = None
+        self.totals = {"chunks": 0, "frames": 0, "overflows": 0}
+        self.last_window = None
+        self.reset()
+
+    def reset(self, now: float | None = None) -> None:
+        """Start a new interval."""
+        self._window_start = time.perf_counter() if now is None else now
+        self._thread_cpu_start = time.thread_time()
+        self._chunks = 0
+        self._frames = 0
+        self._overflows = 0
+        self._busy = 0.0
+        self._busy_max = 0.0
+
+    def record_chunk(self, busy: float, frames: int) -> None:
+        self._chunks += 1
+        self._frames += frames
+        self._busy += busy
+        if busy > self._busy_max:
+            self._busy_max = busy
+        self.totals["chunks"] += 1
+        self.totals["frames"] += frames
+
+    def record_overflows(self, count: int) -> None:
+        if count > 0:
+            self._overflows += count
+            self.totals["overflows"] += count
+
+    def window_elapsed(self) -> float:
+        return time.perf_counter() - self._window_start
+
+    def window(self) -> dict:
+        """Return the stats of the current interval and start a new one."""
+        now = time.perf_counter()
+        elapsed = max(now - self._window_start, 1e-9)
+        cpu = time.thread_time() - self._thread_cpu_start
+        stats = {
+            "chunk_size": self.chunk_size,
+            "chunk_ms": round(self.chunk_size * 1000.0 / self.sample_rate, 2),
+            "stream_latency_ms": (round(self.stream_latency * 1000.0, 2)
+                                  if self.stream_latency is not None else None),
+            "chunks_per_s": round(self._chunks / elapsed, 1),
+            "frames_per_s": round(self._frames / elapsed, 2),
+            "overflows_per_s": round(self._overflows / elapsed, 3),
+            "busy_pct": round(self._busy * 100.0 / elapsed, 2),
+            "busy_max_ms": round(self._busy_max * 1000.0, 3),
+            "cpu_pct": round(cpu * 100.0 / elapsed, 2),
+        }
+        self.reset(now)
+        self.last_window = stats
+        return stats
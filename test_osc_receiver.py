@@ -1,85 +1,432 @@
 #!/usr/bin/env python3
 """
-Simple OSC receiver to test LTC-OSC-Bridge messages
+OSC receiver and load generator to verify LTC-OSC-Bridge output.
+
+Receive mode (default) reads every bridge address on one UDP socket in a
+tight loop with a minimal OSC parser, and checks each source (sender and
+base address) for missing, duplicated, out-of-order and late frames
+against the expected frame rate. A report with per-source rates and
+latency histograms is printed every ``--interval`` seconds and on exit.
+
+Latency is the delivery jitter: how much later than its best-case arrival
+(the earliest seen relative to the frame number, allowed to creep by 20us
+per frame to follow clock drift) each frame came in. When
+a message carries a send timestamp as second argument (``--replay
+--timestamp`` does) the one-way latency is measured instead.
+
+Replay mode (``--replay HOST:PORT``) sends synthetic ``/decode`` streams
+for several sources at any rate, optionally with injected losses,
+duplicates and reordering, to load-test a receiver (or this tool).
+
+    python test_osc_receiver.py --port 7000 --fps 30
+    python test_osc_receiver.py --replay 127.0.0.1:7000 --sources 8 --speed 10 --drop 0.01
 """
 
 import argparse
-from pythonosc import dispatcher
-from pythonosc import osc_server
-import threading
+import random
+import socket
+import struct
+import sys
+import time
+
+from modules.ltc_encoder import frames_to_timecode, timecode_to_frames
+
+EVENT_SUFFIXES = ("/status-running", "/status-stopped", "/status", "/source")
+# Upper bounds (ms) of the latency histogram buckets; the last is open.
+HISTOGRAM_MS = (0.5, 1, 2, 5, 10, 20, 50, 100)
+# How far the best-case arrival may move per frame (sender clock drift).
+DRIFT_PER_FRAME = 20e-6
+
+
+# --- minimal OSC 1.0 codec -------------------------------------------------
+
+def _read_string(data: bytes, pos: int):
+    end = data.index(b"\0", pos)
+    return data[pos:end].decode("utf-8", "replace"), (end + 4) & ~3
+
+
+def parse_packet(data: bytes, out: list) -> list:
+    """Append ``(address, args)`` of every message in a packet to ``out``."""
+    if data.startswith(b"#bundle\0"):
+        pos = 16  # "#bundle\0" + 8 byte time tag
+        while pos + 4 <= len(data):
+            (size,) = struct.unpack_from(">i", data, pos)
+            parse_packet(data[pos + 4:pos + 4 + size], out)
+            pos += 4 + size
+        return out
+    address, pos = _read_string(data, 0)
+    args = []
+    if pos < len(data) and data[pos:pos + 1] == b",":
+        tags, pos = _read_string(data, pos)
+        for tag in tags[1:]:
+            if tag == "s":
+                value, pos = _read_string(data, pos)
+            elif tag == "i":
+                (value,) = struct.unpack_from(">i", data, pos)
+                pos += 4
+            elif tag == "f":
+                (value,) = struct.unpack_from(">f", data, pos)
+                pos += 4
+            elif tag in "hd":
+                (value,) = struct.unpack_from(">q" if tag == "h" else ">d", data, pos)
+                pos += 8
+            elif tag == "b":
+                (size,) = struct.unpack_from(">i", data, pos)
+                value = data[pos + 4:pos + 4 + size]
+                pos += (4 + size + 3) & ~3
+            elif tag in "TFN":
+                value = {"T": True, "F": False, "N": None}[tag]
+            else:
+                break  # unknown type: the rest cannot be located
+            args.append(value)
+    out.append((address, args))
+    return out
+
+
+def _pad(raw: bytes) -> bytes:
+    return raw + b"\0" * (4 - len(raw) % 4)
+
+
+def build_message(address: str, *args) -> bytes:
+    """Encode a message with string, int and float arguments."""
+    tags = ","
+    payload = b""
+    for arg in args:
+        if isinstance(arg, str):
+            tags += "s"
+            payload += _pad(arg.encode("utf-8"))
+        elif isinstance(arg, int):
+            tags += "i"
+            payload += struct.pack(">i", arg)
+        else:
+            tags += "d"
+            payload += struct.pack(">d", arg)
+    return _pad(address.encode("utf-8")) + _pad(tags.encode("ascii")) + payload
+
+
+# --- continuity checking ---------------------------------------------------
 
+class SourceStats:
+    """Continuity, rate and latency of one stream of frame numbers."""
 
-def ltc_decode_handler(unused_addr, timecode):
-    """Handle LTC decode messages"""
-    print(f"LTC Decode: {timecode}")
+    def __init__(self, name: str, fps: float, drop_frame: bool, max_gap: int,
+                 late_ms: float, speed: float = 1.0):
+        self.name = name
+        self.fps = fps
+        self.rate = fps * speed  # frames per second actually sent
+        self.drop_frame = drop_frame
+        self.max_gap = max_gap
+        self.late = late_ms / 1000.0
+        self.day = timecode_to_frames(24, 0, 0, 0, fps, drop_frame)
+        self.frames = self.missing = self.duplicates = self.out_of_order = 0
+        self.late_frames = self.jumps = 0
+        self.histogram = [0] * (len(HISTOGRAM_MS) + 1)
+        self.last = None
+        self.holes = set()
+        self.base = None        # earliest arrival relative to the frame number
+        self.interval_frames = 0
+        self.interval_latency = []
 
+    def frame(self, text: str, arrival: float, sent: float | None) -> None:
+        try:
+            parts = text.replace(";", ":").split(":")
+            count = timecode_to_frames(*(int(p) for p in parts), self.fps, self.drop_frame)
+        except (TypeError, ValueError):
+            return
+        self.frame_count(count, arrival, sent)
 
-def status_running_handler(unused_addr, timecode):
-    """Handle running status messages"""
-    print(f"Status: running | Timecode: {timecode}")
+    def frame_count(self, count: int, arrival: float, sent: float | None) -> None:
+        self.frames += 1
+        self.interval_frames += 1
+        self._check_order(count)
+        self._record_latency(count, arrival, sent)
 
+    def _check_order(self, count: int) -> None:
+        if self.last is None:
+            self.last = count
+            return
+        diff = (count - self.last) % self.day
+        if diff > self.day // 2:
+            diff -= self.day
+        if diff == 1:
+            self.last = count
+        elif 1 < diff <= self.max_gap:
+            self.missing += diff - 1
+            self.holes.update((self.last + i) % self.day for i in range(1, diff))
+            self.last = count
+        elif count in self.holes:
+            self.holes.discard(count)
+            self.missing -= 1
+            self.out_of_order += 1
+        elif -self.max_gap <= diff <= 0:
+            self.duplicates += 1
+        else:
+            self.jumps += 1
+            self.holes.clear()
+            self.last = count
+            self.base = None
+        if len(self.holes) > self.max_gap:
+            # Holes this far back are losses, not late arrivals.
+            horizon = self.last - self.max_gap
+            self.holes = {h for h in self.holes if h >= horizon}
 
-def status_stopped_handler(unused_addr, timecode):
-    """Handle stopped status messages"""
-    print(f"Status: stopped | Timecode: {timecode}")
+    def _record_latency(self, count: int, arrival: float, sent: float | None) -> None:
+        offset = arrival - count / self.rate
+        if self.base is None or offset - self.base > 1.0:
+            # First frame or a stop/locate: re-anchor.
+            self.base = offset
+        else:
+            self.base = min(offset, self.base + DRIFT_PER_FRAME)
+        jitter = offset - self.base
+        if jitter > self.late:
+            self.late_frames += 1
+        latency = arrival - sent if sent is not None else jitter
+        latency_ms = latency * 1000.0
+        for i, bound in enumerate(HISTOGRAM_MS):
+            if latency_ms < bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+        self.interval_latency.append(latency_ms)
 
+    def take_interval(self, elapsed: float) -> tuple[float, list]:
+        rate = self.interval_frames / elapsed
+        latency = sorted(self.interval_latency)
+        self.interval_frames = 0
+        self.interval_latency = []
+        return rate, latency
 
-def legacy_ltc_handler(unused_addr, timecode):
-    """Handle legacy LTC messages (for compatibility)"""
-    print(f"LTC (legacy): {timecode}")
+    @property
+    def errors(self) -> int:
+        return self.missing + self.duplicates + self.out_of_order
 
 
-def legacy_status_handler(unused_addr, *args):
-    """Handle legacy status messages (for compatibility)"""
-    if len(args) == 2:
-        status, timecode = args
-        print(f"Status (legacy): {status} | Timecode: {timecode}")
-    else:
-        print(f"Status (legacy): {args[0]}")
+def _percentile(values: list, q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+class Receiver:
+    """Single-socket receive loop feeding one SourceStats per source."""
+
+    def __init__(self, args):
+        self.args = args
+        self.sources = {}
+        # (raw /decode address, sender) -> SourceStats for the fast path.
+        self._fast = {}
+        self._nominal = None if args.drop_frame else int(round(args.fps))
+        self.packets = 0
+        self.events = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if args.rcvbuf:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, args.rcvbuf)
+        self.sock.bind((args.ip, args.port))
+        self.sock.settimeout(0.2)
+
+    def _source(self, base: str, sender) -> SourceStats:
+        key = (base, sender)
+        stats = self.sources.get(key)
+        if stats is None:
+            args = self.args
+            max_gap = args.max_gap or int(round(args.fps))
+            stats = SourceStats(f"{base} @{sender[0]}:{sender[1]}", args.fps,
+                                args.drop_frame, max_gap, args.late_ms, args.speed)
+            self.sources[key] = stats
+        return stats
+
+    def handle(self, data: bytes, sender, arrival: float) -> None:
+        # Fast path for the bridge's usual packet: one /decode message with
+        # a single "HH:MM:SS:FF" string argument.
+        if self._nominal is not None and data[:1] != b"#":
+            end = data.find(b"\0")
+            if end > 0 and data.endswith(b"/decode", 0, end):
+                tags = (end + 4) & ~3
+                if data[tags:tags + 4] == b",s\0\0" and data[tags + 15:tags + 16] == b"\0":
+                    key = (data[:end], sender)
+                    stats = self._fast.get(key)
+                    if stats is None:
+                        base = data[:end - 7].decode("utf-8", "replace")
+                        if self.args.address and not base.startswith(self.args.address):
+                            return
+                        stats = self._fast[key] = self._source(base, sender)
+                    tc = data[tags + 4:tags + 15]
+                    try:
+                        count = (((int(tc[0:2]) * 60 + int(tc[3:5])) * 60 + int(tc[6:8]))
+                                 * self._nominal + int(tc[9:11]))
+                    except ValueError:
+                        return
+                    stats.frame_count(count, arrival, None)
+                    return
+        prefix = self.args.address
+        for address, values in parse_packet(data, []):
+            if prefix and not address.startswith(prefix):
+                continue
+            if address.endswith("/decode"):
+                base = address[:-len("/decode")]
+            elif address.endswith(EVENT_SUFFIXES):
+                self.events += 1
+                if not self.args.quiet:
+                    print(f"{time.strftime('%H:%M:%S')} {address} "
+                          f"{' '.join(str(v) for v in values)}")
+                continue
+            elif values and isinstance(values[0], str) and values[0].count(":") == 3:
+                base = address  # v1.x: timecode on the base address
+            else:
+                continue
+            if not values:
+                continue
+            sent = values[1] if len(values) > 1 and isinstance(values[1], float) else None
+            self._source(base, sender).frame(values[0], arrival, sent)
+
+    def run(self) -> int:
+        args = self.args
+        print(f"Listening for OSC on {args.ip}:{args.port} "
+              f"(expecting {args.fps} fps{', drop frame' if args.drop_frame else ''})")
+        recvfrom = self.sock.recvfrom
+        clock = time.time
+        started = last_report = time.perf_counter()
+        deadline = started + args.duration if args.duration else None
+        try:
+            while True:
+                try:
+                    data, sender = recvfrom(65536)
+                except socket.timeout:
+                    data = None
+                if data is not None:
+                    self.packets += 1
+                    self.handle(data, sender, clock())
+                now = time.perf_counter()
+                if now - last_report >= args.interval:
+                    self.report(now - last_report)
+                    last_report = now
+                if deadline is not None and now >= deadline:
+                    break
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+        self.report(max(time.perf_counter() - last_report, 1e-9), final=True)
+        if args.fail_on_errors and any(s.errors for s in self.sources.values()):
+            return 1
+        return 0
+
+    def report(self, elapsed: float, final: bool = False) -> None:
+        print(f"{'SOURCE':<36} {'FRAMES':>8} {'RATE/s':>8} {'MISS':>6} {'DUP':>5} "
+              f"{'OOO':>5} {'LATE':>5} {'JUMP':>5}  {'LATENCY ms p50/p99/max':>22}")
+        for stats in self.sources.values():
+            rate, latency = stats.take_interval(elapsed)
+            print(f"{stats.name:<36} {stats.frames:>8} {rate:>8.1f} {stats.missing:>6} "
+                  f"{stats.duplicates:>5} {stats.out_of_order:>5} {stats.late_frames:>5} "
+                  f"{stats.jumps:>5}  {_percentile(latency, 0.5):>6.2f}/"
+                  f"{_percentile(latency, 0.99):.2f}/{latency[-1] if latency else 0.0:.2f}")
+        if final:
+            labels = [f"<{b:g}" for b in HISTOGRAM_MS] + [f">={HISTOGRAM_MS[-1]:g}"]
+            print("Latency histogram (ms): " + " ".join(f"{label:>6}" for label in labels))
+            for stats in self.sources.values():
+                print(f"  {stats.name:<34} " + " ".join(f"{n:>6}" for n in stats.histogram))
+            print(f"{self.packets} packets, {self.events} status/source events")
+        print()
+
+
+# --- synthetic streams -----------------------------------------------------
+
+def replay(args) -> int:
+    """Send synthetic /decode streams to ``args.replay`` (HOST:PORT)."""
+    host, _, port = args.replay.rpartition(":")
+    target = (host or "127.0.0.1", int(port))
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rng = random.Random(args.seed)
+    base = args.address or "/ltc"
+    addresses = ([f"{base}/decode"] if args.sources == 1
+                 else [f"{base}/{i}/decode" for i in range(args.sources)])
+    h, m, s, f = (int(p) for p in args.start.split(":"))
+    start = timecode_to_frames(h, m, s, f, args.fps, args.drop_frame)
+    period = 1.0 / (args.fps * args.speed)
+    total = int(args.duration * args.fps * args.speed) if args.duration else None
+    print(f"Replaying {args.sources} source(s) at {args.fps * args.speed:.1f} frames/s "
+          f"each to {target[0]}:{target[1]}")
+
+    sent = dropped = duplicated = reordered = 0
+    held = []  # (address, packet) delayed by one frame to reorder it
+    next_time = time.perf_counter()
+    n = 0
+    try:
+        while total is None or n < total:
+            tc = "%02d:%02d:%02d:%02d" % frames_to_timecode(
+                start + n, args.fps, args.drop_frame)
+            release, held = held, []
+            for address in addresses:
+                extra = (time.time(),) if args.timestamp else ()
+                packet = build_message(address, tc, *extra)
+                roll = rng.random()
+                if roll < args.drop:
+                    dropped += 1
+                    continue
+                if roll < args.drop + args.reorder:
+                    held.append(packet)
+                    reordered += 1
+                    continue
+                sock.sendto(packet, target)
+                sent += 1
+                if rng.random() < args.duplicate:
+                    sock.sendto(packet, target)
+                    duplicated += 1
+            for packet in release:
+                sock.sendto(packet, target)
+                sent += 1
+            n += 1
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    print(f"Sent {sent} messages ({n} frames per source); injected {dropped} drops, "
+          f"{duplicated} duplicates, {reordered} reorders")
+    return 0
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Test OSC receiver for LTC-OSC-Bridge")
+        description="Continuity-checking OSC receiver and load generator for LTC-OSC-Bridge")
     parser.add_argument("--ip", default="127.0.0.1", help="IP to listen on")
     parser.add_argument("--port", type=int, default=7000,
                         help="Port to listen on")
-    parser.add_argument("--address", default="/ltc",
-                        help="OSC address to listen for")
+    parser.add_argument("--address", default="",
+                        help="only check addresses starting with this (default: all)")
+    parser.add_argument("--fps", type=float, default=30.0, help="expected frame rate")
+    parser.add_argument("--drop-frame", action="store_true")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="frame rate multiplier (replay load tests)")
+    parser.add_argument("--max-gap", type=int, default=0,
+                        help="larger steps count as a locate, not as loss (default: 1s)")
+    parser.add_argument("--late-ms", type=float, default=None,
+                        help="jitter above which a frame counts as late (default: 1 frame)")
+    parser.add_argument("--interval", type=float, default=5.0, help="report interval (s)")
+    parser.add_argument("--duration", type=float, default=0.0,
+                        help="stop after this many seconds (default: run until Ctrl+C)")
+    parser.add_argument("--rcvbuf", type=int, default=4 * 1024 * 1024,
+                        help="socket receive buffer size")
+    parser.add_argument("--quiet", action="store_true", help="do not print status events")
+    parser.add_argument("--fail-on-errors", action="store_true",
+                        help="exit with 1 if frames were missing, duplicated or reordered")
+    replay_group = parser.add_argument_group("replay")
+    replay_group.add_argument("--replay", metavar="HOST:PORT",
+                              help="send synthetic streams instead of receiving")
+    replay_group.add_argument("--sources", type=int, default=1)
+    replay_group.add_argument("--start", default="10:00:00:00")
+    replay_group.add_argument("--timestamp", action="store_true",
+                              help="append the send time for one-way latency")
+    replay_group.add_argument("--drop", type=float, default=0.0, help="loss probability")
+    replay_group.add_argument("--duplicate", type=float, default=0.0)
+    replay_group.add_argument("--reorder", type=float, default=0.0)
+    replay_group.add_argument("--seed", type=int, default=None)
 
     args = parser.parse_args()
-
-    dispatcher_obj = dispatcher.Dispatcher()
-
-    # New v2.0 address scheme
-    dispatcher_obj.map(args.address + "/decode", ltc_decode_handler)
-    dispatcher_obj.map(args.address + "/status-running",
-                       status_running_handler)
-    dispatcher_obj.map(args.address + "/status-stopped",
-                       status_stopped_handler)
-
-    # Legacy v1.x compatibility
-    dispatcher_obj.map(args.address, legacy_ltc_handler)
-    dispatcher_obj.map(args.address + "/status", legacy_status_handler)
-
-    server = osc_server.ThreadingOSCUDPServer(
-        (args.ip, args.port), dispatcher_obj)
-    print(f"Listening for OSC messages on {args.ip}:{args.port}")
-    print(f"New v2.0 addresses:")
-    print(f"  Decode: {args.address}/decode")
-    print(f"  Running: {args.address}/status-running")
-    print(f"  Stopped: {args.address}/status-stopped")
-    print(f"Legacy v1.x addresses (for compatibility):")
-    print(f"  LTC: {args.address}")
-    print(f"  Status: {args.address}/status")
-    print("Press Ctrl+C to stop")
-
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-        server.shutdown()
+    if args.late_ms is None:
+        args.late_ms = 1000.0 / (args.fps * args.speed)
+    if args.replay:
+        return replay(args)
+    return Receiver(args).run()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
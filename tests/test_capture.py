@@ -0,0 +1,167 @@
+import array
+import sys
+import time
+import types
+
+import pytest
+
+RATE = 48000
+CHUNK = 480
+
+
+class FakeLibLTC:
+    """Records what the decoder is fed; never decodes a frame."""
+
+    def __init__(self, lib_path, sample_rate, fps, decimation=1):
+        self.written = []
+
+    def write(self, samples):
+        self.written.append(list(samples))
+
+    def read(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeOSC:
+    base_address = "/ltc"
+
+    def __init__(self):
+        self.statuses = []
+
+    def send_status(self, running, timecode=None):
+        self.statuses.append(running)
+
+
+@pytest.fixture
+def modules(monkeypatch):
+    """Import the capture modules without PyAudio or libltc installed."""
+    monkeypatch.setitem(sys.modules, "pyaudio", types.SimpleNamespace(PyAudio=object))
+    for name in ("modules.audio_sources", "modules.capture",
+                 "modules.device_registry", "ltc_reader"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    import ltc_reader
+    from modules import audio_sources, capture
+    monkeypatch.setattr(ltc_reader, "LibLTC", FakeLibLTC)
+    monkeypatch.setattr(ltc_reader, "find_libltc", lambda: "libltc")
+    return types.SimpleNamespace(audio_sources=audio_sources, capture=capture,
+                                 ltc_reader=ltc_reader)
+
+
+def make_source(modules, **kwargs):
+    # A ramp so every chunk shows where in the stream it came from.
+    source = modules.audio_sources.SimulatedSource(
+        range(30000), RATE, frames_per_buffer=CHUNK, realtime=False, **kwargs)
+    opens = []
+
+    def open_source(refresh):
+        opens.append(refresh)
+        source.open()
+        return source
+
+    return source, opens, open_source
+
+
+def read_until(supervisor, connected, timeout=2.0):
+    """Read until the supervisor reaches ``connected``; return the reads."""
+    reads = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        reads.append(supervisor.read())
+        if supervisor.connected == connected:
+            return reads
+    raise AssertionError(f"supervisor did not reach connected={connected}")
+
+
+def test_lost_device_backs_off_and_reconnects(modules):
+    source, opens, open_source = make_source(modules)
+    supervisor = modules.capture.CaptureSupervisor(
+        open_source, backoff_initial=0.01, backoff_max=0.04)
+    supervisor.open()
+    assert supervisor.read() is not None
+
+    source.disconnect()
+    assert supervisor.read() is None
+    assert not supervisor.connected
+
+    attempts = []
+    deadline = time.monotonic() + 0.3
+    while time.monotonic() < deadline:
+        assert supervisor.read() is None
+        if len(opens) > len(attempts) + 1:
+            attempts.append(time.monotonic())
+    # Initial open plus a handful of attempts, spaced by the capped backoff
+    # instead of retrying on every read.
+    assert 3 <= len(attempts) <= 12
+    gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+    assert gaps[-1] >= 0.035
+    # Only the first reconnect attempt skips the device table refresh.
+    assert opens[1] is False
+    assert all(opens[2:])
+    assert supervisor.get_stats()["last_outage_s"] >= 0.3
+
+    source.reconnect()
+    reads = read_until(supervisor, True)
+    assert all(data is None for data in reads)
+    assert supervisor.read() is not None
+
+    stats = supervisor.get_stats()
+    assert stats["connected"]
+    assert stats["reconnects"] == 1
+    assert stats["last_outage_s"] >= 0.3
+    assert stats["total_outage_s"] == stats["last_outage_s"]
+
+
+def test_simulated_dropouts_add_up_in_outage_counters(modules):
+    source, opens, open_source = make_source(
+        modules, dropouts=[(0.05, 0.05), (0.2, 0.05)])
+    supervisor = modules.capture.CaptureSupervisor(
+        open_source, backoff_initial=0.005, backoff_max=0.01)
+    supervisor.open()
+
+    for outage in (1, 2):
+        read_until(supervisor, False)
+        read_until(supervisor, True)
+        assert supervisor.reconnects == outage
+        assert supervisor.last_outage >= 0.04
+
+    stats = supervisor.get_stats()
+    assert stats["total_outage_s"] >= 0.08
+    assert stats["total_outage_s"] == pytest.approx(
+        supervisor.total_outage, abs=0.001)
+
+
+def test_none_read_keeps_decoder_state(modules):
+    source, opens, open_source = make_source(modules)
+    supervisor = modules.capture.CaptureSupervisor(
+        open_source, backoff_initial=0.005, backoff_max=0.01)
+    supervisor.open()
+    decoder = modules.ltc_reader.ChannelDecoder(0, RATE, 25, FakeOSC())
+    ltc = decoder.decoder
+
+    def feed():
+        data = supervisor.read()
+        decoder.process(array.array("h", data) if data is not None else None)
+        return data
+
+    for _ in range(3):
+        assert feed() is not None
+    source.disconnect()
+    while supervisor.connected:
+        feed()
+    written = len(ltc.written)
+    for _ in range(5):
+        assert feed() is None
+    assert len(ltc.written) == written
+
+    source.reconnect()
+    while feed() is None:
+        pass
+    # Same decoder, fed the stream from where it stopped: nothing was reset
+    # or replayed across the outage.
+    assert decoder.decoder is ltc
+    samples = [s for chunk in ltc.written for s in chunk]
+    assert samples == list(range(len(samples)))
+    assert decoder.samples_in == len(samples)
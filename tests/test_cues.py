@@ -0,0 +1,133 @@
+import time
+
+import pytest
+
+from modules.cues import CueEngine, CueIndex, parse_cues
+from modules.ltc_encoder import frames_to_timecode
+
+FPS = 25
+
+CUES = parse_cues([
+    {"tc": "00:00:04:00", "address": "/d", "name": "D"},
+    {"tc": "00:00:01:00", "address": "/a", "name": "A"},
+    {"tc": "00:00:02:00", "address": "/b", "args": 1, "name": "B1"},
+    {"tc": "00:00:02:00", "address": "/b", "args": [2], "name": "B2"},
+    {"tc": "00:01:00:00", "address": "/e", "name": "E"},
+], FPS)
+
+
+def names(cues):
+    return [c.name for c in cues]
+
+
+def engine(**kwargs):
+    return CueEngine(CUES, FPS, **kwargs)
+
+
+def feed(engine, *counts, started=None):
+    """Feed frame numbers; return the names of all cues fired."""
+    fired = []
+    for count in counts:
+        fired += names(engine.frame(*frames_to_timecode(count, FPS), started=started))
+    return fired
+
+
+def test_index_sorts_by_frame_and_keeps_list_order_on_ties():
+    index = CueIndex(CUES)
+    assert len(index) == 5
+    assert index.frames == [25, 50, 50, 100, 1500]
+    assert names(index.cues[slice(*index.span(24, 50))]) == ["A", "B1", "B2"]
+    assert index.span(25, 25) == (1, 1)
+    assert index.span(1500, 9999) == (5, 5)
+    assert index.latest(24) == []
+    assert names(index.latest(49)) == ["A"]
+    assert names(index.latest(50)) == ["B1", "B2"]
+    assert names(index.latest(10**6)) == ["E"]
+    assert index.cues[1].args == (1,) and index.cues[2].args == (2,)
+
+
+def test_continuous_playback_fires_crossed_cues_once():
+    e = engine()
+    # Frame 25 is missed by the decoder; its cue still fires with 26.
+    assert feed(e, *range(20, 25), 26, 27) == ["A"]
+    # Repeated and slightly earlier frames do not fire again.
+    assert feed(e, 27, 26, 27) == []
+    assert feed(e, *range(28, 60)) == ["B1", "B2"]
+    assert e.get_status()["jumps"] == 0
+    assert e.get_status()["fired"] == 3
+
+
+def test_first_frame_lands_without_firing_earlier_cues():
+    assert feed(engine(), 60) == []
+    assert feed(engine(), 50) == ["B1", "B2"]
+
+
+def test_skip_fires_only_the_landing_frame():
+    e = engine(on_jump="skip")
+    feed(e, 0)
+    assert feed(e, 100) == ["D"]
+    status = e.get_status()
+    assert status["jumps"] == 1
+    assert status["skipped"] == 3
+    assert feed(e, 60) == []
+    assert feed(e, *range(61, 101)) == ["D"]
+
+
+def test_chase_fires_everything_crossed_forwards_only():
+    e = engine(on_jump="chase")
+    feed(e, 0)
+    assert feed(e, 100) == ["A", "B1", "B2", "D"]
+    assert e.get_status()["skipped"] == 0
+    # Backwards a chase behaves like skip.
+    assert feed(e, 30) == []
+    assert feed(e, 50) == ["B1", "B2"]
+
+
+def test_last_restores_the_state_at_the_landing_frame():
+    e = engine(on_jump="last")
+    assert feed(e, 60) == ["B1", "B2"]
+    assert feed(e, 1600) == ["E"]
+    assert feed(e, 40) == ["A"]
+    assert feed(e, 10) == []
+    assert e.get_status()["jumps"] == 3
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        engine(on_jump="rewind")
+
+
+def test_freewheel_fires_on_extrapolated_timecode():
+    e = engine(freewheel=1.0)
+    feed(e, 20)
+    t = e.last_arrival
+    # Less than two frame periods late is delivery jitter.
+    assert e.tick(now=t + 0.07) == []
+    assert names(e.tick(now=t + 0.3)) == ["A"]
+    assert e.get_status()["position"] == "00:00:01:02"
+    # Past the freewheel limit nothing more fires.
+    assert e.tick(now=t + 1.5) == []
+    status = e.get_status()
+    assert status["freewheeled"] == 1
+    assert status["fired"] == 1
+
+    # The signal returns behind the freewheel position: no repeats.
+    assert feed(e, 26, 27) == []
+    assert feed(e, *range(28, 51)) == ["B1", "B2"]
+
+
+def test_freewheel_extrapolates_from_the_frame_start():
+    e = engine(freewheel=1.0)
+    # The frame started 0.2s before it was decoded.
+    feed(e, 10, started=time.monotonic() - 0.2)
+    assert e.tick(now=e.last_arrival + 0.1) == []
+    assert e.done == 17
+    assert names(e.tick(now=e.last_arrival + 0.6)) == ["A"]
+    assert e.done == 30
+
+
+def test_freewheel_off_never_fires_from_tick():
+    e = engine()
+    feed(e, 20)
+    assert e.tick(now=e.last_arrival + 0.5) == []
+    assert engine(freewheel=1.0).tick() == []
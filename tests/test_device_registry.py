@@ -0,0 +1,61 @@
+import sys
+import types
+
+import pytest
+
+DEVICES = [
+    {"name": "USB Audio", "hostApi": 0, "maxInputChannels": 2, "maxOutputChannels": 0},
+    {"name": "Speakers", "hostApi": 0, "maxInputChannels": 0, "maxOutputChannels": 2},
+    {"name": "USB Audio", "hostApi": 0, "maxInputChannels": 2, "maxOutputChannels": 0},
+    {"name": "USB Audio", "hostApi": 1, "maxInputChannels": 2, "maxOutputChannels": 0},
+]
+
+
+class FakePyAudio:
+    def get_host_api_count(self):
+        return 2
+
+    def get_host_api_info_by_index(self, i):
+        return {"name": ["MME", "Windows WASAPI"][i]}
+
+    def get_device_count(self):
+        return len(DEVICES)
+
+    def get_device_info_by_index(self, i):
+        return dict(DEVICES[i])
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyaudio", types.SimpleNamespace(PyAudio=FakePyAudio))
+    monkeypatch.delitem(sys.modules, "modules.device_registry", raising=False)
+    from modules.device_registry import DeviceRegistry
+    return DeviceRegistry()
+
+
+def test_duplicate_names_prefer_configured_index(registry):
+    assert registry.resolve(2, "USB Audio", "MME")["index"] == 2
+    assert registry.resolve(0, "USB Audio", "MME")["index"] == 0
+
+
+def test_duplicate_names_without_matching_index_take_first(registry):
+    assert registry.resolve(None, "USB Audio", "MME")["index"] == 0
+    assert registry.resolve(3, "USB Audio", "MME")["index"] == 0
+    assert registry.resolve(None, "USB Audio")["index"] == 0
+
+
+def test_ordinal_suffix_selects_nth_device(registry):
+    assert registry.resolve(None, "USB Audio#1", "MME")["index"] == 0
+    assert registry.resolve(0, "USB Audio#2", "MME")["index"] == 2
+    assert registry.resolve(None, "USB Audio#2")["index"] == 2
+    assert registry.resolve(None, "USB Audio#3")["index"] == 3
+    assert registry.resolve(None, "USB Audio#4") is None
+    assert registry.resolve(None, "USB Audio#0") is None
+
+
+def test_find_output_ignores_inputs(registry):
+    assert registry.find("USB Audio", output=True) is None
+    assert registry.find("Speakers", output=True)["index"] == 1
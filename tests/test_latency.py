@@ -0,0 +1,42 @@
+from modules.latency import AdaptiveChunkController
+
+QUIET = {"overflows_per_s": 0.0, "busy_pct": 2.0, "cpu_pct": 1.0}
+OVERFLOW = {"overflows_per_s": 5.0, "busy_pct": 2.0, "cpu_pct": 1.0}
+
+
+def run(controller, chunk, windows):
+    sizes = []
+    for stats in windows:
+        new_size = controller.evaluate(chunk, stats)
+        if new_size is not None:
+            chunk = new_size
+        sizes.append(chunk)
+    return chunk, sizes
+
+
+def test_grows_on_overflows_then_recovers():
+    controller = AdaptiveChunkController(256, 2048, calm_windows=3, floor_decay_windows=10)
+    chunk, sizes = run(controller, 256, [OVERFLOW, OVERFLOW])
+    assert sizes == [512, 1024]
+
+    # Right after the overflows the size that overflowed is not retried.
+    chunk, sizes = run(controller, chunk, [QUIET] * 9)
+    assert set(sizes) == {1024}
+
+    # After a quiet period the floor decays and the chunk comes back down.
+    chunk, sizes = run(controller, chunk, [QUIET] * 40)
+    assert chunk == 256
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_overflow_during_recovery_restarts_the_quiet_period():
+    controller = AdaptiveChunkController(256, 2048, calm_windows=3, floor_decay_windows=10)
+    chunk, _ = run(controller, 256, [OVERFLOW, OVERFLOW])
+    chunk, _ = run(controller, chunk, [QUIET] * 9 + [OVERFLOW] + [QUIET] * 9)
+    assert chunk == 2048
+
+
+def test_stays_at_max_under_sustained_overflows():
+    controller = AdaptiveChunkController(256, 1024, floor_decay_windows=2)
+    chunk, _ = run(controller, 256, [OVERFLOW] * 10)
+    assert chunk == 1024
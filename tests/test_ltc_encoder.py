@@ -0,0 +1,98 @@
+import array
+import wave
+
+import pytest
+
+from modules.ltc_encoder import (
+    SYNC_WORD, LTCEncoder, frame_bits, frames_to_timecode, render_wav,
+    timecode_to_frames)
+
+
+def field(bits, start, width):
+    return sum(bit << i for i, bit in enumerate(bits[start:start + width]))
+
+
+@pytest.mark.parametrize("fps", [24, 25, 29.97, 30])
+def test_frame_bits_carry_bcd_sync_word_and_even_parity(fps):
+    drop_frame = fps == 29.97
+    bits = frame_bits(23, 59, 58, 21, fps, drop_frame)
+    assert len(bits) == 80
+    assert tuple(bits[64:]) == SYNC_WORD == (0, 0) + (1,) * 12 + (0, 1)
+    assert (field(bits, 0, 4), field(bits, 8, 2)) == (1, 2)
+    assert (field(bits, 16, 4), field(bits, 24, 3)) == (8, 5)
+    assert (field(bits, 32, 4), field(bits, 40, 3)) == (9, 5)
+    assert (field(bits, 48, 4), field(bits, 56, 2)) == (3, 2)
+    assert bits[10] == drop_frame
+    assert sum(bits) % 2 == 0
+
+
+@pytest.mark.parametrize("fps, parity_bit, other", [(25, 59, 27), (30, 27, 59)])
+def test_parity_bit_position_depends_on_frame_rate(fps, parity_bit, other):
+    # The sync word has 13 ones: 00:00:00:00 needs the parity bit set,
+    # 00:00:00:01 adds a one and does not.
+    bits = frame_bits(0, 0, 0, 0, fps)
+    assert bits[parity_bit] == 1
+    assert bits[other] == 0
+    assert frame_bits(0, 0, 0, 1, fps)[parity_bit] == 0
+
+
+@pytest.mark.parametrize("fps, drop", [(29.97, 2), (59.94, 4)])
+def test_drop_frame_round_trip_skips_labels_at_minute_boundaries(fps, drop):
+    nominal = round(fps)
+    per_10min = nominal * 600 - drop * 9
+    labels = set()
+    for count in range(per_10min + nominal * 120):
+        label = frames_to_timecode(count, fps, drop_frame=True)
+        assert timecode_to_frames(*label, fps, drop_frame=True) == count
+        labels.add(label)
+    assert len(labels) == per_10min + nominal * 120
+
+    for minute in range(1, 12):
+        skipped = [(0, minute, 0, f) for f in range(drop)]
+        if minute % 10:
+            assert not labels.intersection(skipped)
+        else:
+            assert labels.issuperset(skipped)
+
+    # Minute 0 keeps all its labels; minute 1 starts at frame ``drop``.
+    assert frames_to_timecode(nominal * 60 - 1, fps, True) == (0, 0, 59, nominal - 1)
+    assert frames_to_timecode(nominal * 60, fps, True) == (0, 1, 0, drop)
+    assert frames_to_timecode(per_10min, fps, True) == (0, 10, 0, 0)
+
+
+def test_drop_frame_wraps_at_24_hours():
+    per_day = timecode_to_frames(24, 0, 0, 0, 29.97, drop_frame=True)
+    assert per_day == 2589408
+    assert frames_to_timecode(per_day, 29.97, True) == (0, 0, 0, 0)
+    assert frames_to_timecode(per_day - 1, 29.97, True) == (23, 59, 59, 29)
+
+
+@pytest.mark.parametrize("fps, frames, expected", [
+    (25, 50, 96000),
+    (29.97, 30, 48048),
+])
+def test_frame_lengths_keep_the_long_term_rate(fps, frames, expected):
+    encoder = LTCEncoder(48000, fps)
+    total = sum(len(encoder.encode_count(n)) for n in range(frames))
+    assert total == expected
+    assert total == round(frames * 48000 / fps)
+
+
+def test_render_wav_writes_header_and_sample_count(tmp_path):
+    path = tmp_path / "ltc.wav"
+    render_wav(str(path), LTCEncoder(48000, 29.97, drop_frame=True),
+               1800, 30, num_channels=2, channel=1)
+    with wave.open(str(path), "rb") as wf:
+        assert wf.getnchannels() == 2
+        assert wf.getsampwidth() == 2
+        assert wf.getframerate() == 48000
+        assert wf.getcomptype() == "NONE"
+        assert wf.getnframes() == 48048
+        samples = array.array("h", wf.readframes(wf.getnframes()))
+    assert not any(samples[0::2])
+    assert max(samples[1::2]) == 16383
+    assert min(samples[1::2]) == -16383
+    # 44 byte RIFF header followed by the PCM data.
+    data = path.read_bytes()
+    assert data[:4] == b"RIFF" and data[8:16] == b"WAVEfmt "
+    assert len(data) == 44 + 48048 * 2 * 2
@@ -0,0 +1,75 @@
+from modules.ltc_encoder import frames_to_timecode, timecode_to_frames
+from modules.redundancy import RedundancySelector
+
+FPS = 25
+PERIOD = 1.0 / FPS
+
+
+class Harness:
+    """Feed two sources frame by frame on a simulated clock."""
+
+    def __init__(self):
+        self.out = []
+        self.switches = []
+        self.selector = RedundancySelector(
+            ["main", "backup"], FPS, self._on_frame,
+            lambda old, new, reason: self.switches.append((old, new, reason)))
+        self.t = 0.0
+
+    def _on_frame(self, hours, minutes, seconds, frames):
+        self.out.append(timecode_to_frames(hours, minutes, seconds, frames, FPS))
+
+    def step(self, main=None, backup=None):
+        """One frame period: each source delivers its count (or nothing)."""
+        sel = self.selector
+        if main is not None:
+            sel.frame(0, *frames_to_timecode(main, FPS), now=self.t)
+        if backup is not None:
+            sel.frame(1, *frames_to_timecode(backup, FPS), now=self.t + 0.002)
+        for offset in (0.004, PERIOD / 2, PERIOD * 0.9):
+            sel.tick(now=self.t + offset)
+        self.t += PERIOD
+
+    def run(self, mains, backups):
+        for main, backup in zip(mains, backups):
+            self.step(main, backup)
+
+
+def test_dropout_of_main_continues_on_backup():
+    h = Harness()
+    h.run(range(100, 120), range(100, 120))
+    h.run([None] * 10, range(120, 130))
+    assert h.out == list(range(100, 130))
+    assert h.switches[1:] == [("main", "backup", "dropout")]
+
+
+def test_jump_of_one_source_is_not_followed():
+    h = Harness()
+    h.run(range(100, 123), range(100, 123))
+    h.run(range(622, 652), range(123, 153))
+    assert h.out == list(range(100, 153))
+    assert h.switches[1:] == [("main", "backup", "jump")]
+
+
+def test_jump_of_backup_alone_does_not_switch():
+    h = Harness()
+    h.run(range(100, 123), range(100, 123))
+    h.run(range(123, 153), range(622, 652))
+    assert h.out == list(range(100, 153))
+    assert h.switches[1:] == []
+
+
+def test_locate_on_both_sources_is_followed():
+    h = Harness()
+    h.run(range(100, 120), range(100, 120))
+    h.run(range(1000, 1020), range(1000, 1020))
+    assert h.out == list(range(100, 120)) + list(range(1000, 1020))
+    assert h.switches[1:] == []
+
+
+def test_stop_on_both_sources_does_not_switch():
+    h = Harness()
+    h.run(range(100, 120), range(100, 120))
+    h.run([None] * 20, [None] * 20)
+    assert h.out == list(range(100, 120))
+    assert h.switches[1:] == []
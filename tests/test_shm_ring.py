@@ -0,0 +1,62 @@
+import array
+
+import pytest
+
+from modules import shm_ring
+from modules.shm_ring import PcmRing, RingReader
+
+CHUNK = 256
+
+
+def chunk(value):
+    return array.array("h", [value] * CHUNK).tobytes()
+
+
+@pytest.fixture
+def ring():
+    ring = PcmRing.create(1024, 1, seconds=1.0)
+    yield ring
+    ring.close()
+
+
+def test_reader_gets_chunks_in_order(ring):
+    reader = RingReader(ring)
+    assert reader.read(CHUNK, timeout=0.01) is None
+    for value in (1, 2):
+        ring.write(chunk(value))
+    assert reader.read(CHUNK, timeout=0.01) == chunk(1)
+    assert reader.read(CHUNK, timeout=0.01) == chunk(2)
+    assert reader.overruns == 0
+
+
+def test_lapped_reader_skips_to_newest_audio(ring):
+    reader = RingReader(ring)
+    for value in range(1, 7):
+        ring.write(chunk(value))
+    assert reader.read(CHUNK, timeout=0.01) == chunk(6)
+    assert reader.overruns == 5 * CHUNK
+
+
+def test_chunk_overwritten_while_copying_is_discarded(ring, monkeypatch):
+    reader = RingReader(ring)
+    for value in range(1, 5):
+        ring.write(chunk(value))
+    copy = reader._copy
+    calls = []
+
+    def copy_during_write(pos, frames):
+        calls.append(pos)
+        if len(calls) == 1:
+            # The writer starts on chunk 5, which reuses the slot of chunk
+            # 1, and gets half way before the copy runs.
+            shm_ring._WRITE_POS.pack_into(
+                ring.shm.buf, shm_ring._WRITE_SEQ_AT, 5 * CHUNK)
+            ring.data[:CHUNK] = chunk(5)[:CHUNK]
+        elif len(calls) == 2:
+            ring.write(chunk(5))
+        return copy(pos, frames)
+
+    monkeypatch.setattr(reader, "_copy", copy_during_write)
+    assert reader.read(CHUNK, timeout=0.01) == chunk(5)
+    assert calls[0] == 0
+    assert reader.overruns == 4 * CHUNK